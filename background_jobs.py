@@ -0,0 +1,108 @@
+import sys
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+
+
+class _JobSignals(QObject):
+    # Emitidos na thread de trabalho; chegam ao agendador, na thread da interface, pela fila de eventos
+    finished = pyqtSignal(object, int, object)  # canal, geração, resultado
+    failed = pyqtSignal(object, int, object)  # canal, geração, exceção
+
+
+class _Job(QRunnable):
+    def __init__(self, signals, channel, generation, function, args):
+        super().__init__()
+        # O agendador guarda a referência até o resultado chegar (tryTake precisa do objeto vivo)
+        self.setAutoDelete(False)
+        self.signals = signals
+        self.channel = channel
+        self.generation = generation
+        self.function = function
+        self.args = args
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            # Ainda avisa o agendador, que só então solta a referência ao trabalho
+            self.signals.finished.emit(self.channel, self.generation, None)
+            return
+        try:
+            result = self.function(*self.args)
+        except Exception as exc:
+            self.signals.failed.emit(self.channel, self.generation, exc)
+        else:
+            self.signals.finished.emit(self.channel, self.generation, result)
+
+
+class JobScheduler(QObject):
+    # Cálculos pesados (propriedades, malhas, BVH, leitura de arquivos) em threads do QThreadPool.
+    # Cada canal tem um único trabalho válido: enviar outro torna o anterior obsoleto, que sai da
+    # fila se ainda não começou ou tem o resultado descartado ao terminar. Resultados e erros
+    # chegam por sinais enfileirados e os callbacks rodam na thread da interface.
+    result_ready = pyqtSignal(object, object)  # canal, resultado
+    job_failed = pyqtSignal(object, object)  # canal, exceção
+
+    def __init__(self, pool=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self.generations = {}  # canal -> geração do trabalho válido
+        self.pending = {}  # canal -> (trabalho, callback, error_callback)
+        # Cancelados que já saíram da fila: a referência fica até o sinal do fim chegar, porque o
+        # QThreadPool ainda pode tocar no trabalho logo depois de run() retornar
+        self.retired = {}  # (canal, geração) -> trabalho
+        self.signals = _JobSignals()
+        self.signals.finished.connect(self._on_finished, Qt.ConnectionType.QueuedConnection)
+        self.signals.failed.connect(self._on_failed, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, channel, function, *args, callback=None, error_callback=None):
+        # `function(*args)` roda fora da thread da interface: não pode tocar em widgets nem no GL
+        self.cancel(channel)
+        generation = self.generations[channel]
+        job = _Job(self.signals, channel, generation, function, args)
+        self.pending[channel] = (job, callback, error_callback)
+        self.pool.start(job)
+        return generation
+
+    def cancel(self, channel):
+        # Não interrompe um cálculo já em andamento, mas o resultado dele será ignorado
+        entry = self.pending.pop(channel, None)
+        if entry is not None:
+            entry[0].cancelled = True
+            if not self.pool.tryTake(entry[0]):
+                self.retired[channel, entry[0].generation] = entry[0]
+        self.generations[channel] = self.generations.get(channel, 0) + 1
+
+    def cancel_all(self):
+        for channel in list(self.pending):
+            self.cancel(channel)
+
+    def is_pending(self, channel) -> bool:
+        return channel in self.pending
+
+    def wait(self, msecs=-1) -> bool:
+        # Espera as threads terminarem; os resultados ainda passam pela fila de eventos
+        return self.pool.waitForDone(msecs)
+
+    def _take(self, channel, generation):
+        self.retired.pop((channel, generation), None)
+        if self.generations.get(channel) != generation:
+            return None
+        return self.pending.pop(channel, None)
+
+    def _on_finished(self, channel, generation, result):
+        entry = self._take(channel, generation)
+        if entry is None:
+            return
+        if entry[1] is not None:
+            entry[1](result)
+        self.result_ready.emit(channel, result)
+
+    def _on_failed(self, channel, generation, exc):
+        entry = self._take(channel, generation)
+        if entry is None:
+            return
+        if entry[2] is not None:
+            entry[2](exc)
+        else:
+            traceback.print_exception(exc, file=sys.stderr)
+        self.job_failed.emit(channel, exc)
@@ -0,0 +1,184 @@
+import argparse
+import csv
+import json
+import math
+import sys
+import numpy as np
+from geometry_calculator import GeometryCalculator, BATCH_SHAPES
+from parallel_batch import ParallelBatchCalculator
+from mesh_io import MeshArchive
+
+# Não importa PyQt6 nem PyOpenGL: este módulo roda em nós de processamento sem interface gráfica
+
+INPUT_FIELDS = ["shape", "width", "height", "depth"]
+OUTPUT_FIELDS = INPUT_FIELDS + [
+    "volume", "total_area",
+    "area_Frente", "area_Trás", "area_Topo", "area_Base", "area_Esquerda", "area_Direita",
+    "geratriz_front_back", "geratriz_left_right"
+]
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return "csv"
+
+
+def row_fields(row, line_number):
+    # (linha, forma, largura, altura, profundidade) de uma linha lida, com o campo ausente no erro
+    if not isinstance(row, dict):
+        raise ValueError(f"linha {line_number}: esperado um objeto com {', '.join(INPUT_FIELDS)}")
+    for name in INPUT_FIELDS:
+        if row.get(name) is None:
+            raise ValueError(f"linha {line_number}: campo '{name}' ausente")
+    return (line_number,) + tuple(row[name] for name in INPUT_FIELDS)
+
+
+def read_rows(stream, fmt):
+    # Gera (linha, forma, largura, altura, profundidade) sem carregar o arquivo inteiro
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield row_fields(row, reader.line_num)
+    else:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            yield row_fields(json.loads(line), line_number)
+
+
+def read_chunks(rows, chunk_size):
+    shapes, dims = [], []
+    for line_number, shape, width, height, depth in rows:
+        try:
+            dims.append((float(width), float(height), float(depth)))
+        except (TypeError, ValueError):
+            raise ValueError(f"linha {line_number}: dimensões inválidas")
+        shape = GeometryCalculator.normalize_shape(str(shape))
+        if shape not in BATCH_SHAPES:
+            raise ValueError(f"linha {line_number}: forma desconhecida '{shape}'")
+        shapes.append(shape)
+        if len(shapes) == chunk_size:
+            yield shapes, np.array(dims, dtype=np.float64)
+            shapes, dims = [], []
+    if shapes:
+        yield shapes, np.array(dims, dtype=np.float64)
+
+
+def serial_columns(shape, width, height, depth):
+    properties = GeometryCalculator.calculate_properties_batch(shape, width, height, depth)
+    return GeometryCalculator.flatten_batch_properties(properties)
+
+
+def compute_chunk(shapes, dims, compute_columns=serial_columns):
+    # Agrupa o bloco por forma, calcula cada grupo vetorizado e devolve uma matriz na ordem original
+    shape_array = np.array(shapes)
+    values = np.full((len(shapes), len(OUTPUT_FIELDS)), np.nan)
+    values[:, 1:4] = dims
+    for shape in np.unique(shape_array):
+        mask = shape_array == shape
+        subset = dims[mask]
+        columns = compute_columns(str(shape), subset[:, 0], subset[:, 1], subset[:, 2])
+        for name, column in columns.items():
+            values[mask, OUTPUT_FIELDS.index(name)] = column
+    return values
+
+
+def write_chunk(stream, fmt, shapes, values):
+    if fmt == "csv":
+        rows = (
+            [shape] + ["" if math.isnan(v) else repr(v) for v in row[1:]]
+            for shape, row in zip(shapes, values.tolist())
+        )
+        csv.writer(stream).writerows(rows)
+    else:
+        for shape, row in zip(shapes, values.tolist()):
+            record = {"shape": shape}
+            record.update((name, v) for name, v in zip(OUTPUT_FIELDS[1:], row[1:]) if not math.isnan(v))
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def process_stream(source, target, input_format, output_format, chunk_size=DEFAULT_CHUNK_SIZE,
+                   compute_columns=serial_columns, archive=None):
+    # archive: MeshArchive opcional que recebe a malha de cada forma do lote
+    if output_format == "csv":
+        csv.writer(target).writerow(OUTPUT_FIELDS)
+    count = 0
+    for shapes, dims in read_chunks(read_rows(source, input_format), chunk_size):
+        write_chunk(target, output_format, shapes, compute_chunk(shapes, dims, compute_columns))
+        target.flush()
+        if archive is not None:
+            archive.add_shapes(shapes, dims)
+        count += len(shapes)
+    return count
+
+
+def open_text(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Calcula propriedades geométricas em lote, sem interface gráfica.")
+    parser.add_argument("input", help="arquivo CSV ou JSON por linha com shape,width,height,depth ('-' para stdin)")
+    parser.add_argument("output", help="arquivo de saída ('-' para stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="formato de entrada (padrão: pela extensão)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="formato de saída (padrão: pela extensão)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="formas processadas por bloco")
+    parser.add_argument("--workers", type=int, default=1, help="processos paralelos (0 = todos os núcleos)")
+    parser.add_argument("--worker-chunk-size", type=int, help="formas por tarefa de cada processo")
+    parser.add_argument("--export-meshes", metavar="ARQUIVO.zip", help="grava também a malha de cada forma em um zip")
+    parser.add_argument("--mesh-format", choices=["stl", "obj", "glb"], default="stl",
+                        help="formato das malhas exportadas (padrão: stl)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size deve ser positivo")
+    if args.workers < 0:
+        parser.error("--workers não pode ser negativo")
+    if args.worker_chunk_size is not None and args.worker_chunk_size <= 0:
+        parser.error("--worker-chunk-size deve ser positivo")
+    input_format = detect_format(args.input, args.input_format)
+    output_format = detect_format(args.output, args.output_format)
+    source = None
+    target = None
+    pool = None
+    archive = None
+    compute_columns = serial_columns
+    try:
+        source = open_text(args.input, "r")
+        target = open_text(args.output, "w")
+        if args.workers != 1:
+            pool = ParallelBatchCalculator(args.workers or None, args.worker_chunk_size)
+            compute_columns = pool.compute_columns
+        if args.export_meshes:
+            archive = MeshArchive(args.export_meshes, "." + args.mesh_format)
+        count = process_stream(source, target, input_format, output_format, args.chunk_size, compute_columns,
+                               archive)
+    except (ValueError, KeyError, OSError) as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if pool is not None:
+            pool.close()
+        if archive is not None:
+            archive.close()
+        if source not in (None, sys.stdin):
+            source.close()
+        if target not in (None, sys.stdout):
+            target.close()
+    print(f"{count} formas processadas.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Medições de abertura, imports e cálculo com histórico em JSON e limites de regressão.
+# Uso, a partir da raiz do projeto: python -m benchmarks.run [--only grupo ...] [--no-save]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "history.json")
+DEFAULT_THRESHOLDS = os.path.join(ROOT, "benchmarks", "thresholds.json")
+# Execuções anteriores aprovadas (da mesma máquina) cuja mediana serve de referência
+BASELINE_RUNS = 5
+IMPORT_MODULES = ("main", "geometry_calculator", "mesh", "view3d", "geometry3d", "OpenGL.GL", "numpy")
+SHAPES = ("parallelepiped", "pyramid", "cylinder", "cone", "sphere", "frustum")
+PARAMS = {"width": 2.0, "height": 3.0, "depth": 4.0}
+BATCH_SIZE = 1_000_000
+# Plataforma sem tela: as medições de Qt rodam em servidores de integração
+QT_ENV = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+
+# Processo novo até o MainApp aparecer (imprime quando a janela já foi mostrada)
+COLD_START_SCRIPT = """
+import sys
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import main
+window = main.MainApp()
+window.show()
+app.processEvents()
+print("shown", flush=True)
+"""
+
+
+def measure(function, repeat, number=1):
+    # Mediana (ms) de `repeat` medições de `number` chamadas
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def bench_cold_start(repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-c", COLD_START_SCRIPT], cwd=ROOT, env=QT_ENV,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        line = process.stdout.readline()
+        elapsed = (time.perf_counter() - start) * 1000
+        process.wait()
+        if line.strip() != "shown":
+            raise RuntimeError("A janela principal não abriu")
+        times.append(elapsed)
+    return {"cold_start": statistics.median(times)}
+
+
+def import_time(module):
+    # Custo acumulado (ms) de importar o módulo num interpretador novo, segundo -X importtime
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=QT_ENV,
+                            capture_output=True, text=True, check=True)
+    for line in reversed(result.stderr.splitlines()):
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"Import de {module} não encontrado na saída de -X importtime")
+
+
+def bench_imports(repeat):
+    return {f"import.{module}": statistics.median(import_time(module) for _ in range(repeat))
+            for module in IMPORT_MODULES}
+
+
+def bench_view3d(repeat):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from geometry_calculator import GeometryCalculator
+    from view3d import View3D
+
+    def construct(shape):
+        window = View3D(shape, dict(PARAMS), GeometryCalculator())
+        window.deleteLater()
+        app.processEvents()
+
+    return {f"view3d.{shape}": measure(lambda: construct(shape), repeat) for shape in ("parallelepiped", "sphere")}
+
+
+def bench_calculator(repeat):
+    import numpy as np
+    from geometry_calculator import GeometryCalculator
+    results = {
+        # 1000 chamadas com dicionários, distribuídas entre as formas
+        "calculator.properties_x1000": measure(
+            lambda: [GeometryCalculator.calculate_properties(shape, PARAMS) for shape in SHAPES for _ in range(167)],
+            repeat)
+    }
+    dims = np.random.default_rng(0).uniform(0.1, 10.0, (3, BATCH_SIZE))
+    for shape in ("parallelepiped", "pyramid"):
+        results[f"calculator.batch_1e6.{shape}"] = measure(
+            lambda: GeometryCalculator.calculate_properties_batch(shape, *dims), repeat)
+    return results
+
+
+def bench_shape_data(repeat):
+    from mesh import build_mesh
+    from shape_data import compute_shape_data
+    results = {}
+    for shape in SHAPES:
+        mesh = build_mesh(shape, PARAMS)
+        results[f"shape_data.{shape}"] = measure(lambda: compute_shape_data(shape, PARAMS, mesh), repeat, 100) / 100
+    return results
+
+
+BENCHMARKS = {
+    "cold_start": bench_cold_start,
+    "imports": bench_imports,
+    "view3d": bench_view3d,
+    "calculator": bench_calculator,
+    "shape_data": bench_shape_data
+}
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as stream:
+        return json.load(stream)
+
+
+def metric_limits(name, thresholds):
+    # Limites do grupo mais específico: "import.main" usa "import.main", senão "import", senão "default"
+    limits = dict(thresholds.get("default", {}))
+    metrics = thresholds.get("metrics", {})
+    parts = name.split(".")
+    for end in range(1, len(parts) + 1):
+        limits.update(metrics.get(".".join(parts[:end]), {}))
+    return limits
+
+
+def check_results(results, history, thresholds, machine):
+    # Falhas por limite absoluto (max_ms) ou por piora em relação à mediana das últimas
+    # execuções aprovadas na mesma máquina (max_regression, ignorando diferenças < min_delta_ms)
+    previous = [run["results"] for run in history if run.get("machine") == machine and run.get("passed")]
+    previous = previous[-BASELINE_RUNS:]
+    failures = []
+    for name, value in results.items():
+        limits = metric_limits(name, thresholds)
+        max_ms = limits.get("max_ms")
+        if max_ms is not None and value > max_ms:
+            failures.append(f"{name}: {value:.2f} ms acima do limite de {max_ms} ms")
+        baseline_values = [run[name] for run in previous if name in run]
+        max_regression = limits.get("max_regression")
+        if baseline_values and max_regression is not None:
+            baseline = statistics.median(baseline_values)
+            if value > baseline * (1 + max_regression) and value - baseline > limits.get("min_delta_ms", 0.0):
+                failures.append(f"{name}: {value:.2f} ms, {value / baseline - 1:.0%} acima da referência "
+                                f"de {baseline:.2f} ms")
+    return failures
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Mede abertura, imports e cálculos e compara com o histórico.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="grupos a medir (padrão: todos)")
+    parser.add_argument("--repeat", type=int, default=5, help="repetições de cada medição (vale a mediana)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="arquivo JSON com as execuções anteriores")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="arquivo JSON com os limites")
+    parser.add_argument("--no-save", action="store_true", help="não acrescenta esta execução ao histórico")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.repeat <= 0:
+        parser.error("--repeat deve ser positivo")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    results = {}
+    for name in args.only or BENCHMARKS:
+        results.update(BENCHMARKS[name](args.repeat))
+    history = load_json(args.history, [])
+    machine = platform.node()
+    failures = check_results(results, history, load_json(args.thresholds, {}), machine)
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:10.3f} ms")
+    if not args.no_save:
+        history.append({
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "machine": machine,
+            "python": platform.python_version(),
+            "commit": git_commit(),
+            "passed": not failures,
+            "results": results
+        })
+        with open(args.history, "w", encoding="utf-8") as stream:
+            json.dump(history, stream, indent=1)
+    for failure in failures:
+        print(f"Regressão: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
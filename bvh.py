@@ -0,0 +1,133 @@
+import numpy as np
+
+# Triângulos por folha e filhos por nó: árvore rasa, poucos passos de NumPy por raio
+LEAF_SIZE = 8
+BRANCHING = 8
+# Bits por eixo do código de Morton (30 bits no total) e bits reservados ao índice do triângulo
+MORTON_BITS = 10
+INDEX_BITS = 34
+# Triângulos processados por bloco na construção
+BUILD_CHUNK_SIZE = 1 << 16
+# Tolerância do teste de Möller–Trumbore
+EPSILON = 1e-12
+
+
+def _spread_bits(values):
+    # Intercala dois zeros entre os 10 bits de cada coordenada
+    v = values.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x030000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x0300F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x030C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x09249249)
+    return v
+
+
+def morton_codes(points, lower, upper):
+    # Código de Morton de pontos (3, n) quantizados na caixa [lower, upper]
+    extent = np.maximum(upper - lower, 1e-12)
+    scale = ((1 << MORTON_BITS) - 1) / extent
+    quantized = np.clip((points - lower[:, None]) * scale[:, None], 0, (1 << MORTON_BITS) - 1)
+    x, y, z = (_spread_bits(axis) for axis in quantized)
+    return x | (y << np.uint64(1)) | (z << np.uint64(2))
+
+
+def _reduce_groups(lower, upper, size):
+    # Caixas envolventes de grupos consecutivos de `size` colunas (o último grupo pode ser menor)
+    starts = np.arange(0, lower.shape[1], size)
+    return np.minimum.reduceat(lower, starts, axis=1), np.maximum.reduceat(upper, starts, axis=1)
+
+
+class BVH:
+    # Hierarquia linear de caixas (LBVH): triângulos ordenados pelo código de Morton dos centros,
+    # folhas com LEAF_SIZE triângulos consecutivos e cada nível agrupando BRANCHING nós vizinhos.
+    # A construção e a travessia são vetorizadas; a árvore fica implícita nos arrays por nível.
+    def __init__(self, vertices, triangles, leaf_size=LEAF_SIZE, branching=BRANCHING):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self.triangles = np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1, 3)
+        self.leaf_size = leaf_size
+        self.branching = branching
+        count = len(self.triangles)
+        if not count:
+            raise ValueError("Malha sem triângulos")
+        coordinates = np.ascontiguousarray(self.vertices.T)
+        corners = np.ascontiguousarray(self.triangles.T)
+        lower = np.empty((3, count), dtype=np.float32)
+        upper = np.empty((3, count), dtype=np.float32)
+        for start in range(0, count, BUILD_CHUNK_SIZE):
+            stop = min(start + BUILD_CHUNK_SIZE, count)
+            p0, p1, p2 = (np.take(coordinates, corners[k, start:stop], axis=1) for k in range(3))
+            lower[:, start:stop] = np.minimum(np.minimum(p0, p1), p2)
+            upper[:, start:stop] = np.maximum(np.maximum(p0, p1), p2)
+        codes = morton_codes((lower + upper) / 2, lower.min(axis=1), upper.max(axis=1))
+        # Ordena código e índice juntos: np.sort em uint64 é bem mais rápido que argsort
+        keys = np.sort((codes << np.uint64(INDEX_BITS)) | np.arange(count, dtype=np.uint64))
+        index_dtype = np.int32 if count < 2**31 else np.int64
+        self.order = (keys & np.uint64((1 << INDEX_BITS) - 1)).astype(index_dtype)
+        del keys, codes
+        level = _reduce_groups(np.take(lower, self.order, axis=1), np.take(upper, self.order, axis=1), leaf_size)
+        del lower, upper
+        levels = [level]
+        while level[0].shape[1] > 1:
+            level = _reduce_groups(*level, branching)
+            levels.append(level)
+        # Raiz primeiro: os filhos do nó i do nível k são i * branching + j no nível k + 1
+        self.levels = levels[::-1]
+
+    def __len__(self):
+        return len(self.triangles)
+
+    def _leaf_candidates(self, origin, direction, max_distance):
+        # + 0.0 troca -0.0 por 0.0: eixos sem direção sempre dão inverso +inf
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1.0 / (direction + 0.0)
+        nodes = np.zeros(1, dtype=np.int64)
+        for depth, (lower, upper) in enumerate(self.levels):
+            # Teste de placas contra as caixas da fronteira atual
+            with np.errstate(invalid="ignore"):
+                t1 = (np.take(lower, nodes, axis=1) - origin[:, None]) * inverse[:, None]
+                t2 = (np.take(upper, nodes, axis=1) - origin[:, None]) * inverse[:, None]
+            # 0·inf (origem sobre o plano da caixa num eixo sem direção): o raio corre no plano
+            # e conta como dentro da placa
+            t1[np.isnan(t1)] = -np.inf
+            t2[np.isnan(t2)] = np.inf
+            near = np.fmax.reduce(np.fmin(t1, t2), axis=0)
+            far = np.fmin.reduce(np.fmax(t1, t2), axis=0)
+            nodes = nodes[(far >= np.maximum(near, 0)) & (near <= max_distance)]
+            if not len(nodes):
+                return nodes
+            if depth + 1 < len(self.levels):
+                children = (nodes[:, None] * self.branching + np.arange(self.branching)).ravel()
+                nodes = children[children < self.levels[depth + 1][0].shape[1]]
+        return nodes
+
+    def intersect(self, origin, direction, max_distance=np.inf):
+        # Triângulo mais próximo atingido pelo raio: (índice, distância paramétrica t) ou None
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        leaves = self._leaf_candidates(origin, direction, max_distance)
+        if not len(leaves):
+            return None
+        slots = (leaves[:, None] * self.leaf_size + np.arange(self.leaf_size)).ravel()
+        candidates = self.order[slots[slots < len(self.order)]]
+        t = self.intersect_triangles(candidates, origin, direction)
+        t[t > max_distance] = np.inf
+        best = int(np.argmin(t))
+        if not np.isfinite(t[best]):
+            return None
+        return int(candidates[best]), float(t[best])
+
+    def intersect_triangles(self, candidates, origin, direction):
+        # Möller–Trumbore sem descartar faces de costas; inf onde o raio não acerta
+        p0, p1, p2 = (self.vertices[self.triangles[candidates, k]].astype(np.float64) for k in range(3))
+        edge1, edge2 = p1 - p0, p2 - p0
+        p = np.cross(direction, edge2)
+        determinant = np.einsum("ij,ij->i", edge1, p)
+        valid = np.abs(determinant) > EPSILON
+        inverse = 1.0 / np.where(valid, determinant, 1.0)
+        offset = origin - p0
+        u = np.einsum("ij,ij->i", offset, p) * inverse
+        q = np.cross(offset, edge1)
+        v = (q @ direction) * inverse
+        t = np.einsum("ij,ij->i", edge2, q) * inverse
+        valid &= (u >= 0) & (v >= 0) & (u + v <= 1) & (t > EPSILON)
+        return np.where(valid, t, np.inf)
@@ -0,0 +1,184 @@
+import math
+import numpy as np
+
+# Mesmas convenções do Geometry3D: gluPerspective(45, aspecto, 1, 50) e
+# glTranslatef(x_offset, y_offset, zoom) seguido de glRotatef em x e depois em y
+FOV_Y = 45.0
+NEAR_PLANE = 1.0
+FAR_PLANE = 50.0
+FACE_CAMERA_DISTANCE = 8.0
+DEFAULT_VIEW = {"x_rot": 30.0, "y_rot": 30.0, "zoom": -10.0, "x_offset": 0.0, "y_offset": 0.0}
+
+# As matrizes seguem a convenção matemática (vetores coluna); para glLoadMatrix use matrix.T
+
+
+def perspective(fov_y, aspect, near, far):
+    f = 1.0 / math.tan(math.radians(fov_y) / 2)
+    matrix = np.zeros((4, 4))
+    matrix[0, 0] = f / aspect
+    matrix[1, 1] = f
+    matrix[2, 2] = (far + near) / (near - far)
+    matrix[2, 3] = 2 * far * near / (near - far)
+    matrix[3, 2] = -1.0
+    return matrix
+
+
+def orthographic(left, right, bottom, top, near=-1.0, far=1.0):
+    # Mesma matriz de glOrtho
+    matrix = np.eye(4)
+    matrix[0, 0] = 2 / (right - left)
+    matrix[1, 1] = 2 / (top - bottom)
+    matrix[2, 2] = -2 / (far - near)
+    matrix[:3, 3] = (-(right + left) / (right - left), -(top + bottom) / (top - bottom), -(far + near) / (far - near))
+    return matrix
+
+
+def translate(x, y, z):
+    matrix = np.eye(4)
+    matrix[:3, 3] = (x, y, z)
+    return matrix
+
+
+def rotate(angle, x, y, z):
+    # Mesma matriz de glRotatef (ângulo em graus, eixo normalizado)
+    axis = np.array([x, y, z], dtype=np.float64)
+    axis /= np.linalg.norm(axis)
+    c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    ax, ay, az = axis
+    matrix = np.eye(4)
+    matrix[:3, :3] = [
+        [ax * ax * (1 - c) + c, ax * ay * (1 - c) - az * s, ax * az * (1 - c) + ay * s],
+        [ay * ax * (1 - c) + az * s, ay * ay * (1 - c) + c, ay * az * (1 - c) - ax * s],
+        [az * ax * (1 - c) - ay * s, az * ay * (1 - c) + ax * s, az * az * (1 - c) + c]
+    ]
+    return matrix
+
+
+def look_at(eye, center, up=(0, 1, 0)):
+    # Mesma matriz de gluLookAt
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(center, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, up)
+    norm = np.linalg.norm(side)
+    if norm < 1e-12:
+        # Olhando ao longo de "up": escolhe outro vetor de referência
+        side = np.cross(forward, (0, 0, -1 if forward[1] > 0 else 1))
+        norm = np.linalg.norm(side)
+    side /= norm
+    true_up = np.cross(side, forward)
+    matrix = np.eye(4)
+    matrix[0, :3] = side
+    matrix[1, :3] = true_up
+    matrix[2, :3] = -forward
+    return matrix @ translate(*(-eye))
+
+
+def orbit_view(x_rot, y_rot, zoom, x_offset=0.0, y_offset=0.0):
+    return translate(x_offset, y_offset, zoom) @ rotate(x_rot, 1, 0, 0) @ rotate(y_rot, 0, 1, 0)
+
+
+def face_view(face_data, distance=FACE_CAMERA_DISTANCE):
+    # Câmera posicionada ao longo da normal da face, olhando para o seu centro
+    center = np.asarray(face_data["center"], dtype=np.float64)
+    eye = center + np.asarray(face_data["normal"], dtype=np.float64) * distance
+    return look_at(eye, center)
+
+
+def projected_radius(radius, distance, viewport_height, fov_y=FOV_Y):
+    # Raio em pixels de uma esfera a essa distância da câmera (aproximação para o nível de detalhe)
+    distance = max(distance, NEAR_PLANE)
+    return radius * viewport_height / (2 * distance * math.tan(math.radians(fov_y) / 2))
+
+
+def project(points, mvp, width, height):
+    # Coordenadas de janela (x, y para cima, profundidade 0..1) e máscara dentro do volume de recorte
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    clip = np.hstack([points, np.ones((len(points), 1))]) @ mvp.T
+    w = clip[:, 3:4]
+    inside = (w[:, 0] > 0) & np.all(np.abs(clip[:, :3]) <= w, axis=1)
+    ndc = clip[:, :3] / np.where(np.abs(w) < 1e-12, 1e-12, w)
+    window = np.column_stack([
+        (ndc[:, 0] + 1) * width / 2,
+        (ndc[:, 1] + 1) * height / 2,
+        (ndc[:, 2] + 1) / 2
+    ])
+    return window, inside
+
+
+def unproject_ray(x, y, mvp, width, height):
+    # Raio (origem no plano próximo, direção unitária) sob o ponto de janela (x, y para cima)
+    ndc = np.array([2 * x / width - 1, 2 * y / height - 1])
+    inverse = np.linalg.inv(mvp)
+    near = inverse @ np.array([ndc[0], ndc[1], -1.0, 1.0])
+    far = inverse @ np.array([ndc[0], ndc[1], 1.0, 1.0])
+    near, far = near[:3] / near[3], far[:3] / far[3]
+    direction = far - near
+    return near, direction / np.linalg.norm(direction)
+
+
+def quaternion_from_matrix(matrix):
+    # Quaternion unitário (w, x, y, z) de uma matriz de rotação 3x3
+    m = np.asarray(matrix, dtype=np.float64)[:3, :3]
+    trace = m[0, 0] + m[1, 1] + m[2, 2]
+    if trace > 0:
+        s = 2 * math.sqrt(trace + 1)
+        q = [s / 4, (m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s]
+    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
+        s = 2 * math.sqrt(1 + m[0, 0] - m[1, 1] - m[2, 2])
+        q = [(m[2, 1] - m[1, 2]) / s, s / 4, (m[0, 1] + m[1, 0]) / s, (m[0, 2] + m[2, 0]) / s]
+    elif m[1, 1] > m[2, 2]:
+        s = 2 * math.sqrt(1 + m[1, 1] - m[0, 0] - m[2, 2])
+        q = [(m[0, 2] - m[2, 0]) / s, (m[0, 1] + m[1, 0]) / s, s / 4, (m[1, 2] + m[2, 1]) / s]
+    else:
+        s = 2 * math.sqrt(1 + m[2, 2] - m[0, 0] - m[1, 1])
+        q = [(m[1, 0] - m[0, 1]) / s, (m[0, 2] + m[2, 0]) / s, (m[1, 2] + m[2, 1]) / s, s / 4]
+    q = np.array(q)
+    return q / np.linalg.norm(q)
+
+
+def quaternion_matrix(q):
+    w, x, y, z = np.asarray(q, dtype=np.float64) / np.linalg.norm(q)
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)]
+    ])
+
+
+def slerp(q0, q1, t):
+    # Interpolação esférica pelo caminho mais curto (q e -q são a mesma rotação)
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    dot = float(np.dot(q0, q1))
+    if dot < 0:
+        q1, dot = -q1, -dot
+    if dot > 0.9995:
+        # Quase iguais: a interpolação linear normalizada evita dividir por sen(ângulo) ≈ 0
+        q = q0 + (q1 - q0) * t
+        return q / np.linalg.norm(q)
+    angle = math.acos(dot)
+    return (math.sin((1 - t) * angle) * q0 + math.sin(t * angle) * q1) / math.sin(angle)
+
+
+def camera_position(view):
+    # Posição da câmera no mundo para uma vista rígida (rotação e translação)
+    view = np.asarray(view, dtype=np.float64)
+    return -view[:3, :3].T @ view[:3, 3]
+
+
+def interpolate_view(start, end, t):
+    # Vista intermediária: orientação por slerp e posição da câmera em linha reta; t=0 e t=1
+    # devolvem as próprias vistas
+    rotation = quaternion_matrix(slerp(quaternion_from_matrix(start), quaternion_from_matrix(end), t))
+    eye = camera_position(start) * (1 - t) + camera_position(end) * t
+    view = np.eye(4)
+    view[:3, :3] = rotation
+    view[:3, 3] = -rotation @ eye
+    return view
+
+
+def ease_in_out(t):
+    # Suaviza o início e o fim da transição (smoothstep)
+    t = min(max(t, 0.0), 1.0)
+    return t * t * (3 - 2 * t)
@@ -1,12 +1,23 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton
 from PyQt6.QtGui import QDoubleValidator
+from geometry_calculator import GeometryCalculator
+
+# Rótulos dos três campos por forma; None desabilita um campo que a forma não usa
+FIELD_LABELS = {
+    "parallelepiped": ("Largura:", "Altura:", "Profundidade:"),
+    "pyramid": ("Largura:", "Altura:", "Profundidade:"),
+    "cylinder": ("Diâmetro:", "Altura:", None),
+    "cone": ("Diâmetro da base:", "Altura:", None),
+    "sphere": ("Diâmetro:", None, None),
+    "frustum": ("Diâmetro da base:", "Altura:", "Diâmetro do topo:")
+}
 
 class ConfigFormTab(QWidget):
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout()
         self.shape_selector = QComboBox()
-        self.shape_selector.addItems(["Paralelepípedo", "Pirâmide"])
+        self.shape_selector.addItems(["Paralelepípedo", "Pirâmide", "Cilindro", "Cone", "Esfera", "Tronco de Cone"])
         self.input_width = QLineEdit("2")
         self.input_height = QLineEdit("3")
         self.input_depth = QLineEdit("4")
@@ -16,13 +27,23 @@ class ConfigFormTab(QWidget):
         self.input_height.setValidator(validator)
         self.input_depth.setValidator(validator)
         self.confirm_button = QPushButton("Visualizar")
-        layout.addWidget(QLabel("Largura:"))
-        layout.addWidget(self.input_width)
-        layout.addWidget(QLabel("Altura:"))
-        layout.addWidget(self.input_height)
-        layout.addWidget(QLabel("Profundidade:"))
-        layout.addWidget(self.input_depth)
+        self.scene_button = QPushButton("Abrir cena...")
+        self.mesh_button = QPushButton("Importar malha (STL/OBJ)...")
+        self.field_labels = [QLabel("Largura:"), QLabel("Altura:"), QLabel("Profundidade:")]
+        for label, field in zip(self.field_labels, (self.input_width, self.input_height, self.input_depth)):
+            layout.addWidget(label)
+            layout.addWidget(field)
         layout.addWidget(QLabel("Escolha a forma:"))
         layout.addWidget(self.shape_selector)
         layout.addWidget(self.confirm_button)
+        layout.addWidget(self.scene_button)
+        layout.addWidget(self.mesh_button)
         self.setLayout(layout)
+        self.shape_selector.currentTextChanged.connect(self.update_field_labels)
+
+    def update_field_labels(self, text):
+        shape = GeometryCalculator.normalize_shape(text)
+        fields = (self.input_width, self.input_height, self.input_depth)
+        for label, field, caption in zip(self.field_labels, fields, FIELD_LABELS.get(shape, FIELD_LABELS["parallelepiped"])):
+            label.setText(caption or label.text())
+            field.setEnabled(caption is not None)
@@ -0,0 +1,62 @@
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel, QSlider
+from config_form_tab import FIELD_LABELS
+from geometry_calculator import GeometryCalculator
+from mesh import DIMENSIONS
+
+# Mesma faixa do formulário (0,1 a 10 com duas casas): o controle trabalha em centésimos
+SLIDER_SCALE = 100
+SLIDER_RANGE = (10, 1000)
+
+class DimensionSliders(QWidget):
+    # Um controle deslizante por dimensão usada pela forma; cada movimento emite os parâmetros
+    # completos para a vista e a aba de informações se atualizarem na hora
+    parameters_changed = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.shape = None
+        self.params = {}
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.captions = []
+        self.sliders = []
+        self.values = []
+        for row, name in enumerate(DIMENSIONS):
+            caption = QLabel()
+            slider = QSlider(Qt.Orientation.Horizontal)
+            slider.setRange(*SLIDER_RANGE)
+            slider.valueChanged.connect(lambda value, name=name: self.on_value_changed(name, value))
+            value_label = QLabel()
+            value_label.setMinimumWidth(40)
+            layout.addWidget(caption, row, 0)
+            layout.addWidget(slider, row, 1)
+            layout.addWidget(value_label, row, 2)
+            self.captions.append(caption)
+            self.sliders.append(slider)
+            self.values.append(value_label)
+
+    def set_shape(self, shape, params):
+        # Mostra só as dimensões que a forma usa; formas sem parâmetros (malhas, cenas) escondem tudo
+        self.shape = shape
+        self.params = dict(params)
+        labels = FIELD_LABELS.get(shape)
+        self.setVisible(labels is not None)
+        if labels is None:
+            return
+        for caption, slider, value_label, name, text in zip(self.captions, self.sliders, self.values,
+                                                            DIMENSIONS, labels):
+            for widget in (caption, slider, value_label):
+                widget.setVisible(text is not None)
+            caption.setText(text or "")
+            slider.blockSignals(True)
+            slider.setValue(round(float(params.get(name, 1.0)) * SLIDER_SCALE))
+            slider.blockSignals(False)
+            value_label.setText(GeometryCalculator.format_value(float(params.get(name, 1.0))))
+
+    def on_value_changed(self, name, value):
+        value = value / SLIDER_SCALE
+        self.values[DIMENSIONS.index(name)].setText(GeometryCalculator.format_value(value))
+        # Dicionário novo a cada passo: a vista compara com os parâmetros anteriores
+        self.params = dict(self.params, **{name: value})
+        self.parameters_changed.emit(self.params)
@@ -0,0 +1,211 @@
+import ctypes
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+from OpenGL.GL import *
+
+# Quadros mantidos nos histogramas móveis
+HISTORY_FRAMES = 240
+# Consultas de tempo em voo: o resultado é lido alguns quadros depois, sem travar a GPU
+GPU_QUERY_RING = 4
+# Leituras acima disso são descartadas (alguns drivers devolvem lixo na primeira consulta)
+MAX_GPU_MS = 10000.0
+# Limites (ms) das faixas do histograma, em escala logarítmica
+HISTOGRAM_EDGES = (0.0, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 66.7, float("inf"))
+# Variável de ambiente com o caminho do CSV de tempos por quadro
+FRAME_LOG_ENV = "GEOMETRY3D_FRAME_LOG"
+FRAME_STAGE = "paintGL"
+GPU_STAGE = "gpu"
+
+
+class GpuTimer:
+    # Tempo de GPU do quadro inteiro com GL_TIME_ELAPSED (consultas não podem ser aninhadas).
+    # Usa um anel de consultas e só lê as que já terminaram.
+    def __init__(self, ring=GPU_QUERY_RING):
+        self.ring = ring
+        self.queries = None
+        self.free = []
+        self.pending = deque()  # (consulta, número do quadro)
+        self.active = None
+        # Decidido no primeiro quadro, já com o contexto atual
+        self.available = None
+
+    def begin(self, frame):
+        if self.available is None:
+            self.available = False
+            if bool(glGenQueries) and bool(glBeginQuery):
+                try:
+                    self.queries = list(glGenQueries(self.ring))
+                    self.free = list(self.queries)
+                    self.available = True
+                except GLError:
+                    pass
+        if not self.available:
+            return
+        if not self.free:
+            # Todas ainda em voo: pula a medição deste quadro
+            return
+        query = self.free.pop()
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self.active = (query, frame)
+
+    def end(self):
+        if self.active is not None:
+            glEndQuery(GL_TIME_ELAPSED)
+            self.pending.append(self.active)
+            self.active = None
+
+    def collect(self):
+        # Resultados prontos: lista de (quadro, ms)
+        results = []
+        while self.pending and glGetQueryObjectiv(self.pending[0][0], GL_QUERY_RESULT_AVAILABLE):
+            query, frame = self.pending.popleft()
+            elapsed = (ctypes.c_uint64 * 1)()
+            glGetQueryObjectui64v(query, GL_QUERY_RESULT, elapsed)
+            self.free.append(query)
+            if elapsed[0] / 1e6 <= MAX_GPU_MS:
+                results.append((frame, elapsed[0] / 1e6))
+        return results
+
+    def release(self):
+        if self.queries:
+            glDeleteQueries(len(self.queries), self.queries)
+        self.queries = None
+        self.free = []
+        self.pending.clear()
+        self.active = None
+        self.available = None
+
+
+class FrameProfiler:
+    # Tempos de CPU por estágio de renderização e de GPU por quadro, com histogramas móveis
+    # dos últimos quadros e, opcionalmente, um CSV com uma linha por quadro.
+    def __init__(self, history=HISTORY_FRAMES, log_path=None, gpu=True, clock=time.perf_counter, log_stages=None):
+        self.history = history
+        self.clock = clock
+        self.samples = {}  # estágio -> deque de ms
+        self.frame = 0
+        self.overlay_visible = False
+        self.gpu_timer = GpuTimer() if gpu else None
+        self._current = None
+        self._frame_start = 0.0
+        self._unfinished = {}  # quadro -> linha do log à espera do tempo de GPU
+        self.log_path = log_path
+        self._log = None
+        # Colunas do CSV; sem lista, usa os estágios do primeiro quadro registrado
+        self._log_stages = list(log_stages) if log_stages is not None else None
+
+    @classmethod
+    def from_environment(cls, **options):
+        return cls(log_path=os.environ.get(FRAME_LOG_ENV) or None, **options)
+
+    def begin_frame(self):
+        self.frame += 1
+        self._current = {}
+        if self.gpu_timer is not None:
+            self.gpu_timer.begin(self.frame)
+        self._frame_start = self.clock()
+
+    def end_frame(self):
+        elapsed = (self.clock() - self._frame_start) * 1000
+        if self.gpu_timer is not None:
+            self.gpu_timer.end()
+        stages = dict(self._current, **{FRAME_STAGE: elapsed})
+        for name, value in stages.items():
+            self._record(name, value)
+        self._current = None
+        if self.log_path:
+            self._unfinished[self.frame] = (time.time(), stages)
+        if self.gpu_timer is not None:
+            for frame, value in self.gpu_timer.collect():
+                self._record(GPU_STAGE, value)
+                if frame in self._unfinished:
+                    self._unfinished[frame][1][GPU_STAGE] = value
+        if self.log_path:
+            self._flush_log()
+
+    @contextmanager
+    def stage(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                self._current[name] = self._current.get(name, 0.0) + (self.clock() - start) * 1000
+
+    def _record(self, name, value):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.history)
+        samples.append(value)
+
+    def _flush_log(self):
+        # Quadros saem em ordem; espera o tempo de GPU enquanto houver consultas em voo
+        waiting = self.gpu_timer is not None and bool(self.gpu_timer.available)
+        oldest_pending = min((frame for _, frame in self.gpu_timer.pending), default=None) if waiting else None
+        for frame in sorted(self._unfinished):
+            if oldest_pending is not None and frame >= oldest_pending:
+                break
+            self._write_row(frame, *self._unfinished.pop(frame))
+
+    def _write_row(self, frame, timestamp, stages):
+        if self._log is None:
+            self._log = open(self.log_path, "w", encoding="utf-8", buffering=1 << 16)
+            if self._log_stages is None:
+                self._log_stages = [name for name in stages if name not in (FRAME_STAGE, GPU_STAGE)]
+            columns = ["frame", "time", FRAME_STAGE] + self._log_stages + [GPU_STAGE]
+            self._log.write(",".join(columns) + "\n")
+        values = [stages.get(FRAME_STAGE)] + [stages.get(name) for name in self._log_stages] + [stages.get(GPU_STAGE)]
+        self._log.write(f"{frame},{timestamp:.3f}," + ",".join("" if v is None else f"{v:.4f}" for v in values) + "\n")
+
+    def summary(self) -> dict:
+        # Estatísticas (ms) de cada estágio nos quadros do histórico
+        result = {}
+        for name, samples in self.samples.items():
+            values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+            result[name] = {
+                "count": len(values),
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(values.max())
+            }
+        return result
+
+    def histogram(self, name=FRAME_STAGE):
+        # Contagem de quadros por faixa de HISTOGRAM_EDGES
+        samples = self.samples.get(name, ())
+        counts, _ = np.histogram(np.fromiter(samples, dtype=np.float64, count=len(samples)), HISTOGRAM_EDGES)
+        return counts
+
+    def recent(self, name=FRAME_STAGE):
+        return np.fromiter(self.samples.get(name, ()), dtype=np.float64)
+
+    def overlay_lines(self):
+        summary = self.summary()
+        frame = summary.get(FRAME_STAGE)
+        if frame is None:
+            return []
+        fps = 1000 / frame["mean"] if frame["mean"] > 0 else 0
+        lines = [f"CPU {frame['mean']:.2f} ms (p95 {frame['p95']:.2f}, máx {frame['max']:.2f}) ~{fps:.0f} fps"]
+        for name, stats in summary.items():
+            if name not in (FRAME_STAGE, GPU_STAGE):
+                lines.append(f"{name}: {stats['mean']:.2f} ms (p95 {stats['p95']:.2f})")
+        if GPU_STAGE in summary:
+            lines.append(f"GPU {summary[GPU_STAGE]['mean']:.2f} ms (p95 {summary[GPU_STAGE]['p95']:.2f})")
+        return lines
+
+    def close(self):
+        # Grava os quadros que ainda esperavam o tempo de GPU e fecha o CSV
+        for frame in sorted(self._unfinished):
+            self._write_row(frame, *self._unfinished.pop(frame))
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def release(self):
+        # Precisa do contexto GL atual (consultas de tempo)
+        if self.gpu_timer is not None:
+            self.gpu_timer.release()
@@ -0,0 +1,78 @@
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer
+from PyQt6.QtGui import QGuiApplication
+
+DEFAULT_REFRESH_RATE = 60.0
+# Depois disso (ms) sem pintura o quadro pedido é dado como perdido (janela minimizada ou oculta)
+STALL_TIMEOUT_MS = 250
+
+
+class FrameScheduler(QObject):
+    # Junta os pedidos de repintura em no máximo um quadro por atualização da tela e
+    # conduz animações contínuas por um timer, usando o tempo real entre quadros.
+    # Sem pedidos nem animação ativa, o timer para e o widget fica ocioso.
+    # Enquanto o quadro anterior não foi pintado, os passos seguintes são descartados em vez de
+    # enfileirados: sob carga a animação pula estados intermediários, mas não atrasa.
+    def __init__(self, widget, animate=None):
+        super().__init__(widget)
+        self.widget = widget
+        self.animate = animate  # animate(dt_em_segundos) -> True enquanto houver movimento
+        self.animating = False
+        self.frames = 0
+        self.dropped = 0
+        self._pending = False
+        self._awaiting_paint = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_frame)
+        self._last_frame = QElapsedTimer()
+        self._animation_clock = QElapsedTimer()
+
+    def frame_interval_ms(self) -> int:
+        screen = self.widget.screen() or QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, round(1000.0 / (rate if rate > 0 else DEFAULT_REFRESH_RATE)))
+
+    def request_frame(self):
+        self._pending = True
+        self._schedule()
+
+    def start_animation(self):
+        if not self.animating:
+            self.animating = True
+            self._animation_clock.start()
+        self._schedule()
+
+    def stop_animation(self):
+        self.animating = False
+
+    def frame_presented(self):
+        # Chamado pelo widget ao terminar de pintar: libera o próximo quadro
+        self._awaiting_paint = False
+
+    def _schedule(self):
+        if self._timer.isActive():
+            return
+        interval = self.frame_interval_ms()
+        elapsed = self._last_frame.elapsed() if self._last_frame.isValid() else interval
+        # Se já passou um quadro desde a última pintura, responde no próximo ciclo do loop
+        self._timer.start(max(0, interval - elapsed))
+
+    def _on_frame(self):
+        if self._awaiting_paint and self._last_frame.elapsed() < STALL_TIMEOUT_MS:
+            # O último quadro ainda está na fila de pintura: este passo é descartado e o tempo
+            # acumulado entra no dt do próximo
+            self.dropped += 1
+            self._timer.start(self.frame_interval_ms())
+            return
+        if self.animating and self.animate is not None:
+            dt = self._animation_clock.restart() / 1000.0
+            self.animating = bool(self.animate(dt))
+            self._pending = True
+        if self._pending:
+            self._pending = False
+            self._last_frame.start()
+            self.frames += 1
+            self._awaiting_paint = True
+            self.widget.update()
+        if self.animating:
+            self._timer.start(self.frame_interval_ms())
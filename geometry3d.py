@@ -1,93 +1,207 @@
 import math
+import time
+import numpy as np
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from OpenGL.GL import *
 from OpenGL.GLU import *
-from OpenGL.GLUT import glutInit, glutBitmapCharacter, GLUT_BITMAP_HELVETICA_12, GLUT_BITMAP_HELVETICA_10
 from geometry_calculator import GeometryCalculator
+from gl_resources import current_resources, glyph_atlas
+from text_atlas import LabelBatch
+from instanced_renderer import InstancedSceneRenderer
+from shader_renderer import ShaderRenderer
+from frame_scheduler import FrameScheduler
+from frame_profiler import FrameProfiler
+from shape_data import compute_shape_data, update_shape_data, build_labels, format_label_value
+from mesh import CURVED_SHAPES, SHAPE_DIMENSIONS, build_mesh, bounding_radius, resize_mesh, segments_for_radius
+from scene import SCENE_SHAPES, unit_mesh
+from bvh import BVH
+import camera
+
+# Deslocamento por segundo com uma seta pressionada (≈ 0.1 por auto-repetição a 30 Hz)
+PAN_SPEED = 3.0
+# Constante de aproximação do zoom suave (1/s)
+ZOOM_RATE = 12.0
+# Direção do deslocamento de cada seta: (x_offset, y_offset)
+PAN_KEYS = {
+    Qt.Key.Key_Up: (0.0, -1.0),
+    Qt.Key.Key_Down: (0.0, 1.0),
+    Qt.Key.Key_Left: (1.0, 0.0),
+    Qt.Key.Key_Right: (-1.0, 0.0)
+}
+# Deslocamento máximo do mouse (px) entre pressionar e soltar para contar como clique
+CLICK_TOLERANCE = 4
+# Estágios medidos em cada quadro (colunas do CSV de GEOMETRY3D_FRAME_LOG)
+RENDER_STAGES = ("level_of_detail", "draw_shape", "draw_labels", "draw_scene")
+# Intervalo (s) entre atualizações do texto da sobreposição de desempenho
+OVERLAY_REFRESH = 0.25
+# Gráfico de barras da sobreposição: quadros mostrados, pixels por ms e referência de 60 Hz
+OVERLAY_FRAMES = 120
+OVERLAY_PIXELS_PER_MS = 3.0
+OVERLAY_BUDGET_MS = 1000 / 60
+# Duração (s) das transições de câmera de focus_on_face e reset_view
+TRANSITION_DURATION = 0.6
+# Largura das arestas (px), tracejado da linha da altura (padrão de glLineStipple) e cor das superfícies
+EDGE_WIDTH = 2.0
+HEIGHT_LINE_STIPPLE = 0x00FF
+SURFACE_COLOR = (0.45, 0.5, 0.6)
+
+def resized_geometry(shape, base_params, params, segments, previous, shape_data, calculator):
+    # Malha, dados e propriedades de novas dimensões a partir da malha em cache dos parâmetros de
+    # abertura (`previous` e `shape_data` são os atuais). Sem estado do widget: pode rodar numa
+    # thread de trabalho
+    mesh = resize_mesh(shape, build_mesh(shape, base_params, segments), base_params, params, segments)
+    if mesh.edges is previous.edges:
+        shape_data = update_shape_data(shape_data, mesh)
+    else:
+        shape_data = compute_shape_data(shape, params, mesh)
+    return mesh, shape_data, calculator.calculate_properties(shape, params), segments
+
+
+def build_picker(scene, mesh):
+    # BVH de seleção da cena (com a instância e a face local de cada triângulo) ou da malha;
+    # pode rodar numa thread de trabalho
+    if scene is not None and len(scene):
+        vertices, triangles, owners, local = scene.world_triangles()
+        return BVH(vertices, triangles), (owners, local)
+    if scene is None and mesh is not None and len(mesh):
+        return BVH(mesh.vertices, mesh.triangles), None
+    return None, None
+
 
 class Geometry3D(QOpenGLWidget):
-    def __init__(self, shape: str, params: dict):
+    # Face escolhida com um clique na vista (nome da face, da instância ou do triângulo)
+    face_picked = pyqtSignal(str)
+
+    def __init__(self, shape: str, params: dict, calculator=GeometryCalculator, mesh=None, jobs=None):
         super().__init__()
-        self.shape = shape  # "parallelepiped" ou "pyramid"
+        self.shape = shape  # "parallelepiped", "pyramid", sólidos curvos ou "mesh" (malha importada)
         self.params = params
+        self.calculator = calculator
+        # Com um JobScheduler, malhas redimensionadas e a BVH de seleção são montadas em threads
+        # de trabalho; sem ele, tudo roda na hora
+        self.jobs = jobs
         self.last_mouse_x = 0
         self.last_mouse_y = 0
         self.x_rot = 0
         self.y_rot = 0
         self.zoom = -10.0
+        self.zoom_target = self.zoom
+        # Distância inicial da câmera; cenas e malhas importadas ajustam ao próprio tamanho
+        self.default_zoom = self.zoom
         self.x_offset = 0.0
         self.y_offset = 0.0
+        self.held_keys = set()
+        self.press_position = None
+        # Hierarquia de caixas para o clique, montada sob demanda, e quadros das faces escolhidas
+        # que não estão em shape_data (triângulos de malhas importadas e faces de instâncias)
+        self.picker = None
+        self.picker_key = None
+        self.picker_faces = None
+        self.picked_faces = {}
+        self.scheduler = FrameScheduler(self, self.animate)
         self.current_face = None
+        # Transição de câmera em andamento: (vista de partida, segundos decorridos)
+        self.transition = None
         self.show_labels = True
+        # Modo retido: arestas ficam em buffers na GPU; False volta ao glBegin/glEnd (só no pipeline fixo).
+        # Os buffers ficam no gerenciador de recursos e sobrevivem ao widget
+        self.retained_mode = True
+        self.label_batch = None
+        # Tempos por estágio; P mostra a sobreposição e GEOMETRY3D_FRAME_LOG grava um CSV
+        self.profiler = FrameProfiler.from_environment(log_stages=RENDER_STAGES)
+        self.overlay_batch = None
+        self.overlay_updated = 0.0
+        # Modo cena: várias formas desenhadas por instanciamento no lugar da forma única
+        self.scene = None
+        self.scene_renderer = InstancedSceneRenderer()
+        self.scene_center = [0.0, 0.0, 0.0]
+        self.far_plane = 50.0
+        # Pipeline programável, escolhido com o primeiro contexto; None mantém o pipeline fixo.
+        # frame_matrices guarda (projeção, vista, projeção @ vista) do quadro atual
+        self.shader_renderer = None
+        self.pipeline_ready = False
+        self.frame_matrices = None
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        # Segmentos por volta dos sólidos curvos; escolhidos pelo tamanho na tela a cada quadro
+        self.segments = None
+        self.set_shape(shape, params, mesh)
+
+    def set_shape(self, shape, params, mesh=None):
+        # Troca a forma mostrada reaproveitando o widget e o contexto GL; os buffers das malhas
+        # ficam no cache compartilhado, então voltar a uma forma já vista não reenvia nada
+        self.cancel_jobs()
+        self.shape = shape
+        self.params = params
+        # Parâmetros de abertura da forma: as malhas em cache são desses parâmetros e as
+        # mudanças de set_parameters só redimensionam os vértices
+        self.base_params = params
+        self.scene = None
+        self.segments = None
+        self.mesh = mesh if mesh is not None else build_mesh(self.shape, self.params)
         self.shape_data = self.compute_shape_data()
-        # Usa GeometryCalculator para calcular as propriedades
-        if self.shape == "pyramid":
-            self.geometric_properties = GeometryCalculator.calculate_pyramid_properties(self.params)
+        # Usa o calculador (GeometryCalculator ou uma versão com cache) para calcular as propriedades
+        if self.shape == "mesh":
+            # Malhas importadas não têm rótulos; as propriedades ficam na aba de informações
+            self.geometric_properties = {}
         else:
-            self.geometric_properties = GeometryCalculator.calculate_parallelepiped_properties(self.params)
-        glutInit()
+            self.geometric_properties = self.calculator.calculate_properties(self.shape, self.params)
+        self.reset_camera()
+        self.schedule_picking_bvh()
 
-    def compute_shape_data(self) -> dict:
-        if self.shape == "parallelepiped":
-            w, h, d = self.params["width"], self.params["height"], self.params["depth"]
-            vertices = [
-                [-w/2, -h/2, -d/2], [w/2, -h/2, -d/2],
-                [w/2, h/2, -d/2],   [-w/2, h/2, -d/2],
-                [-w/2, -h/2, d/2],  [w/2, -h/2, d/2],
-                [w/2, h/2, d/2],    [-w/2, h/2, d/2]
-            ]
-            edges = [
-                (0, 1), (1, 2), (2, 3), (3, 0),
-                (4, 5), (5, 6), (6, 7), (7, 4),
-                (0, 4), (1, 5), (2, 6), (3, 7)
-            ]
-            faces = {
-                "Frente": {"vertices": [4, 5, 6, 7], "normal": [0, 0, 1], "center": [0, 0, d/2]},
-                "Trás": {"vertices": [0, 1, 2, 3], "normal": [0, 0, -1], "center": [0, 0, -d/2]},
-                "Topo": {"vertices": [3, 2, 6, 7], "normal": [0, 1, 0], "center": [0, h/2, 0]},
-                "Base": {"vertices": [0, 1, 5, 4], "normal": [0, -1, 0], "center": [0, -h/2, 0]},
-                "Esquerda": {"vertices": [0, 3, 7, 4], "normal": [-1, 0, 0], "center": [-w/2, 0, 0]},
-                "Direita": {"vertices": [1, 2, 6, 5], "normal": [1, 0, 0], "center": [w/2, 0, 0]}
-            }
-            edge_info = {
-                "Largura (frente/trás)": {"edges": [(4, 5), (7, 6), (0, 1), (3, 2)], "length": w},
-                "Altura (frente/trás)": {"edges": [(4, 7), (5, 6), (0, 3), (1, 2)], "length": h},
-                "Profundidade": {"edges": [(0, 4), (1, 5), (2, 6), (3, 7)], "length": d}
-            }
-            return {"vertices": vertices, "edges": edges, "faces": faces, "edge_info": edge_info}
-        elif self.shape == "pyramid":
-            w, h, d = self.params["width"], self.params["height"], self.params["depth"]
-            vertices = [
-                [-w/2, 0, -d/2], [w/2, 0, -d/2],
-                [w/2, 0, d/2],   [-w/2, 0, d/2],
-                [0, h, 0]
-            ]
-            edges = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (1, 4), (2, 4), (3, 4)]
-            faces = {
-                "Base": {"vertices": [0, 1, 2, 3], "normal": [0, -1, 0], "center": [0, 0, 0]},
-                "Frente": {"vertices": [3, 2, 4], "normal": [0, d/2, h], "center": [0, h/3, d/4]},
-                "Trás": {"vertices": [0, 1, 4], "normal": [0, d/2, -h], "center": [0, h/3, -d/4]},
-                "Esquerda": {"vertices": [0, 3, 4], "normal": [-w/2, h, 0], "center": [-w/4, h/3, 0]},
-                "Direita": {"vertices": [1, 2, 4], "normal": [w/2, h, 0], "center": [w/4, h/3, 0]}
-            }
-            diag_front = math.sqrt(h**2 + (d/2)**2)
-            diag_side = math.sqrt(h**2 + (w/2)**2)
-            edge_info = {
-                "Base (largura)": {"edges": [(0, 1), (3, 2)], "length": w},
-                "Base (profundidade)": {"edges": [(1, 2), (0, 3)], "length": d},
-                "Aresta lateral (frente)": {"edges": [(2, 4), (3, 4)], "length": diag_front},
-                "Aresta lateral (trás)": {"edges": [(0, 4), (1, 4)], "length": diag_front},
-                "Aresta lateral (lados)": {"edges": [(0, 4), (1, 4), (2, 4), (3, 4)], "length": diag_side}
-            }
-            return {"vertices": vertices, "edges": edges, "faces": faces, "edge_info": edge_info}
+    def set_parameters(self, params):
+        # Muda as dimensões da forma atual (controles deslizantes) refazendo só o que depende das
+        # dimensões alteradas: vértices, propriedades e rótulos. A câmera fica onde está e o
+        # buffer da GPU recebe só os vértices novos.
+        changed = [name for name in SHAPE_DIMENSIONS.get(self.shape, ())
+                   if float(params[name]) != float(self.params[name])]
+        self.params = params
+        if not changed or self.scene is not None:
+            return
+        arguments = (self.shape, self.base_params, params, self.segments, self.mesh, self.shape_data, self.calculator)
+        if self.jobs is None:
+            self.apply_geometry(resized_geometry(*arguments))
         else:
-            return {}
+            # Só o pedido mais recente é aplicado: num arraste rápido os anteriores são descartados
+            self.jobs.submit((self, "geometry"), resized_geometry, *arguments, callback=self.apply_geometry)
+
+    def apply_geometry(self, result):
+        mesh, shape_data, self.geometric_properties, segments = result
+        if segments != self.segments:
+            # O nível de detalhe mudou enquanto o cálculo rodava: update_level_of_detail já refez a
+            # malha com as dimensões atuais, e a deste resultado voltaria ao nível antigo
+            self.scheduler.request_frame()
+            return
+        previous = self.mesh
+        self.mesh, self.shape_data = mesh, shape_data
+        if self.mesh.edges is previous.edges and self.isValid():
+            self.makeCurrent()
+            current_resources().resize_mesh_buffer(("edges", previous), ("edges", self.mesh), self.mesh.vertices)
+            self.doneCurrent()
+        self.scheduler.request_frame()
+
+    def cancel_jobs(self):
+        # Resultados pedidos para o conteúdo anterior não valem mais
+        if self.jobs is not None:
+            self.jobs.cancel((self, "geometry"))
+            self.jobs.cancel((self, "picking"))
+
+    def rebuild_mesh(self):
+        # Redimensiona a malha em cache dos parâmetros de abertura (no nível de detalhe atual):
+        # arrastar uma dimensão não enche o cache de malhas nem refaz a tesselação
+        base = build_mesh(self.shape, self.base_params, self.segments)
+        self.mesh = resize_mesh(self.shape, base, self.base_params, self.params, self.segments)
+
+    def compute_shape_data(self) -> dict:
+        return compute_shape_data(self.shape, self.params, self.mesh)
 
     def initializeGL(self):
+        self.context().aboutToBeDestroyed.connect(self.release_gl_resources)
+        self.ensure_pipeline()
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_CULL_FACE)
+        if self.shader_renderer is not None:
+            return
         glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
         glEnable(GL_COLOR_MATERIAL)
@@ -95,51 +209,265 @@ class Geometry3D(QOpenGLWidget):
         glLightfv(GL_LIGHT0, GL_POSITION, [5, 5, 5, 1])
         glLightfv(GL_LIGHT0, GL_DIFFUSE, [1, 1, 1, 1])
 
+    def ensure_pipeline(self):
+        # Shaders quando o contexto tem GLSL 3.30 (ou é core); senão o pipeline fixo como alternativa
+        if self.pipeline_ready:
+            return
+        self.pipeline_ready = True
+        renderer = ShaderRenderer()
+        self.shader_renderer = renderer if renderer.initialize() else None
+        core = self.shader_renderer is not None
+        if self.scene_renderer.core != core:
+            self.scene_renderer.release()
+            self.scene_renderer = InstancedSceneRenderer(core=core)
+
     def resizeGL(self, w: int, h: int):
+        self.ensure_pipeline()
         glViewport(0, 0, w, h)
+        if self.shader_renderer is not None:
+            return
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
-        gluPerspective(45, w/h if h != 0 else 1, 1, 50)
+        gluPerspective(45, w/h if h != 0 else 1, 1, self.far_plane)
         glMatrixMode(GL_MODELVIEW)
 
     def paintGL(self):
+        self.ensure_pipeline()
+        self.profiler.begin_frame()
+        self.render_frame()
+        if self.profiler.overlay_visible:
+            self.draw_profiler_overlay()
+        self.profiler.end_frame()
+        glFlush()
+        self.scheduler.frame_presented()
+
+    def render_frame(self):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glLoadIdentity()
-        if self.current_face and self.current_face in self.shape_data["faces"]:
-            face_data = self.shape_data["faces"][self.current_face]
-            normal = face_data["normal"]
-            center = face_data["center"]
-            camera_dist = 8.0
-            camera_pos = [
-                center[0] + normal[0] * camera_dist,
-                center[1] + normal[1] * camera_dist,
-                center[2] + normal[2] * camera_dist
-            ]
-            gluLookAt(
-                camera_pos[0], camera_pos[1], camera_pos[2],
-                center[0], center[1], center[2],
-                0, 1, 0
-            )
+        if self.shader_renderer is not None:
+            # As matrizes vão para os uniformes de cada desenho
+            self.shader_renderer.begin_frame()
+            projection, view = self.camera_matrices(*self.shader_renderer.viewport[2:])
+            self.frame_matrices = (projection, view, projection @ view)
+            glDisable(GL_CULL_FACE)
+            glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
         else:
-            glTranslatef(self.x_offset, self.y_offset, self.zoom)
-            glRotatef(self.x_rot, 1.0, 0.0, 0.0)
-            glRotatef(self.y_rot, 0.0, 1.0, 0.0)
+            self.apply_fixed_camera()
+        if self.scene is not None:
+            with self.profiler.stage("draw_scene"):
+                self.draw_scene()
+            return
+        with self.profiler.stage("level_of_detail"):
+            self.update_level_of_detail()
+        with self.profiler.stage("draw_shape"):
+            self.draw_shape()
+            # Se for pirâmide, cone ou tronco, desenha a linha da altura
+            if self.shape in ("pyramid", "cone", "frustum"):
+                self.draw_height_line()
+        if self.show_labels:
+            with self.profiler.stage("draw_labels"):
+                self.draw_labels()
+
+    def apply_fixed_camera(self):
+        # Mesma vista do pipeline de shaders (inclusive no meio de uma transição)
+        glLoadMatrixd(np.ascontiguousarray(self.current_view().T))
         glDisable(GL_CULL_FACE)
         glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
         glColor3f(1.0, 1.0, 1.0)
-        glLineWidth(2.0)
-        self.draw_shape()
-        # Se for pirâmide, desenha a linha da altura
-        if self.shape == "pyramid":
-            self.draw_height_line()
-        self.draw_labels()
-        glFlush()
+        glLineWidth(EDGE_WIDTH)
+
+    def draw_scene(self):
+        if self.shader_renderer is not None:
+            self.scene_renderer.draw(self.scene, self.frame_matrices[2])
+        else:
+            glLineWidth(1.0)
+            self.scene_renderer.draw(self.scene)
+
+    def release_gl_resources(self):
+        # Buffers de malhas, atlas e programas são compartilhados; só a cena é deste widget
+        self.makeCurrent()
+        self.label_batch = None
+        self.overlay_batch = None
+        self.scene_renderer.release()
+        if self.shader_renderer is not None:
+            self.shader_renderer.release()
+        # Um novo contexto escolhe o pipeline de novo
+        self.shader_renderer = None
+        self.pipeline_ready = False
+        self.profiler.release()
+        self.profiler.close()
+        self.doneCurrent()
+
+    def set_scene(self, scene):
+        # Mostra uma cena com várias formas; None volta à forma única
+        self.cancel_jobs()
+        self.scene = scene
+        self.reset_camera()
+        self.schedule_picking_bvh()
+
+    def reset_camera(self):
+        # Câmera inicial do conteúdo atual, sem transição; cenas e malhas importadas são enquadradas
+        self.current_face = None
+        self.picked_faces = {}
+        self.transition = None
+        self.x_rot = 0
+        self.y_rot = 0
+        if self.scene is not None and len(self.scene):
+            self.frame_bounds(*self.scene.bounds())
+        elif self.scene is None and self.shape == "mesh":
+            self.frame_bounds(self.mesh.vertices.min(axis=0), self.mesh.vertices.max(axis=0))
+        else:
+            self.scene_center = [0.0, 0.0, 0.0]
+            self.x_offset = 0.0
+            self.y_offset = 0.0
+            self.zoom = self.zoom_target = self.default_zoom = -10.0
+            self.far_plane = 50.0
+        if self.isValid():
+            self.makeCurrent()
+            self.resizeGL(self.width(), self.height())
+            self.doneCurrent()
+        self.scheduler.request_frame()
+
+    def frame_bounds(self, lower, upper):
+        # Enquadra a caixa: gira em torno do centro e afasta a câmera conforme o tamanho
+        self.scene_center = [float(c) for c in (lower + upper) / 2]
+        # Raio da esfera que envolve a caixa, para caber inteira em qualquer rotação
+        radius = float(max(math.dist(lower, upper) / 2, 1.0))
+        self.x_offset = 0.0
+        self.y_offset = 0.0
+        self.zoom = self.zoom_target = self.default_zoom = -radius * 2.5
+        self.far_plane = max(50.0, radius * 6.0)
+
+    def update_level_of_detail(self):
+        # Troca a tesselação dos sólidos curvos quando o tamanho na tela cruza um nível de detalhe.
+        # As malhas de cada nível ficam no cache, então voltar a um nível não refaz a tesselação.
+        if self.shape not in CURVED_SHAPES:
+            return
+        distance = camera.FACE_CAMERA_DISTANCE if self.current_face else -self.zoom
+        height = self.height() * self.devicePixelRatio()
+        radius = camera.projected_radius(bounding_radius(self.shape, self.params), distance, height)
+        segments = segments_for_radius(radius)
+        if segments != self.segments:
+            self.segments = segments
+            self.rebuild_mesh()
+            self.shape_data = self.compute_shape_data()
+
+    def face_frame(self, face_name):
+        if face_name is None:
+            return None
+        if face_name in self.picked_faces:
+            return self.picked_faces[face_name]
+        return self.shape_data.get("faces", {}).get(face_name)
+
+    def camera_matrices(self, width=None, height=None):
+        # Projeção (a mesma de resizeGL) e vista atual
+        width = max(width or self.width(), 1)
+        height = max(height or self.height(), 1)
+        projection = camera.perspective(camera.FOV_Y, width / height, camera.NEAR_PLANE, self.far_plane)
+        return projection, self.current_view()
+
+    def current_view(self):
+        # Durante uma transição, interpola da vista de partida até a vista do estado atual
+        if self.transition is None:
+            return self.target_view()
+        start, elapsed = self.transition
+        return camera.interpolate_view(start, self.target_view(), camera.ease_in_out(elapsed / TRANSITION_DURATION))
+
+    def target_view(self):
+        # Vista da face focada ou da órbita, com o centro da cena descontado
+        face_data = self.face_frame(self.current_face)
+        if face_data is not None:
+            center = np.subtract(face_data["center"], self.scene_center)
+            view = camera.face_view({"center": center, "normal": face_data["normal"]})
+        else:
+            view = camera.orbit_view(self.x_rot, self.y_rot, self.zoom, self.x_offset, self.y_offset)
+        return view @ camera.translate(*(-np.asarray(self.scene_center)))
+
+    def view_projection(self):
+        # Para transformar o clique em raio
+        projection, view = self.camera_matrices()
+        return projection @ view
+
+    def picking_key(self):
+        return (self.scene, self.scene.version) if self.scene is not None else self.mesh
+
+    def picking_bvh(self):
+        # Refeita só quando a malha (ou a cena) muda; se o clique vier antes da montagem em
+        # segundo plano terminar, monta aqui mesmo
+        key = self.picking_key()
+        if self.picker_key != key:
+            if self.jobs is not None:
+                self.jobs.cancel((self, "picking"))
+            self.set_picker(key, build_picker(self.scene, self.mesh))
+        return self.picker
+
+    def set_picker(self, key, result):
+        self.picker_key = key
+        self.picker, self.picker_faces = result
+
+    def schedule_picking_bvh(self):
+        # Adianta a BVH do conteúdo novo numa thread de trabalho (malhas importadas e cenas grandes)
+        if self.jobs is None:
+            return
+        key = self.picking_key()
+        self.jobs.submit((self, "picking"), build_picker, self.scene, self.mesh,
+                         callback=lambda result: self.set_picker(key, result))
+
+    def pick_face(self, x, y):
+        # Lança um raio pelo ponto do widget (y para baixo) e devolve o nome da face atingida
+        picker = self.picking_bvh()
+        if picker is None:
+            return None
+        origin, direction = camera.unproject_ray(x, self.height() - y, self.view_projection(),
+                                                 max(self.width(), 1), max(self.height(), 1))
+        hit = picker.intersect(origin, direction)
+        if hit is None:
+            return None
+        triangle = hit[0]
+        if self.scene is not None:
+            return self.pick_scene_face(triangle)
+        if self.mesh.face_names:
+            return self.mesh.face_names[self.mesh.triangle_faces[triangle]]
+        # Malha importada sem faces nomeadas: o próprio triângulo vira a face focada
+        corners = self.mesh.vertices[self.mesh.triangles[triangle]].astype(np.float64)
+        normal = np.cross(corners[1] - corners[0], corners[2] - corners[0])
+        # A câmera vai para o lado de onde veio o raio, qualquer que seja o sentido da malha
+        normal *= -np.sign(np.dot(normal, direction)) / np.linalg.norm(normal)
+        name = f"Triângulo {triangle}"
+        self.picked_faces = {name: {"center": corners.mean(axis=0).tolist(), "normal": normal.tolist()}}
+        return name
+
+    def pick_scene_face(self, triangle):
+        owners, local = self.picker_faces
+        instance = int(owners[triangle])
+        mesh = unit_mesh(SCENE_SHAPES[self.scene.kinds[instance]])
+        face = int(mesh.triangle_faces[local[triangle]])
+        matrix = self.scene.model_matrices([instance])[0].astype(np.float64)
+        center = matrix[:3, :3] @ mesh.face_centroids[face] + matrix[:3, 3]
+        # Normais transformadas pela inversa transposta (as dimensões escalam cada eixo)
+        normal = np.linalg.inv(matrix[:3, :3]).T @ mesh.face_normals[face]
+        name = f"Instância {instance}: {mesh.face_names[face]}"
+        self.picked_faces = {name: {"center": center.tolist(), "normal": (normal / np.linalg.norm(normal)).tolist()}}
+        return name
+
+    def buffer_key(self):
+        # As malhas ficam em cache por parâmetros: a mesma instância significa os mesmos vértices
+        return self.mesh
 
     def draw_shape(self):
-        if self.shape == "parallelepiped":
+        if self.shape == "mesh":
+            self.draw_surface()
+        if self.shader_renderer is not None and self.mesh is not None:
+            buffer = current_resources().mesh_buffer(("edges", self.buffer_key()), self.mesh.vertices, self.mesh.edges)
+            self.shader_renderer.draw_lines(buffer, self.frame_matrices[2], width=EDGE_WIDTH)
+        elif self.retained_mode and self.mesh is not None:
+            # Reenvia os vértices somente quando os parâmetros mudam (ou outro widget já enviou)
+            current_resources().mesh_buffer(("edges", self.buffer_key()), self.mesh.vertices, self.mesh.edges).draw()
+        elif self.shape == "parallelepiped":
             self.draw_parallelepiped()
         elif self.shape == "pyramid":
             self.draw_pyramid()
+        elif self.mesh is not None:
+            self.draw_mesh_edges()
 
     def draw_parallelepiped(self):
         vertices = self.shape_data.get("vertices", [])
@@ -159,10 +487,55 @@ class Geometry3D(QOpenGLWidget):
             glVertex3fv(vertices[edge[1]])
         glEnd()
 
+    def draw_surface(self):
+        if self.shader_renderer is not None:
+            buffer = current_resources().mesh_buffer(("surface", self.mesh), self.mesh.vertices,
+                                                     self.mesh.triangles, self.mesh.vertex_normals)
+            projection, view, mvp = self.frame_matrices
+            self.shader_renderer.draw_surface(buffer, mvp, view, SURFACE_COLOR)
+            return
+        glPushAttrib(GL_ENABLE_BIT | GL_POLYGON_BIT | GL_CURRENT_BIT)
+        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        glEnable(GL_LIGHTING)
+        glLightModeli(GL_LIGHT_MODEL_TWO_SIDE, GL_TRUE)
+        # Empurra a superfície para trás para as arestas não sumirem no teste de profundidade
+        glEnable(GL_POLYGON_OFFSET_FILL)
+        glPolygonOffset(1.0, 1.0)
+        glColor3f(*SURFACE_COLOR)
+        if self.retained_mode:
+            buffer = current_resources().mesh_buffer(("surface", self.mesh), self.mesh.vertices,
+                                                     self.mesh.triangles, self.mesh.vertex_normals)
+            buffer.draw(GL_TRIANGLES)
+        else:
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, self.mesh.vertices)
+            glNormalPointer(GL_FLOAT, 0, self.mesh.vertex_normals)
+            glDrawElements(GL_TRIANGLES, self.mesh.triangles.size, GL_UNSIGNED_INT, self.mesh.triangles)
+            glDisableClientState(GL_NORMAL_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+        glPopAttrib()
+        glColor3f(1.0, 1.0, 1.0)
+
+    def draw_mesh_edges(self):
+        # Malha importada em modo imediato: arrays de cliente, uma chamada só
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self.mesh.vertices)
+        glDrawElements(GL_LINES, self.mesh.edges.size, GL_UNSIGNED_INT, self.mesh.edges)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
     def draw_height_line(self):
         # Desenha uma linha tracejada (vermelha) do centro da base (0,0,0) até o vértice (0, height, 0)
+        if self.shader_renderer is not None:
+            # Anotação por cima do arame, como os rótulos: as linhas suavizadas cobrem os mesmos pixels
+            # e a geratriz da frente esconderia o eixo
+            glDisable(GL_DEPTH_TEST)
+            self.shader_renderer.draw_segments([(0, 0, 0), (0, self.params["height"], 0)], self.frame_matrices[2],
+                                               color=(1.0, 0.0, 0.0), width=EDGE_WIDTH, stipple=HEIGHT_LINE_STIPPLE)
+            glEnable(GL_DEPTH_TEST)
+            return
         glEnable(GL_LINE_STIPPLE)
-        glLineStipple(1, 0x00FF)
+        glLineStipple(1, HEIGHT_LINE_STIPPLE)
         glColor3f(1.0, 0.0, 0.0)
         glBegin(GL_LINES)
         glVertex3f(0, 0, 0)
@@ -170,63 +543,152 @@ class Geometry3D(QOpenGLWidget):
         glEnd()
         glDisable(GL_LINE_STIPPLE)
 
+    def build_labels(self):
+        return build_labels(self.shape_data, self.geometric_properties, self.format_value)
+
     def draw_labels(self):
-        vertices = self.shape_data.get("vertices", [])
-        faces = self.shape_data.get("faces", {})
-        edge_info = self.shape_data.get("edge_info", {})
-        face_areas = self.geometric_properties.get("face_areas", {})
-        glPushMatrix()
+        if self.label_batch is None:
+            atlas = glyph_atlas("Helvetica", (12, 10))
+            self.label_batch = LabelBatch(atlas, current_resources().atlas_texture(atlas))
+        key = self.buffer_key()
+        if self.label_batch.key != key:
+            self.label_batch.set_labels(self.build_labels(), key)
+        if self.shader_renderer is not None:
+            projection, view, _ = self.frame_matrices
+            self.shader_renderer.draw_labels(self.label_batch, view, projection)
+        else:
+            self.label_batch.draw()
+
+    def format_value(self, value):
+        return format_label_value(value)
+
+    def draw_profiler_overlay(self):
+        # Estatísticas dos últimos quadros no canto superior esquerdo e barras com o tempo de
+        # CPU de cada quadro no canto inferior (linha de referência em 60 Hz)
+        width, height = max(self.width(), 1), max(self.height(), 1)
+        if self.overlay_batch is None:
+            atlas = glyph_atlas("Helvetica", (12, 10))
+            self.overlay_batch = LabelBatch(atlas, current_resources().atlas_texture(atlas))
+        now = time.monotonic()
+        if now - self.overlay_updated >= OVERLAY_REFRESH or not len(self.overlay_batch.owners):
+            self.overlay_updated = now
+            # Âncoras em coordenadas normalizadas: as matrizes ficam identidade ao desenhar
+            labels = [((2 * 8 / width - 1, 1 - 2 * (18 + 15 * row) / height, 0), line, 12, (0.2, 1.0, 0.2))
+                      for row, line in enumerate(self.profiler.overlay_lines())]
+            self.overlay_batch.set_labels(labels)
+        bars, colors = self.overlay_bars(height)
+        budget = 8 + OVERLAY_BUDGET_MS * OVERLAY_PIXELS_PER_MS
+        if self.shader_renderer is not None:
+            glDisable(GL_DEPTH_TEST)
+            self.shader_renderer.draw_labels(self.overlay_batch, np.eye(4), np.eye(4))
+            if len(bars):
+                ortho = camera.orthographic(0, width, 0, height)
+                self.shader_renderer.draw_segments(bars.reshape(-1, 2), ortho, colors=colors)
+                self.shader_renderer.draw_segments([(8, budget), (8 + 2 * OVERLAY_FRAMES, budget)], ortho,
+                                                   color=(1.0, 1.0, 0.0))
+            glEnable(GL_DEPTH_TEST)
+            return
+        glPushAttrib(GL_ENABLE_BIT | GL_CURRENT_BIT | GL_LINE_BIT)
         glDisable(GL_LIGHTING)
-        for face_name, face_data in faces.items():
-            center = face_data["center"]
+        glDisable(GL_DEPTH_TEST)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        self.overlay_batch.draw()
+        if len(bars):
+            glMatrixMode(GL_PROJECTION)
+            glOrtho(0, width, 0, height, -1, 1)
+            glMatrixMode(GL_MODELVIEW)
+            glLineWidth(1.0)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(2, GL_FLOAT, 0, bars)
+            glColorPointer(3, GL_FLOAT, 0, colors)
+            glDrawArrays(GL_LINES, 0, 2 * len(bars))
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
             glColor3f(1.0, 1.0, 0.0)
-            area = self.format_value(face_areas.get(face_name, 0))
-            label = f"{face_name}: {area} u²"
-            glRasterPos3f(center[0], center[1], center[2])
-            for c in label:
-                glutBitmapCharacter(GLUT_BITMAP_HELVETICA_12, ord(c))
-        for edge_name, edge_data in edge_info.items():
-            edges = edge_data["edges"]
-            length = edge_data["length"]
-            if edges:
-                edge = edges[0]
-                v1 = vertices[edge[0]]
-                v2 = vertices[edge[1]]
-                mid_x = (v1[0] + v2[0]) / 2
-                mid_y = (v1[1] + v2[1]) / 2
-                mid_z = (v1[2] + v2[2]) / 2
-                glColor3f(0.0, 1.0, 1.0)
-                glRasterPos3f(mid_x, mid_y, mid_z)
-                length_text = f"{self.format_value(length)}"
-                for c in length_text:
-                    glutBitmapCharacter(GLUT_BITMAP_HELVETICA_10, ord(c))
-        glEnable(GL_LIGHTING)
+            glBegin(GL_LINES)
+            glVertex2f(8, budget)
+            glVertex2f(8 + 2 * OVERLAY_FRAMES, budget)
+            glEnd()
+        glMatrixMode(GL_PROJECTION)
         glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopMatrix()
+        glPopAttrib()
 
-    def format_value(self, value):
-        if value == int(value):
-            return str(int(value))
-        return f"{value:.2f}".rstrip('0').rstrip('.')
+    def overlay_bars(self, height):
+        # Uma barra vertical (em pixels da janela) por quadro recente e a cor por vértice
+        times = self.profiler.recent()[-OVERLAY_FRAMES:]
+        x = 8 + 2 * np.arange(len(times), dtype=np.float32)
+        bars = np.zeros((len(times), 2, 2), dtype=np.float32)
+        bars[:, :, 0] = x[:, None]
+        bars[:, 0, 1] = 8
+        bars[:, 1, 1] = 8 + np.minimum(times, height / 2 / OVERLAY_PIXELS_PER_MS) * OVERLAY_PIXELS_PER_MS
+        colors = np.where((times <= OVERLAY_BUDGET_MS)[:, None], (0.2, 0.9, 0.2), (0.9, 0.3, 0.2))
+        return bars, np.ascontiguousarray(np.repeat(colors, 2, axis=0), dtype=np.float32)
+
+    def start_transition(self):
+        # Parte da vista mostrada agora (mesmo no meio de outra transição); o estado muda logo em
+        # seguida e animate leva a câmera até ele
+        self.transition = (self.current_view(), 0.0)
+        self.scheduler.start_animation()
 
     def focus_on_face(self, face_name):
+        self.start_transition()
         self.current_face = face_name
-        self.update()
 
     def reset_view(self):
+        self.start_transition()
         self.current_face = None
         self.x_rot = 30
         self.y_rot = 30
-        self.zoom = -10.0
+        self.zoom = self.zoom_target = self.default_zoom
         self.x_offset = 0.0
         self.y_offset = 0.0
-        self.update()
+
+    def animate(self, dt):
+        # Chamado pelo FrameScheduler a cada quadro; devolve True enquanto houver movimento
+        for key in self.held_keys:
+            dx, dy = PAN_KEYS[key]
+            self.x_offset += dx * PAN_SPEED * dt
+            self.y_offset += dy * PAN_SPEED * dt
+        remaining = self.zoom_target - self.zoom
+        if abs(remaining) > 1e-3:
+            self.zoom += remaining * (1.0 - math.exp(-ZOOM_RATE * dt))
+        else:
+            self.zoom = self.zoom_target
+        if self.transition is not None:
+            # Progresso pelo tempo real: quadros descartados sob carga não deixam a transição mais lenta
+            start, elapsed = self.transition
+            elapsed += dt
+            self.transition = (start, elapsed) if elapsed < TRANSITION_DURATION else None
+        return bool(self.held_keys) or self.zoom != self.zoom_target or self.transition is not None
 
     def mousePressEvent(self, event):
         self.last_mouse_x = event.position().x()
         self.last_mouse_y = event.position().y()
-        self.update()
+        self.press_position = event.position()
+
+    def mouseReleaseEvent(self, event):
+        # Clique sem arrasto escolhe a face sob o cursor; arrastar continua girando a vista
+        if self.press_position is None:
+            return
+        moved = (event.position() - self.press_position).manhattanLength()
+        self.press_position = None
+        if event.button() != Qt.MouseButton.LeftButton or moved > CLICK_TOLERANCE:
+            return
+        face_name = self.pick_face(event.position().x(), event.position().y())
+        if face_name is not None:
+            self.face_picked.emit(face_name)
+            self.focus_on_face(face_name)
 
     def mouseMoveEvent(self, event):
+        # Eventos de alta frequência só acumulam a rotação; a pintura é agrupada por quadro
         if self.current_face is None:
             dx = event.position().x() - self.last_mouse_x
             dy = event.position().y() - self.last_mouse_y
@@ -234,24 +696,38 @@ class Geometry3D(QOpenGLWidget):
             self.y_rot += dx
             self.last_mouse_x = event.position().x()
             self.last_mouse_y = event.position().y()
-            self.update()
+            self.scheduler.request_frame()
 
     def wheelEvent(self, event):
         delta = event.angleDelta().y()
-        self.zoom += delta / 240.0
-        self.update()
+        self.zoom_target += delta / 240.0
+        self.scheduler.start_animation()
 
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key.Key_Escape:
+        key = event.key()
+        if key in PAN_KEYS:
+            # A auto-repetição é ignorada: o movimento contínuo vem do timer enquanto a tecla está pressionada
+            if not event.isAutoRepeat():
+                dx, dy = PAN_KEYS[key]
+                self.x_offset += dx * 0.1
+                self.y_offset += dy * 0.1
+                self.held_keys.add(key)
+                self.scheduler.start_animation()
+            return
+        if key == Qt.Key.Key_Escape:
             self.reset_view()
-        elif event.key() == Qt.Key.Key_Up:
-            self.y_offset -= 0.1
-        elif event.key() == Qt.Key.Key_Down:
-            self.y_offset += 0.1
-        elif event.key() == Qt.Key.Key_Left:
-            self.x_offset += 0.1
-        elif event.key() == Qt.Key.Key_Right:
-            self.x_offset -= 0.1
-        elif event.key() == Qt.Key.Key_L:
+        elif key == Qt.Key.Key_L:
             self.show_labels = not self.show_labels
-        self.update()
+        elif key == Qt.Key.Key_P:
+            self.profiler.overlay_visible = not self.profiler.overlay_visible
+            self.overlay_updated = 0.0
+        self.scheduler.request_frame()
+
+    def keyReleaseEvent(self, event):
+        if event.key() in PAN_KEYS and not event.isAutoRepeat():
+            self.held_keys.discard(event.key())
+
+    def focusOutEvent(self, event):
+        # Sem foco não recebemos o keyRelease: para o deslocamento
+        self.held_keys.clear()
+        super().focusOutEvent(event)
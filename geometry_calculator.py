@@ -1,6 +1,54 @@
 import math
+import numpy as np
+from geometry_results import (ParallelepipedProperties, PyramidProperties, PropertiesDictView, PropertiesTable,
+                              properties_dict)
+from mass_properties import mass_properties, mesh_mass_properties
+
+# Layout de um array estruturado de formas para as versões em lote
+SHAPE_DTYPE = np.dtype([("width", np.float64), ("height", np.float64), ("depth", np.float64)])
+
+# Nomes aceitos para cada forma (interface em português ou identificadores internos)
+SHAPE_ALIASES = {
+    "paralelepípedo": "parallelepiped",
+    "pirâmide": "pyramid",
+    "cilindro": "cylinder",
+    "cone": "cone",
+    "esfera": "sphere",
+    "tronco de cone": "frustum"
+}
+
+# Formas com cálculo vetorizado em lote
+BATCH_SHAPES = ("parallelepiped", "pyramid")
+
+def parallelepiped_fields(width, height, depth):
+    # Campos de ParallelepipedProperties, na ordem de __slots__; servem para floats e para arrays
+    front_back_area = width * height
+    top_bottom_area = width * depth
+    left_right_area = height * depth
+    total_area = 2 * (front_back_area + top_bottom_area + left_right_area)
+    return width * height * depth, total_area, front_back_area, top_bottom_area, left_right_area
+
+
+def pyramid_fields(width, height, depth):
+    # Campos de PyramidProperties, na ordem de __slots__; servem para floats e para arrays
+    base_area = width * depth
+    height_sq = height * height
+    # Geratrizes (apótemas) das faces da frente/trás e dos lados
+    generatriz_front_back = np.sqrt(height_sq + (depth / 2) ** 2)
+    generatriz_left_right = np.sqrt(height_sq + (width / 2) ** 2)
+    front_back_face_area = width * generatriz_front_back / 2
+    left_right_face_area = depth * generatriz_left_right / 2
+    total_area = base_area + 2 * front_back_face_area + 2 * left_right_face_area
+    return (base_area * height / 3, total_area, base_area, front_back_face_area, left_right_face_area, height,
+            generatriz_front_back, generatriz_left_right)
+
 
 class GeometryCalculator:
+    @staticmethod
+    def normalize_shape(name):
+        name = name.strip().lower()
+        return SHAPE_ALIASES.get(name, name)
+
     @staticmethod
     def format_value(value):
         if value == int(value):
@@ -11,68 +59,177 @@ class GeometryCalculator:
 
     @staticmethod
     def calculate_parallelepiped_properties(params):
-        width = params["width"]
+        # Dicionário antigo como adaptador do registro compacto (montado só quando acessado)
+        return PropertiesDictView(GeometryCalculator.calculate_parallelepiped_compact(params))
+
+    @staticmethod
+    def calculate_pyramid_properties(params):
+        return PropertiesDictView(GeometryCalculator.calculate_pyramid_compact(params))
+
+    @staticmethod
+    def calculate_cylinder_properties(params):
+        # Largura é o diâmetro (a profundidade não é usada)
+        radius = params["width"] / 2
         height = params["height"]
-        depth = params["depth"]
-        volume = width * height * depth
-        front_back_area = width * height
-        top_bottom_area = width * depth
-        left_right_area = height * depth
-        total_area = 2 * (front_back_area + top_bottom_area + left_right_area)
+        base_area = math.pi * radius**2
+        lateral_area = 2 * math.pi * radius * height
         face_areas = {
-            "Frente": front_back_area,
-            "Trás": front_back_area,
-            "Topo": top_bottom_area,
-            "Base": top_bottom_area,
-            "Esquerda": left_right_area,
-            "Direita": left_right_area
+            "Base": base_area,
+            "Topo": base_area,
+            "Lateral": lateral_area
         }
         faces = {
-            "Frente/Trás": front_back_area,
-            "Topo/Base": top_bottom_area,
-            "Esquerda/Direita": left_right_area
+            "Topo/Base": base_area,
+            "Lateral": lateral_area
         }
         return {
-            "volume": volume,
+            "volume": base_area * height,
             "faces": faces,
             "face_areas": face_areas,
-            "total_area": total_area
+            "total_area": 2 * base_area + lateral_area,
+            "height": height
         }
 
     @staticmethod
-    def calculate_pyramid_properties(params):
-        width = params["width"]
+    def calculate_cone_properties(params):
+        radius = params["width"] / 2
         height = params["height"]
-        depth = params["depth"]
-        base_area = width * depth
-        volume = (1/3) * base_area * height
-        base_face_area = base_area
-        half_width = width / 2
-        half_depth = depth / 2
-        # Calcula as geratrizes para os lados diferentes:
-        generatriz_front_back = math.sqrt(height**2 + half_depth**2)
-        generatriz_left_right = math.sqrt(height**2 + half_width**2)
-        front_back_face_area = (width * generatriz_front_back) / 2
-        left_right_face_area = (depth * generatriz_left_right) / 2
-        total_area = base_face_area + 2 * front_back_face_area + 2 * left_right_face_area
+        base_area = math.pi * radius**2
+        generatriz = math.sqrt(height**2 + radius**2)
+        lateral_area = math.pi * radius * generatriz
         face_areas = {
-            "Base": base_face_area,
-            "Frente": front_back_face_area,
-            "Trás": front_back_face_area,
-            "Esquerda": left_right_face_area,
-            "Direita": left_right_face_area
+            "Base": base_area,
+            "Lateral": lateral_area
         }
-        faces = {
-            "Base": base_face_area,
-            "Frente/Trás": front_back_face_area,
-            "Esquerda/Direita": left_right_face_area
+        return {
+            "volume": (1/3) * base_area * height,
+            "faces": dict(face_areas),
+            "face_areas": face_areas,
+            "total_area": base_area + lateral_area,
+            "height": height,
+            "geratriz": generatriz
+        }
+
+    @staticmethod
+    def calculate_frustum_properties(params):
+        # Tronco de cone: largura é o diâmetro da base e profundidade o diâmetro do topo
+        bottom_radius = params["width"] / 2
+        top_radius = params["depth"] / 2
+        height = params["height"]
+        base_area = math.pi * bottom_radius**2
+        top_area = math.pi * top_radius**2
+        generatriz = math.sqrt(height**2 + (bottom_radius - top_radius)**2)
+        lateral_area = math.pi * (bottom_radius + top_radius) * generatriz
+        volume = (math.pi * height / 3) * (bottom_radius**2 + bottom_radius * top_radius + top_radius**2)
+        face_areas = {
+            "Base": base_area,
+            "Topo": top_area,
+            "Lateral": lateral_area
         }
         return {
             "volume": volume,
-            "faces": faces,
+            "faces": dict(face_areas),
             "face_areas": face_areas,
-            "total_area": total_area,
+            "total_area": base_area + top_area + lateral_area,
             "height": height,
-            "geratriz_front_back": generatriz_front_back,
-            "geratriz_left_right": generatriz_left_right
-        }
\ No newline at end of file
+            "geratriz": generatriz
+        }
+
+    @staticmethod
+    def calculate_sphere_properties(params):
+        # Largura é o diâmetro (altura e profundidade não são usadas)
+        radius = params["width"] / 2
+        area = 4 * math.pi * radius**2
+        return {
+            "volume": (4/3) * math.pi * radius**3,
+            "faces": {"Superfície": area},
+            "face_areas": {"Superfície": area},
+            "total_area": area
+        }
+
+    @staticmethod
+    def calculate_properties(shape, params):
+        calculators = {
+            "parallelepiped": GeometryCalculator.calculate_parallelepiped_properties,
+            "pyramid": GeometryCalculator.calculate_pyramid_properties,
+            "cylinder": GeometryCalculator.calculate_cylinder_properties,
+            "cone": GeometryCalculator.calculate_cone_properties,
+            "frustum": GeometryCalculator.calculate_frustum_properties,
+            "sphere": GeometryCalculator.calculate_sphere_properties
+        }
+        shape = GeometryCalculator.normalize_shape(shape)
+        if shape not in calculators:
+            raise ValueError(f"Forma desconhecida: {shape}")
+        return calculators[shape](params)
+
+    @staticmethod
+    def calculate_parallelepiped_compact(params):
+        return ParallelepipedProperties(*parallelepiped_fields(params["width"], params["height"], params["depth"]))
+
+    @staticmethod
+    def calculate_pyramid_compact(params):
+        return PyramidProperties(*pyramid_fields(params["width"], params["height"], params["depth"]))
+
+    @staticmethod
+    def calculate_properties_table(shape, width, height=None, depth=None):
+        properties = GeometryCalculator.calculate_properties_batch(shape, width, height, depth)
+        record_type = PyramidProperties if shape == "pyramid" else ParallelepipedProperties
+        return PropertiesTable.from_batch(record_type, properties)
+
+    @staticmethod
+    def _batch_dimensions(width, height=None, depth=None):
+        # Aceita três arrays (largura, altura, profundidade) ou um único array estruturado
+        if height is None and depth is None:
+            shapes = np.asarray(width)
+            if shapes.dtype.names is None:
+                raise ValueError("Esperado array estruturado com campos width, height e depth")
+            width, height, depth = shapes["width"], shapes["height"], shapes["depth"]
+        elif height is None or depth is None:
+            # np.asarray(None) viraria NaN em silêncio nas áreas que dependem da dimensão ausente
+            raise ValueError("Informe altura e profundidade junto com a largura")
+        width = np.asarray(width, dtype=np.float64)
+        height = np.asarray(height, dtype=np.float64)
+        depth = np.asarray(depth, dtype=np.float64)
+        return np.broadcast_arrays(width, height, depth)
+
+    @staticmethod
+    def calculate_parallelepiped_properties_batch(width, height=None, depth=None):
+        width, height, depth = GeometryCalculator._batch_dimensions(width, height, depth)
+        # Faces opostas compartilham o mesmo array, sem cópias por forma
+        fields = parallelepiped_fields(width, height, depth)
+        return properties_dict(ParallelepipedProperties, dict(zip(ParallelepipedProperties.__slots__, fields)))
+
+    @staticmethod
+    def calculate_pyramid_properties_batch(width, height=None, depth=None):
+        width, height, depth = GeometryCalculator._batch_dimensions(width, height, depth)
+        fields = pyramid_fields(width, height, depth)
+        return properties_dict(PyramidProperties, dict(zip(PyramidProperties.__slots__, fields)))
+
+    @staticmethod
+    def calculate_properties_batch(shape, width, height=None, depth=None):
+        if shape == "parallelepiped":
+            return GeometryCalculator.calculate_parallelepiped_properties_batch(width, height, depth)
+        if shape == "pyramid":
+            return GeometryCalculator.calculate_pyramid_properties_batch(width, height, depth)
+        raise ValueError(f"Forma desconhecida: {shape}")
+
+    @staticmethod
+    def flatten_batch_properties(properties):
+        # Converte o resultado em lote em colunas planas (nome -> array), na ordem de saída
+        columns = {
+            "volume": properties["volume"],
+            "total_area": properties["total_area"]
+        }
+        for face_name, area in properties["face_areas"].items():
+            columns[f"area_{face_name}"] = area
+        for key in ("geratriz_front_back", "geratriz_left_right"):
+            if key in properties:
+                columns[key] = properties[key]
+        return columns
+
+    @staticmethod
+    def calculate_mesh_properties(mesh, density=1.0):
+        # Qualquer malha triangular fechada (objeto Mesh ou par (vértices, triângulos))
+        if isinstance(mesh, tuple):
+            return mass_properties(*mesh, density=density)
+        return mesh_mass_properties(mesh, density)
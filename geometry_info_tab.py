@@ -6,11 +6,15 @@ import math
 class GeometryInfoTab(QWidget):
     face_selected = pyqtSignal(str)
     
-    def __init__(self, shape: str, params: dict, calculator: GeometryCalculator):
+    def __init__(self, shape: str, params: dict, calculator: GeometryCalculator, mesh=None, jobs=None):
         super().__init__()
         self.shape = shape
         self.params = params
         self.calculator = calculator
+        self.mesh = mesh
+        # Com um JobScheduler, as propriedades são calculadas fora da thread da interface
+        self.jobs = jobs
+        self.face_mapping = {}
         self.init_ui()
         self.update_calculations()
     
@@ -43,12 +47,36 @@ class GeometryInfoTab(QWidget):
 
     
     def update_calculations(self):
+        if self.jobs is None:
+            self.show_properties(self.compute_properties(self.shape, self.params, self.mesh))
+        else:
+            # Um novo pedido descarta o anterior ainda não entregue; o resultado vale para o estado atual
+            self.jobs.submit((self, "properties"), self.compute_properties, self.shape, self.params, self.mesh,
+                             callback=self.show_properties, error_callback=self.show_error)
+
+    def compute_properties(self, shape, params, mesh):
+        # Roda numa thread de trabalho quando há agendador: só cálculo, sem tocar em widgets
+        if shape == "mesh":
+            try:
+                properties = self.calculator.calculate_mesh_properties(mesh)
+            except ValueError:
+                # Malha aberta (ou sem volume): a área e os triângulos continuam valendo, mas
+                # volume e centroide não existem
+                faces = mesh.face_areas() if mesh.triangle_faces is not None else {}
+                return {"volume": None, "centroid": None, "total_area": float(mesh.triangle_areas().sum()),
+                        "faces": faces}
+            return dict(properties, faces=properties.get("face_areas", {}))
+        if shape in ("parallelepiped", "pyramid", "cylinder", "cone", "frustum", "sphere"):
+            return self.calculator.calculate_properties(shape, params)
+        return None
+
+    def show_properties(self, properties):
+        if properties is None:
+            return
         if self.shape == "parallelepiped":
-            properties = self.calculator.calculate_parallelepiped_properties(self.params)
             self.height_label.setText("")  # Não exibe altura para paralelepípedo
             self.generatriz_label.setText("")  # Sem geratriz para paralelepípedo
         elif self.shape == "pyramid":
-            properties = self.calculator.calculate_pyramid_properties(self.params)
             height_val = self.params.get("height", 0)
             self.height_label.setText(f"<b>Altura:</b> {self.calculator.format_value(height_val)} unidades")
             geratriz_front = properties.get("geratriz_front_back", 0)
@@ -59,30 +87,47 @@ class GeometryInfoTab(QWidget):
             else:
                 self.generatriz_label.setText(f"<b>Geratriz Frente/Trás:</b> {self.calculator.format_value(geratriz_front)} unidades, "
                                             f"<b>Geratriz Lados:</b> {self.calculator.format_value(geratriz_side)} unidades")
+        elif self.shape in ("cylinder", "cone", "frustum", "sphere"):
+            if "height" in properties:
+                self.height_label.setText(f"<b>Altura:</b> {self.calculator.format_value(properties['height'])} unidades")
+            else:
+                self.height_label.setText(f"<b>Raio:</b> {self.calculator.format_value(self.params['width'] / 2)} unidades")
+            if "geratriz" in properties:
+                self.generatriz_label.setText(f"<b>Geratriz:</b> {self.calculator.format_value(properties['geratriz'])} unidades")
+            else:
+                self.generatriz_label.setText("")
+        elif self.shape == "mesh":
+            self.height_label.setText(f"<b>Triângulos:</b> {len(self.mesh)}")
+            if properties["centroid"] is None:
+                self.generatriz_label.setText("<b>Centroide:</b> indisponível")
+            else:
+                centroid = ", ".join(self.calculator.format_value(float(c)) for c in properties["centroid"])
+                self.generatriz_label.setText(f"<b>Centroide:</b> ({centroid})")
         else:
             return
 
-        volume = self.calculator.format_value(properties["volume"])
         total_area = self.calculator.format_value(properties["total_area"])
-        self.volume_label.setText(f"<b>Volume:</b> {volume} unidades³")
+        if properties["volume"] is None:
+            self.volume_label.setText("<b>Volume:</b> indisponível (malha aberta)")
+        else:
+            volume = self.calculator.format_value(properties["volume"])
+            self.volume_label.setText(f"<b>Volume:</b> {volume} unidades³")
         self.total_area_label.setText(f"<b>Área Total:</b> {total_area} unidades²")
         
         faces = properties["faces"]
+        if self.face_names() == list(faces):
+            # Mesmas faces (só as dimensões mudaram): atualiza apenas as áreas que mudaram
+            for i, face_area in enumerate(faces.values()):
+                text = self.calculator.format_value(face_area) + " unidades²"
+                if self.face_table.item(i, 1).text() != text:
+                    self.face_table.item(i, 1).setText(text)
+            return
         self.face_table.setRowCount(len(faces))
         # Mapeamento para seleção de face na visualização 3D
+        # (grupos de faces opostas como "Frente/Trás" focam a primeira delas)
         self.face_mapping = {}
-        if self.shape == "parallelepiped":
-            self.face_mapping = {
-                "Frente/Trás": ["Frente", "Trás"],
-                "Topo/Base": ["Topo", "Base"],
-                "Esquerda/Direita": ["Esquerda", "Direita"]
-            }
-        elif self.shape == "pyramid":
-            self.face_mapping = {
-                "Base": ["Base"],
-                "Frente/Trás": ["Frente", "Trás"],
-                "Esquerda/Direita": ["Esquerda", "Direita"]
-            }
+        if self.shape != "mesh":
+            self.face_mapping = {group: group.split("/") for group in faces}
         
         for i, (face_name, face_area) in enumerate(faces.items()):
             face_item = QTableWidgetItem(face_name)
@@ -91,10 +136,49 @@ class GeometryInfoTab(QWidget):
             self.face_table.setItem(i, 0, face_item)
             self.face_table.setItem(i, 1, area_item)
 
+    def show_error(self, exc):
+        # Sem propriedades válidas: nada da forma anterior pode continuar na tela nem ser clicado
+        self.clear_properties()
+        self.volume_label.setText(f"<b>Erro:</b> {exc}")
+
+    def clear_properties(self):
+        for label in (self.volume_label, self.height_label, self.generatriz_label, self.total_area_label):
+            label.setText("")
+        self.face_table.clearSelection()
+        self.face_table.setRowCount(0)
+        self.face_mapping = {}
+
+    def face_names(self):
+        return [self.face_table.item(row, 0).text() for row in range(self.face_table.rowCount())]
+
+    def set_parameters(self, params):
+        # Novas dimensões da mesma forma: os rótulos só são redesenhados se o texto mudar
+        # (QLabel.setText ignora texto igual) e a tabela atualiza só as células de área
+        self.params = params
+        self.update_calculations()
+
     
+    def set_shape(self, shape, params, mesh=None):
+        # Reaproveita a aba para outra forma (a janela 3D não é recriada a cada navegação)
+        self.shape = shape
+        self.params = params
+        self.mesh = mesh
+        # Um resultado lento não pode deixar na tela os dados da forma anterior
+        self.clear_properties()
+        self.update_calculations()
+
     def on_face_selected(self, row, column):
         face_name = self.face_table.item(row, 0).text()
         if face_name in self.face_mapping and self.face_mapping[face_name]:
             self.face_selected.emit(self.face_mapping[face_name][0])
         else:
             self.face_selected.emit(face_name)
+
+    def select_face(self, face_name):
+        # Destaca a linha da face escolhida por clique na vista 3D (sem reemitir face_selected)
+        for row in range(self.face_table.rowCount()):
+            group = self.face_table.item(row, 0).text()
+            if face_name == group or face_name in self.face_mapping.get(group, []):
+                self.face_table.selectRow(row)
+                return
+        self.face_table.clearSelection()
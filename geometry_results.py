@@ -0,0 +1,190 @@
+from collections.abc import Mapping
+from enum import IntEnum
+import numpy as np
+
+FACE_LABELS = ("Frente", "Trás", "Topo", "Base", "Esquerda", "Direita")
+
+
+class Face(IntEnum):
+    FRENTE = 0
+    TRAS = 1
+    TOPO = 2
+    BASE = 3
+    ESQUERDA = 4
+    DIREITA = 5
+
+    @property
+    def label(self):
+        return FACE_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        return cls(FACE_LABELS.index(label))
+
+
+class CompactProperties:
+    # Resultado compacto: só floats em __slots__, sem dicionários por forma.
+    # Subclasses definem os campos, o campo de área de cada face e os grupos exibidos em "faces".
+    __slots__ = ()
+    shape = None
+    FACE_FIELDS = {}
+    FACE_GROUPS = ()
+    EXTRA_FIELDS = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values, strict=True):
+            setattr(self, name, float(value))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @classmethod
+    def faces(cls):
+        return tuple(cls.FACE_FIELDS)
+
+    def face_area(self, face):
+        return getattr(self, self.FACE_FIELDS[Face(face)])
+
+    def as_dict(self):
+        return PropertiesDictView(self)
+
+
+class ParallelepipedProperties(CompactProperties):
+    __slots__ = ("volume", "total_area", "front_back_area", "top_bottom_area", "left_right_area")
+    shape = "parallelepiped"
+    FACE_FIELDS = {
+        Face.FRENTE: "front_back_area",
+        Face.TRAS: "front_back_area",
+        Face.TOPO: "top_bottom_area",
+        Face.BASE: "top_bottom_area",
+        Face.ESQUERDA: "left_right_area",
+        Face.DIREITA: "left_right_area"
+    }
+    FACE_GROUPS = (
+        ("Frente/Trás", "front_back_area"),
+        ("Topo/Base", "top_bottom_area"),
+        ("Esquerda/Direita", "left_right_area")
+    )
+
+
+class PyramidProperties(CompactProperties):
+    __slots__ = ("volume", "total_area", "base_area", "front_back_area", "left_right_area",
+                 "height", "geratriz_front_back", "geratriz_left_right")
+    shape = "pyramid"
+    FACE_FIELDS = {
+        Face.BASE: "base_area",
+        Face.FRENTE: "front_back_area",
+        Face.TRAS: "front_back_area",
+        Face.ESQUERDA: "left_right_area",
+        Face.DIREITA: "left_right_area"
+    }
+    FACE_GROUPS = (
+        ("Base", "base_area"),
+        ("Frente/Trás", "front_back_area"),
+        ("Esquerda/Direita", "left_right_area")
+    )
+    EXTRA_FIELDS = ("height", "geratriz_front_back", "geratriz_left_right")
+
+
+def properties_dict(record_type, fields):
+    # Dicionário no formato antigo a partir dos campos de um registro (floats ou arrays por campo);
+    # faces opostas apontam para o mesmo valor
+    result = {
+        "volume": fields["volume"],
+        "faces": {label: fields[field] for label, field in record_type.FACE_GROUPS},
+        "face_areas": {face.label: fields[field] for face, field in record_type.FACE_FIELDS.items()},
+        "total_area": fields["total_area"]
+    }
+    result.update((name, fields[name]) for name in record_type.EXTRA_FIELDS)
+    return result
+
+
+class PropertiesDictView(Mapping):
+    # Adaptador somente leitura com o formato antigo de dicionário, montado apenas quando acessado
+    __slots__ = ("_properties",)
+
+    def __init__(self, properties):
+        self._properties = properties
+
+    def _keys(self):
+        return ("volume", "faces", "face_areas", "total_area") + self._properties.EXTRA_FIELDS
+
+    def __getitem__(self, key):
+        properties = self._properties
+        if key == "faces":
+            return {label: getattr(properties, field) for label, field in properties.FACE_GROUPS}
+        if key == "face_areas":
+            return {face.label: getattr(properties, field) for face, field in properties.FACE_FIELDS.items()}
+        if key in self._keys():
+            return getattr(properties, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+
+class PropertiesTable:
+    # Conjunto de resultados de layout fixo: um array estruturado com uma coluna por campo
+    def __init__(self, record_type, records):
+        self.record_type = record_type
+        self.records = records
+
+    @classmethod
+    def dtype_for(cls, record_type):
+        return np.dtype([(name, np.float64) for name in record_type.__slots__])
+
+    @classmethod
+    def empty(cls, record_type, count):
+        return cls(record_type, np.zeros(count, dtype=cls.dtype_for(record_type)))
+
+    @classmethod
+    def from_batch(cls, record_type, properties):
+        # Converte o resultado de calculate_*_properties_batch sem passar por objetos por forma
+        faces = properties["face_areas"]
+        columns = {
+            "volume": properties["volume"],
+            "total_area": properties["total_area"]
+        }
+        for face, field in record_type.FACE_FIELDS.items():
+            columns[field] = faces[face.label]
+        for field in record_type.EXTRA_FIELDS:
+            columns[field] = properties[field]
+        table = cls.empty(record_type, np.size(properties["volume"]))
+        for name in record_type.__slots__:
+            table.records[name] = columns[name]
+        return table
+
+    @property
+    def shape(self):
+        return self.record_type.shape
+
+    @property
+    def nbytes(self):
+        return self.records.nbytes
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PropertiesTable(self.record_type, self.records[index])
+        return self.record_type(*self.records[index].tolist())
+
+    def __iter__(self):
+        for row in self.records.tolist():
+            yield self.record_type(*row)
+
+    def column(self, name):
+        return self.records[name]
+
+    def face_area(self, face):
+        return self.records[self.record_type.FACE_FIELDS[Face(face)]]
@@ -0,0 +1,97 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+
+class LineBuffer:
+    # Arestas em modo retido: vértices e índices enviados uma vez para a GPU e desenhados
+    # com uma única chamada glDrawElements por quadro. Precisa de um contexto GL atual.
+    # use_vao=False serve para buffers compartilhados entre contextos (VAOs não são).
+    def __init__(self, use_vao=True):
+        self.use_vao = use_vao
+        self.vao = None
+        self.vbo = None
+        self.ebo = None
+        self.index_count = 0
+        self.key = None
+        self.has_normals = False
+
+    def is_current(self, key):
+        return self.vbo is not None and self.key == key
+
+    @staticmethod
+    def _vertex_data(vertices, normals):
+        vertex_data = np.ascontiguousarray(vertices, dtype=np.float32)
+        if normals is not None:
+            vertex_data = np.hstack([vertex_data.reshape(-1, 3), np.asarray(normals, dtype=np.float32)])
+        return vertex_data
+
+    def upload(self, vertices, edges, key=None, normals=None):
+        # Arrays float32/int32 contíguos (como os da Mesh) são enviados sem cópia; com normais,
+        # posição e normal ficam intercaladas no mesmo buffer
+        vertex_data = self._vertex_data(vertices, normals)
+        index_data = np.ascontiguousarray(edges, dtype=np.int32).reshape(-1)
+        if self.vbo is not None and self.has_normals != (normals is not None):
+            # O layout mudou: refaz os buffers e o VAO
+            self.release()
+        self.has_normals = normals is not None
+        if self.vbo is None:
+            self.vbo, self.ebo = glGenBuffers(2)
+            if self.use_vao and bool(glGenVertexArrays):
+                self.vao = glGenVertexArrays(1)
+                glBindVertexArray(self.vao)
+                self._bind_attributes()
+                glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, index_data.nbytes, index_data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self.index_count = index_data.size
+        self.key = key
+
+    def update_vertices(self, vertices, key=None, normals=None):
+        # Reenvia só as posições (e normais) com glBufferSubData; índices, layout e número de
+        # vértices continuam os mesmos (malha redimensionada)
+        vertex_data = self._vertex_data(vertices, normals)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, vertex_data.nbytes, vertex_data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.key = key
+
+    def _bind_attributes(self):
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        if self.has_normals:
+            glVertexPointer(3, GL_FLOAT, 24, None)
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glNormalPointer(GL_FLOAT, 24, ctypes.c_void_p(12))
+        else:
+            glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+
+    def draw(self, mode=GL_LINES):
+        if not self.index_count:
+            return
+        if self.vao is not None:
+            glBindVertexArray(self.vao)
+            glDrawElements(mode, self.index_count, GL_UNSIGNED_INT, None)
+            glBindVertexArray(0)
+        else:
+            self._bind_attributes()
+            glDrawElements(mode, self.index_count, GL_UNSIGNED_INT, None)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glDisableClientState(GL_NORMAL_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def release(self):
+        if self.vao is not None:
+            glDeleteVertexArrays(1, [self.vao])
+        if self.vbo is not None:
+            glDeleteBuffers(2, [self.vbo, self.ebo])
+        self.vao = self.vbo = self.ebo = None
+        self.index_count = 0
+        self.key = None
+        self.has_normals = False
@@ -0,0 +1,22 @@
+from PyQt6.QtCore import QCoreApplication, Qt
+from PyQt6.QtGui import QSurfaceFormat
+
+# Configuração dos contextos feita antes da QApplication. Fica fora do gl_resources para não
+# carregar o PyOpenGL na abertura do formulário.
+
+# Variável de ambiente que pede contextos OpenGL 3.3 core (sem o pipeline fixo)
+CORE_PROFILE_ENV = "GEOMETRY3D_CORE_PROFILE"
+
+
+def enable_context_sharing():
+    # Todos os QOpenGLWidget passam a compartilhar objetos com o contexto global,
+    # que vive até o fim do processo
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+
+
+def use_core_profile(major=3, minor=3):
+    # Contextos sem o pipeline fixo (só o renderizador de shaders)
+    surface_format = QSurfaceFormat.defaultFormat()
+    surface_format.setVersion(major, minor)
+    surface_format.setProfile(QSurfaceFormat.OpenGLContextProfile.CoreProfile)
+    QSurfaceFormat.setDefaultFormat(surface_format)
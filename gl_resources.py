@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from functools import lru_cache
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+from PyQt6 import sip
+from PyQt6.QtGui import QOffscreenSurface, QOpenGLContext
+from gl_buffers import LineBuffer
+from glyph_atlas import GlyphAtlas
+
+# Limite de memória de vértices e índices mantidos na GPU entre widgets (LRU)
+BUFFER_BUDGET_BYTES = 512 * 1024 * 1024
+
+# Contextos de grupo, indexados pelo endereço do QOpenGLContextGroup (None: contexto fora do Qt)
+_groups = {}
+
+
+@lru_cache(maxsize=8)
+def glyph_atlas(family="Helvetica", sizes=(12, 10)):
+    # Rasterização dos glifos feita uma vez por processo
+    return GlyphAtlas(family, sizes)
+
+
+class GLResources:
+    # Buffers, texturas de atlas e programas de um grupo de contextos que compartilham objetos.
+    # Com AA_ShareOpenGLContexts há um grupo só, e fechar ou reabrir janelas reaproveita tudo.
+    # Os métodos precisam de um contexto do grupo atual.
+    def __init__(self, buffer_budget=BUFFER_BUDGET_BYTES):
+        self.buffer_budget = buffer_budget
+        self.buffer_bytes = 0
+        self.buffers = OrderedDict()  # chave -> (LineBuffer, bytes)
+        self.textures = {}  # atlas -> textura
+        self.programs = {}  # (vertex, fragment) -> programa
+
+    def mesh_buffer(self, key, vertices, indices, normals=None):
+        # Buffer de vértices e índices de uma malha; a chave é a própria malha (em cache por
+        # parâmetros) junto do tipo de primitiva, então widgets diferentes dividem o mesmo buffer
+        entry = self.buffers.get(key)
+        if entry is not None:
+            self.buffers.move_to_end(key)
+            return entry[0]
+        # Sem VAO: VAOs não são compartilhados entre contextos, os buffers sim
+        buffer = LineBuffer(use_vao=False)
+        buffer.upload(vertices, indices, key, normals)
+        size = vertices.nbytes + indices.nbytes + (normals.nbytes if normals is not None else 0)
+        self.buffers[key] = (buffer, size)
+        self.buffer_bytes += size
+        while self.buffer_bytes > self.buffer_budget and len(self.buffers) > 1:
+            _, (evicted, evicted_size) = self.buffers.popitem(last=False)
+            evicted.release()
+            self.buffer_bytes -= evicted_size
+        return buffer
+
+    def resize_mesh_buffer(self, key, new_key, vertices, normals=None):
+        # Passa o buffer de `key` para `new_key` (mesmos índices, vértices novos) reenviando só os
+        # vértices; sem buffer em `key`, o próximo mesh_buffer de `new_key` cria um do zero
+        if key not in self.buffers or new_key in self.buffers:
+            return None
+        entry = self.buffers.pop(key)
+        buffer = entry[0]
+        buffer.update_vertices(vertices, new_key, normals)
+        self.buffers[new_key] = entry
+        return buffer
+
+    def atlas_texture(self, atlas):
+        texture = self.textures.get(atlas)
+        if texture is None:
+            pixels = atlas.pixels()
+            height, width = pixels.shape[:2]
+            texture = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, texture)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            self.textures[atlas] = texture
+        return texture
+
+    def program(self, vertex_source, fragment_source, geometry_source=None):
+        key = (vertex_source, fragment_source, geometry_source)
+        program = self.programs.get(key)
+        if program is None:
+            stages = [
+                shaders.compileShader(vertex_source, GL_VERTEX_SHADER),
+                shaders.compileShader(fragment_source, GL_FRAGMENT_SHADER)
+            ]
+            if geometry_source is not None:
+                stages.append(shaders.compileShader(geometry_source, GL_GEOMETRY_SHADER))
+            # Sem validação: em perfil core ela falha enquanto nenhum VAO estiver ligado
+            program = shaders.compileProgram(*stages, validate=False)
+            self.programs[key] = program
+        return program
+
+    def stats(self) -> dict:
+        return {
+            "buffers": len(self.buffers),
+            "buffer_bytes": self.buffer_bytes,
+            "textures": len(self.textures),
+            "programs": len(self.programs)
+        }
+
+    def release(self):
+        for buffer, _ in self.buffers.values():
+            buffer.release()
+        if self.textures:
+            glDeleteTextures(list(self.textures.values()))
+        for program in self.programs.values():
+            glDeleteProgram(program)
+        self.buffers.clear()
+        self.textures.clear()
+        self.programs.clear()
+        self.buffer_bytes = 0
+
+
+def current_resources():
+    # Recursos do grupo de compartilhamento do contexto atual
+    context = QOpenGLContext.currentContext()
+    group = context.shareGroup() if context is not None else None
+    key = sip.unwrapinstance(group) if group is not None else None
+    resources = _groups.get(key)
+    if resources is None:
+        resources = _groups[key] = GLResources()
+        if group is not None:
+            # Os objetos GL somem com o grupo: basta esquecer o cache
+            group.destroyed.connect(lambda *_: _groups.pop(key, None))
+    return resources
+
+
+def release_shared_resources():
+    # Libera os recursos do contexto global ao sair (ligado a QApplication.aboutToQuit)
+    context = QOpenGLContext.globalShareContext()
+    if context is None:
+        return
+    resources = _groups.pop(sip.unwrapinstance(context.shareGroup()), None)
+    if resources is None:
+        return
+    surface = QOffscreenSurface()
+    surface.setFormat(context.format())
+    surface.create()
+    if context.makeCurrent(surface):
+        resources.release()
+        context.doneCurrent()
+    surface.destroy()
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+import numpy as np
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter
+
+# ASCII imprimível + Latin-1 (acentos do português, ², ³)
+ATLAS_CHARACTERS = "".join(chr(c) for c in range(32, 127)) + "".join(chr(c) for c in range(160, 256))
+ATLAS_WIDTH = 512
+LAYOUT_CACHE_SIZE = 512
+
+
+class GlyphAtlas:
+    # Rasteriza os glifos uma única vez (em vários tamanhos) numa imagem RGBA, enviada depois como textura
+    def __init__(self, family="Helvetica", sizes=(12, 10), characters=ATLAS_CHARACTERS):
+        self.family = family
+        self.sizes = tuple(sizes)
+        self.glyphs = {}  # (tamanho, caractere) -> (u0, v0, u1, v1, largura, avanço)
+        self.metrics = {}  # tamanho -> (ascendente, descendente)
+        self._layouts = OrderedDict()
+        self.image = self._rasterize(characters)
+
+    def _rasterize(self, characters):
+        fonts = {}
+        cells = []
+        for size in self.sizes:
+            font = QFont(self.family)
+            font.setPixelSize(size)
+            metrics = QFontMetrics(font)
+            fonts[size] = font
+            self.metrics[size] = (metrics.ascent(), metrics.descent())
+            for char in characters:
+                advance = metrics.horizontalAdvance(char)
+                # Margem de 1 px para o filtro linear não misturar glifos vizinhos
+                cells.append((size, char, advance + 2, metrics.height() + 2, advance))
+        positions = []
+        x = y = row_height = 0
+        for size, char, width, height, advance in cells:
+            if x + width > ATLAS_WIDTH:
+                x, y = 0, y + row_height
+                row_height = 0
+            positions.append((x, y))
+            x += width
+            row_height = max(row_height, height)
+        atlas_height = 1
+        while atlas_height < y + row_height:
+            atlas_height *= 2
+        image = QImage(ATLAS_WIDTH, atlas_height, QImage.Format.Format_RGBA8888)
+        image.fill(QColor(255, 255, 255, 0))
+        painter = QPainter(image)
+        painter.setPen(QColor(255, 255, 255, 255))
+        for (size, char, width, height, advance), (x, y) in zip(cells, positions):
+            painter.setFont(fonts[size])
+            painter.drawText(x + 1, y + 1 + self.metrics[size][0], char)
+            self.glyphs[(size, char)] = (
+                x / ATLAS_WIDTH, y / atlas_height,
+                (x + width) / ATLAS_WIDTH, (y + height) / atlas_height,
+                width, advance
+            )
+        painter.end()
+        return image
+
+    def layout(self, text, size):
+        # Quads de um texto em pixels relativos à origem (linha de base à esquerda), em cache
+        key = (text, size)
+        cached = self._layouts.get(key)
+        if cached is not None:
+            self._layouts.move_to_end(key)
+            return cached
+        ascent, descent = self.metrics[size]
+        fallback = self.glyphs[(size, "?")]
+        offsets, uvs = [], []
+        pen = 0
+        for char in text:
+            u0, v0, u1, v1, width, advance = self.glyphs.get((size, char), fallback)
+            x0, x1 = pen - 1, pen - 1 + width
+            y0, y1 = -descent - 1, ascent + 1
+            offsets += [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+            # A imagem tem a origem no topo; a janela GL, na base
+            uvs += [(u0, v1), (u1, v1), (u1, v0), (u0, v0)]
+            pen += advance
+        cached = (np.array(offsets, dtype=np.float32).reshape(-1, 2),
+                  np.array(uvs, dtype=np.float32).reshape(-1, 2))
+        self._layouts[key] = cached
+        if len(self._layouts) > LAYOUT_CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return cached
+
+    def pixels(self):
+        # Imagem do atlas como array (altura, largura, 4) RGBA8
+        image = self.image
+        data = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), dtype=np.uint8)
+        return data.reshape(image.height(), image.width(), 4)
@@ -0,0 +1,152 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from scene import SCENE_SHAPES, unit_mesh
+from gl_resources import current_resources
+
+VERTEX_SHADER = """
+#version 120
+attribute vec3 a_position;
+attribute vec4 a_model0;
+attribute vec4 a_model1;
+attribute vec4 a_model2;
+attribute vec4 a_model3;
+attribute vec3 a_color;
+varying vec3 v_color;
+void main() {
+    mat4 model = mat4(a_model0, a_model1, a_model2, a_model3);
+    v_color = a_color;
+    gl_Position = gl_ModelViewProjectionMatrix * model * vec4(a_position, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 120
+varying vec3 v_color;
+void main() {
+    gl_FragColor = vec4(v_color, 1.0);
+}
+"""
+
+# Mesmo desenho para contextos sem o pipeline fixo: a câmera vem de um uniforme
+CORE_VERTEX_SHADER = """
+#version 330 core
+in vec3 a_position;
+in vec4 a_model0;
+in vec4 a_model1;
+in vec4 a_model2;
+in vec4 a_model3;
+in vec3 a_color;
+uniform mat4 u_view_projection;
+out vec3 v_color;
+void main() {
+    mat4 model = mat4(a_model0, a_model1, a_model2, a_model3);
+    v_color = a_color;
+    gl_Position = u_view_projection * model * vec4(a_position, 1.0);
+}
+"""
+
+CORE_FRAGMENT_SHADER = """
+#version 330 core
+in vec3 v_color;
+out vec4 frag_color;
+void main() {
+    frag_color = vec4(v_color, 1.0);
+}
+"""
+
+# Por instância: matriz modelo (16 floats, coluna a coluna) + cor (3 floats)
+INSTANCE_FLOATS = 19
+
+
+class InstancedSceneRenderer:
+    # Desenha todas as instâncias de cada forma com um único glDrawElementsInstanced,
+    # a partir de uma malha unitária compartilhada. Usa as matrizes fixas atuais como câmera,
+    # ou, com core=True, a matriz de vista e projeção passada ao draw.
+    def __init__(self, core=False):
+        self.core = core
+        self.program = None
+        self.view_projection_location = -1
+        self.batches = {}  # forma -> [vao, vbo, ebo, instance_vbo, índices, instâncias]
+        self.version = None
+        self.scene = None
+
+    def initialize(self):
+        # O programa fica no cache do grupo de contextos; VAOs e buffers da cena são deste widget
+        if self.core:
+            self.program = current_resources().program(CORE_VERTEX_SHADER, CORE_FRAGMENT_SHADER)
+            self.view_projection_location = glGetUniformLocation(self.program, "u_view_projection")
+        else:
+            self.program = current_resources().program(VERTEX_SHADER, FRAGMENT_SHADER)
+        position = glGetAttribLocation(self.program, "a_position")
+        model = [glGetAttribLocation(self.program, f"a_model{i}") for i in range(4)]
+        color = glGetAttribLocation(self.program, "a_color")
+        stride = INSTANCE_FLOATS * 4
+        for shape in SCENE_SHAPES:
+            mesh = unit_mesh(shape)
+            vertices, edges = mesh.vertices, mesh.edges.reshape(-1)
+            vao = glGenVertexArrays(1)
+            vbo, ebo, instance_vbo = glGenBuffers(3)
+            glBindVertexArray(vao)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+            glEnableVertexAttribArray(position)
+            glVertexAttribPointer(position, 3, GL_FLOAT, GL_FALSE, 0, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, edges.nbytes, edges, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, instance_vbo)
+            for i, location in enumerate(model):
+                glEnableVertexAttribArray(location)
+                glVertexAttribPointer(location, 4, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(16 * i))
+                glVertexAttribDivisor(location, 1)
+            glEnableVertexAttribArray(color)
+            glVertexAttribPointer(color, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(64))
+            glVertexAttribDivisor(color, 1)
+            glBindVertexArray(0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self.batches[shape] = [vao, vbo, ebo, instance_vbo, edges.size, 0]
+
+    def instance_data(self, scene, shape):
+        indices = scene.indices(shape)
+        data = np.empty((len(indices), INSTANCE_FLOATS), dtype=np.float32)
+        # GLSL monta mat4 por colunas: transpõe para enviar coluna a coluna
+        data[:, :16] = scene.model_matrices(indices).transpose(0, 2, 1).reshape(-1, 16)
+        data[:, 16:] = scene.colors[indices]
+        return data
+
+    def upload(self, scene):
+        for shape, batch in self.batches.items():
+            data = self.instance_data(scene, shape)
+            glBindBuffer(GL_ARRAY_BUFFER, batch[3])
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data if len(data) else None, GL_DYNAMIC_DRAW)
+            batch[5] = len(data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.scene = scene
+        self.version = scene.version
+
+    def draw(self, scene, view_projection=None):
+        if self.program is None:
+            self.initialize()
+        if scene is not self.scene or scene.version != self.version:
+            self.upload(scene)
+        glUseProgram(self.program)
+        if self.core:
+            # Matriz por linhas (camera.py): transposta pelo próprio GL
+            glUniformMatrix4fv(self.view_projection_location, 1, GL_TRUE,
+                               np.ascontiguousarray(view_projection, dtype=np.float32))
+        for vao, vbo, ebo, instance_vbo, index_count, instance_count in self.batches.values():
+            if instance_count:
+                glBindVertexArray(vao)
+                glDrawElementsInstanced(GL_LINES, index_count, GL_UNSIGNED_INT, None, instance_count)
+        glBindVertexArray(0)
+        glUseProgram(0)
+
+    def release(self):
+        for vao, vbo, ebo, instance_vbo, index_count, instance_count in self.batches.values():
+            glDeleteVertexArrays(1, [vao])
+            glDeleteBuffers(3, [vbo, ebo, instance_vbo])
+        self.batches = {}
+        # O programa é compartilhado: só esquece a referência
+        self.program = None
+        self.scene = None
+        self.version = None
@@ -0,0 +1,22 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+
+class LazyTab(QWidget):
+    # Guarda o lugar de uma aba e só importa e constrói o conteúdo quando ela aparece pela
+    # primeira vez (factory() devolve o widget)
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_built(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.layout().addWidget(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
@@ -1,42 +1,150 @@
+import time
+
+# Início da medição do tempo de abertura, antes de qualquer import pesado
+STARTUP_START = time.perf_counter()
+
+import os
 import sys
-from PyQt6.QtWidgets import QApplication, QMainWindow, QTabWidget
+import traceback
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QApplication, QMainWindow, QTabWidget, QFileDialog, QMessageBox
+from background_jobs import JobScheduler
 from config_form_tab import ConfigFormTab
-from dimension_calculator_tab import DimensionCalculatorTab
-from view3d import View3D
 from geometry_calculator import GeometryCalculator
+from gl_context import CORE_PROFILE_ENV, enable_context_sharing, use_core_profile
+from lazy_tab import LazyTab
+
+# OpenGL, a janela 3D, a calculadora de dimensões (com a prévia em GL) e os leitores de cenas e
+# malhas são importados só no primeiro uso: o formulário aparece sem carregar o PyOpenGL.
+
+# Tempo máximo (ms) até o formulário aparecer; acima disso o tempo é informado no stderr
+STARTUP_BUDGET_MS = 500
+STARTUP_BUDGET_ENV = "GEOMETRY3D_STARTUP_BUDGET_MS"
+
+class NavigationController:
+    # Mantém o formulário e uma única janela 3D vivos durante toda a execução: abrir outra forma
+    # só troca os parâmetros da janela existente, então a ida e volta é imediata e a memória
+    # (widgets, contexto GL, buffers) não cresce a cada navegação
+    def __init__(self, form):
+        self.form = form
+        self.view = None
+        self.calculator = GeometryCalculator()
+        # Um agendador para a sessão: leitura de arquivos, propriedades, malhas e BVH em segundo plano
+        self.jobs = JobScheduler()
+
+    def open_view(self, shape, params, scene=None, mesh=None):
+        if self.view is None:
+            from view3d import View3D
+            self.view = View3D(shape, params, self.calculator, scene, mesh, self.jobs)
+            self.view.back_requested.connect(self.show_form)
+        elif scene is not None:
+            self.view.set_scene(scene)
+        else:
+            self.view.set_shape(shape, params, mesh)
+        self.form.hide()
+        self.view.show()
+        self.view.raise_()
+        return self.view
+
+    def show_form(self):
+        if self.view is not None:
+            self.view.hide()
+        self.form.show()
+        self.form.raise_()
+
 
 class MainApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, navigator=None):
         super().__init__()
+        self.navigator = navigator or NavigationController(self)
         self.setWindowTitle("Configuração da Forma")
         self.setGeometry(100, 100, 400, 300)
         tabs = QTabWidget()
         self.config_tab = ConfigFormTab()
         tabs.addTab(self.config_tab, "Parâmetros da Forma")
-        self.calc_tab = DimensionCalculatorTab()
+        self.calc_tab = LazyTab(self.build_calc_tab)
         tabs.addTab(self.calc_tab, "Calculadora de Dimensões")
         self.setCentralWidget(tabs)
         self.config_tab.confirm_button.clicked.connect(self.open_3d_view)
+        self.config_tab.scene_button.clicked.connect(self.open_scene_view)
+        self.config_tab.mesh_button.clicked.connect(self.open_mesh_view)
+
+    def build_calc_tab(self):
+        from dimension_calculator_tab import DimensionCalculatorTab
+        return DimensionCalculatorTab()
 
     def open_3d_view(self):
-        shape_mapping = {
-            "paralelepípedo": "parallelepiped",
-            "pirâmide": "pyramid"
-        }
-        selected = self.config_tab.shape_selector.currentText().strip().lower()
-        shape = shape_mapping.get(selected, selected)
+        shape = GeometryCalculator.normalize_shape(self.config_tab.shape_selector.currentText())
         params = {
             "width": float(self.config_tab.input_width.text().replace(',', '.')),
             "height": float(self.config_tab.input_height.text().replace(',', '.')),
             "depth": float(self.config_tab.input_depth.text().replace(',', '.'))
         }
-        calculator = GeometryCalculator()
-        self.view3d = View3D(shape, params, calculator)
-        self.view3d.show()
-        self.close()
+        self.navigator.open_view(shape, params)
+
+    def open_scene_view(self):
+        from scene import load_scene
+        path, _ = QFileDialog.getOpenFileName(self, "Abrir cena", "", "Cenas (*.csv *.jsonl *.ndjson)")
+        if not path:
+            return
+        shape = GeometryCalculator.normalize_shape(self.config_tab.shape_selector.currentText())
+        self.load_in_background(load_scene, path, (OSError, ValueError, KeyError), "Não foi possível abrir a cena",
+                                lambda scene: self.navigator.open_view(shape, {"width": 1, "height": 1, "depth": 1},
+                                                                       scene=scene))
+
+    def open_mesh_view(self):
+        from mesh_io import load_mesh
+        path, _ = QFileDialog.getOpenFileName(self, "Importar malha", "", "Malhas (*.stl *.obj)")
+        if not path:
+            return
+        self.load_in_background(load_mesh, path, (OSError, ValueError), "Não foi possível importar a malha",
+                                lambda mesh: self.navigator.open_view("mesh", {}, mesh=mesh))
+
+    def load_in_background(self, loader, path, errors, message, on_loaded):
+        # Lê o arquivo numa thread de trabalho (malhas e cenas grandes não travam o formulário);
+        # abrir outro arquivo antes do fim descarta a leitura anterior
+        def loaded(result):
+            self.unsetCursor()
+            on_loaded(result)
+
+        def failed(exc):
+            self.unsetCursor()
+            if isinstance(exc, errors):
+                QMessageBox.warning(self, "Erro", f"{message}: {exc}")
+                return
+            # Erro inesperado do leitor: o rastro vai para o terminal e a janela continua aberta
+            # (exceção escapando de um callback do Qt derruba o processo)
+            traceback.print_exception(exc, file=sys.stderr)
+            QMessageBox.warning(self, "Erro", f"{message}: erro inesperado ({type(exc).__name__})")
+
+        self.setCursor(Qt.CursorShape.BusyCursor)
+        self.navigator.jobs.submit("load", loader, path, callback=loaded, error_callback=failed)
+
+def release_gl_resources():
+    # Só há o que liberar se alguma janela chegou a carregar o OpenGL
+    gl_resources = sys.modules.get("gl_resources")
+    if gl_resources is not None:
+        gl_resources.release_shared_resources()
+
+
+def report_startup():
+    # Chamado na primeira volta do laço de eventos, com o formulário já na tela
+    elapsed = (time.perf_counter() - STARTUP_START) * 1000
+    budget = float(os.environ.get(STARTUP_BUDGET_ENV) or STARTUP_BUDGET_MS)
+    if elapsed > budget:
+        print(f"Abertura levou {elapsed:.0f} ms (limite {budget:.0f} ms)", file=sys.stderr)
+    return elapsed
+
 
 if __name__ == "__main__":
+    # Contextos compartilhados: a prévia e as janelas 3D reaproveitam buffers, atlas e programas
+    enable_context_sharing()
+    if os.environ.get(CORE_PROFILE_ENV):
+        # Só o renderizador de shaders funciona nesse perfil
+        use_core_profile()
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(release_gl_resources)
     window = MainApp()
     window.show()
+    QTimer.singleShot(0, report_startup)
     sys.exit(app.exec())
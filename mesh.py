@@ -0,0 +1,463 @@
+import math
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+
+MESH_CACHE_SIZE = 256
+
+# Sólidos curvos: a malha depende também do número de segmentos por volta
+CURVED_SHAPES = ("cylinder", "cone", "sphere", "frustum")
+# Níveis de detalhe em segmentos por volta; o zoom só troca de malha ao cruzar um nível,
+# e cada nível fica no cache, então girar ou aproximar não refaz a tesselação
+LOD_SEGMENTS = (12, 24, 48, 96, 192)
+DEFAULT_SEGMENTS = 48
+# Distância máxima entre o círculo e o polígono inscrito, em pixels
+LOD_TOLERANCE = 0.5
+# Linhas desenhadas no contorno dos sólidos curvos (meridianos e paralelos)
+MERIDIAN_LINES = 12
+PARALLEL_LINES = 6
+DIMENSIONS = ("width", "height", "depth")
+# Dimensões de que cada forma depende; mudar as outras não altera malha nem propriedades
+SHAPE_DIMENSIONS = {
+    "parallelepiped": ("width", "height", "depth"),
+    "pyramid": ("width", "height", "depth"),
+    "cylinder": ("width", "height"),
+    "cone": ("width", "height"),
+    "sphere": ("width",),
+    "frustum": ("width", "height", "depth")
+}
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+def _frozen_groups(edge_groups):
+    # Grupos de arestas somente leitura (mapas imutáveis e tuplas), como os arrays: a malha fica
+    # no cache e é lida por vários widgets e threads de trabalho
+    return MappingProxyType({
+        name: MappingProxyType(dict(group, edges=tuple(tuple(edge) for edge in group["edges"])))
+        for name, group in (edge_groups or {}).items()
+    })
+
+
+class Mesh:
+    # Malha compartilhada pelos widgets, renderizadores e cálculos: vértices float32 contíguos
+    # (prontos para glBufferData), índices int32 de arestas e triângulos e, por face nomeada,
+    # polígono, normal unitária e centroide. Os arrays são somente leitura porque a malha
+    # pode estar no cache e ser compartilhada.
+    __slots__ = ("vertices", "edges", "triangles", "triangle_faces", "face_names", "face_polygons",
+                 "face_normals", "face_centroids", "edge_groups", "_triangle_normals", "_triangle_centroids", "_vertex_normals")
+
+    def __init__(self, vertices, triangles, edges=None, triangle_faces=None, face_names=(),
+                 face_polygons=(), edge_groups=None):
+        self.vertices = _readonly(np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3))
+        self.triangles = _readonly(np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1, 3))
+        self.edges = _readonly(np.ascontiguousarray(np.zeros((0, 2)) if edges is None else edges,
+                                                    dtype=np.int32).reshape(-1, 2))
+        self.triangle_faces = None
+        if triangle_faces is not None:
+            self.triangle_faces = _readonly(np.ascontiguousarray(triangle_faces, dtype=np.int32))
+        self.face_names = tuple(face_names)
+        self.face_polygons = tuple(tuple(int(i) for i in polygon) for polygon in face_polygons)
+        self.edge_groups = _frozen_groups(edge_groups)
+        self._triangle_normals = None
+        self._triangle_centroids = None
+        self._vertex_normals = None
+        self.face_normals, self.face_centroids = self._face_frames()
+
+    def __len__(self):
+        return len(self.triangles)
+
+    def with_vertices(self, vertices, edge_groups=None):
+        # Mesma topologia com outras posições: índices, faces e polígonos são compartilhados e só
+        # as normais e centroides das faces são recalculados
+        mesh = Mesh.__new__(Mesh)
+        mesh.vertices = _readonly(np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3))
+        mesh.triangles = self.triangles
+        mesh.edges = self.edges
+        mesh.triangle_faces = self.triangle_faces
+        mesh.face_names = self.face_names
+        mesh.face_polygons = self.face_polygons
+        mesh.edge_groups = self.edge_groups if edge_groups is None else _frozen_groups(edge_groups)
+        mesh._triangle_normals = None
+        mesh._triangle_centroids = None
+        mesh._vertex_normals = None
+        mesh.face_normals, mesh.face_centroids = mesh._face_frames()
+        return mesh
+
+    def _triangle_vectors(self):
+        corners = self.vertices.astype(np.float64)[self.triangles]
+        return corners, np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+    def _face_frames(self):
+        count = len(self.face_names)
+        if not count or self.triangle_faces is None:
+            return _readonly(np.zeros((0, 3))), _readonly(np.zeros((0, 3)))
+        corners, cross = self._triangle_vectors()
+        areas = np.linalg.norm(cross, axis=1) / 2
+        normals = self._face_sums(cross)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        # Superfícies fechadas em volta do eixo (lateral do cilindro, esfera) somam normal nula:
+        # usa a direção da frente para o foco da câmera
+        degenerate = lengths[:, 0] <= 1e-9 * np.bincount(self.triangle_faces, weights=2 * areas, minlength=count)
+        normals[degenerate] = (0.0, 0.0, 1.0)
+        lengths[degenerate] = 1.0
+        normals /= lengths
+        weighted = self._face_sums(corners.mean(axis=1) * areas[:, None])
+        face_area = np.bincount(self.triangle_faces, weights=areas, minlength=count)
+        return _readonly(normals), _readonly(weighted / face_area[:, None])
+
+    def _face_sums(self, values):
+        # Soma por face de um vetor por triângulo (bincount é bem mais rápido que np.add.at)
+        count = len(self.face_names)
+        return np.column_stack([np.bincount(self.triangle_faces, weights=values[:, axis], minlength=count)
+                                for axis in range(3)])
+
+    @property
+    def triangle_normals(self):
+        if self._triangle_normals is None:
+            _, cross = self._triangle_vectors()
+            lengths = np.linalg.norm(cross, axis=1, keepdims=True)
+            normals = cross / np.where(lengths == 0, 1, lengths)
+            self._triangle_normals = _readonly(normals.astype(np.float32))
+        return self._triangle_normals
+
+    @property
+    def triangle_centroids(self):
+        if self._triangle_centroids is None:
+            centroids = self.vertices[self.triangles].mean(axis=1, dtype=np.float64)
+            self._triangle_centroids = _readonly(centroids.astype(np.float32))
+        return self._triangle_centroids
+
+    @property
+    def vertex_normals(self):
+        # Média das normais dos triângulos vizinhos ponderada pela área (sombreamento suave)
+        if self._vertex_normals is None:
+            _, cross = self._triangle_vectors()
+            indices = self.triangles.ravel()
+            normals = np.column_stack([
+                np.bincount(indices, weights=np.repeat(cross[:, axis], 3), minlength=len(self.vertices))
+                for axis in range(3)
+            ])
+            lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+            normals /= np.where(lengths == 0, 1, lengths)
+            self._vertex_normals = _readonly(normals.astype(np.float32))
+        return self._vertex_normals
+
+    def triangle_areas(self):
+        _, cross = self._triangle_vectors()
+        return np.linalg.norm(cross, axis=1) / 2
+
+    def face_areas(self) -> dict:
+        areas = np.bincount(self.triangle_faces, weights=self.triangle_areas(), minlength=len(self.face_names))
+        return dict(zip(self.face_names, areas.tolist()))
+
+    def face_index(self, name):
+        return self.face_names.index(name)
+
+
+def _polygon_mesh(vertices, faces, edges, edge_groups):
+    # Triangula cada face em leque e orienta os triângulos para fora (formas convexas)
+    vertices = np.asarray(vertices, dtype=np.float64)
+    inside = vertices.mean(axis=0)
+    triangles, triangle_faces, names, polygons = [], [], [], []
+    for face_index, (name, polygon) in enumerate(faces):
+        polygon = list(polygon)
+        points = vertices[polygon]
+        normal = np.cross(points[1] - points[0], points[2] - points[0])
+        if np.dot(normal, points.mean(axis=0) - inside) < 0:
+            polygon = polygon[::-1]
+        for i in range(1, len(polygon) - 1):
+            triangles.append((polygon[0], polygon[i], polygon[i + 1]))
+            triangle_faces.append(face_index)
+        names.append(name)
+        polygons.append(polygon)
+    return Mesh(vertices, triangles, edges, triangle_faces, names, polygons, edge_groups)
+
+
+def parallelepiped_mesh(width, height, depth):
+    w, h, d = width, height, depth
+    vertices = [
+        [-w/2, -h/2, -d/2], [w/2, -h/2, -d/2],
+        [w/2, h/2, -d/2],   [-w/2, h/2, -d/2],
+        [-w/2, -h/2, d/2],  [w/2, -h/2, d/2],
+        [w/2, h/2, d/2],    [-w/2, h/2, d/2]
+    ]
+    edges = [
+        (0, 1), (1, 2), (2, 3), (3, 0),
+        (4, 5), (5, 6), (6, 7), (7, 4),
+        (0, 4), (1, 5), (2, 6), (3, 7)
+    ]
+    faces = [
+        ("Frente", [4, 5, 6, 7]),
+        ("Trás", [0, 1, 2, 3]),
+        ("Topo", [3, 2, 6, 7]),
+        ("Base", [0, 1, 5, 4]),
+        ("Esquerda", [0, 3, 7, 4]),
+        ("Direita", [1, 2, 6, 5])
+    ]
+    edge_groups = {
+        "Largura (frente/trás)": {"edges": [(4, 5), (7, 6), (0, 1), (3, 2)], "length": w},
+        "Altura (frente/trás)": {"edges": [(4, 7), (5, 6), (0, 3), (1, 2)], "length": h},
+        "Profundidade": {"edges": [(0, 4), (1, 5), (2, 6), (3, 7)], "length": d}
+    }
+    return _polygon_mesh(vertices, faces, edges, edge_groups)
+
+
+def pyramid_mesh(width, height, depth):
+    w, h, d = width, height, depth
+    vertices = [
+        [-w/2, 0, -d/2], [w/2, 0, -d/2],
+        [w/2, 0, d/2],   [-w/2, 0, d/2],
+        [0, h, 0]
+    ]
+    edges = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (1, 4), (2, 4), (3, 4)]
+    faces = [
+        ("Base", [0, 1, 2, 3]),
+        ("Frente", [3, 2, 4]),
+        ("Trás", [0, 1, 4]),
+        ("Esquerda", [0, 3, 4]),
+        ("Direita", [1, 2, 4])
+    ]
+    diag_front = math.sqrt(h**2 + (d/2)**2)
+    diag_side = math.sqrt(h**2 + (w/2)**2)
+    edge_groups = {
+        "Base (largura)": {"edges": [(0, 1), (3, 2)], "length": w},
+        "Base (profundidade)": {"edges": [(1, 2), (0, 3)], "length": d},
+        "Aresta lateral (frente)": {"edges": [(2, 4), (3, 4)], "length": diag_front},
+        "Aresta lateral (trás)": {"edges": [(0, 4), (1, 4)], "length": diag_front},
+        "Aresta lateral (lados)": {"edges": [(0, 4), (1, 4), (2, 4), (3, 4)], "length": diag_side}
+    }
+    return _polygon_mesh(vertices, faces, edges, edge_groups)
+
+
+def _ring(radius, y, segments):
+    angles = np.linspace(0, 2 * math.pi, segments, endpoint=False)
+    return np.column_stack([radius * np.cos(angles), np.full(segments, y), radius * np.sin(angles)])
+
+
+def _ring_edges(start, segments):
+    indices = np.arange(segments)
+    return np.column_stack([start + indices, start + (indices + 1) % segments])
+
+
+def _fan(center, start, segments):
+    indices = np.arange(segments)
+    return np.column_stack([np.full(segments, center), start + indices, start + (indices + 1) % segments])
+
+
+def _strip(lower, upper, segments):
+    # Faixa de quadriláteros entre dois anéis, dois triângulos por segmento
+    indices = np.arange(segments)
+    following = (indices + 1) % segments
+    return np.vstack([
+        np.column_stack([lower + indices, lower + following, upper + following]),
+        np.column_stack([lower + indices, upper + following, upper + indices])
+    ])
+
+
+def _convex_mesh(vertices, face_triangles, edges, edge_groups, face_polygons):
+    # Junta os triângulos de cada face nomeada e orienta todos para fora a partir do centro
+    # da caixa envolvente (vale para qualquer sólido convexo)
+    vertices = np.asarray(vertices, dtype=np.float64)
+    names = list(face_triangles)
+    triangles = np.vstack([face_triangles[name] for name in names])
+    triangle_faces = np.repeat(np.arange(len(names)), [len(face_triangles[name]) for name in names])
+    inside = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    corners = vertices[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    inward = np.einsum("ij,ij->i", normals, corners.mean(axis=1) - inside) < 0
+    triangles[inward] = triangles[inward][:, ::-1]
+    polygons = [face_polygons.get(name, ()) for name in names]
+    return Mesh(vertices, triangles, np.vstack(edges), triangle_faces, names, polygons, edge_groups)
+
+
+def _revolved_mesh(bottom_radius, top_radius, y0, y1, segments, lateral_length):
+    # Tronco de cone entre y0 e y1; raio do topo zero vira cone e raios iguais, cilindro.
+    # Vértices: anel da base, anel do topo (ou ápice), centro da base e centro do topo
+    n = segments
+    step = max(1, n // MERIDIAN_LINES)
+    meridians = np.arange(0, n, step)
+    if top_radius > 0:
+        vertices = np.vstack([_ring(bottom_radius, y0, n), _ring(top_radius, y1, n), [[0, y0, 0], [0, y1, 0]]])
+        bottom_center, top_center = 2 * n, 2 * n + 1
+        faces = {
+            "Base": _fan(bottom_center, 0, n),
+            "Topo": _fan(top_center, n, n),
+            "Lateral": _strip(0, n, n)
+        }
+        polygons = {"Base": range(n), "Topo": range(n, 2 * n)}
+        edges = [_ring_edges(0, n), _ring_edges(n, n), np.column_stack([meridians, n + meridians])]
+        edge_groups = {"Raio (base)": {"edges": [(bottom_center, 0)], "length": bottom_radius}}
+        if top_radius == bottom_radius:
+            edge_groups["Altura"] = {"edges": [(0, n)], "length": lateral_length}
+        else:
+            edge_groups["Raio (topo)"] = {"edges": [(top_center, n)], "length": top_radius}
+            edge_groups["Geratriz"] = {"edges": [(0, n)], "length": lateral_length}
+    else:
+        vertices = np.vstack([_ring(bottom_radius, y0, n), [[0, y1, 0], [0, y0, 0]]])
+        apex, bottom_center = n, n + 1
+        faces = {
+            "Base": _fan(bottom_center, 0, n),
+            "Lateral": _fan(apex, 0, n)
+        }
+        polygons = {"Base": range(n)}
+        edges = [_ring_edges(0, n), np.column_stack([meridians, np.full(len(meridians), apex)])]
+        edge_groups = {
+            "Raio (base)": {"edges": [(bottom_center, 0)], "length": bottom_radius},
+            "Geratriz": {"edges": [(0, apex)], "length": lateral_length}
+        }
+    return _convex_mesh(vertices, faces, edges, edge_groups, polygons)
+
+
+def cylinder_mesh(width, height, depth, segments=DEFAULT_SEGMENTS):
+    # Largura é o diâmetro; centrado na origem como o paralelepípedo
+    return _revolved_mesh(width / 2, width / 2, -height / 2, height / 2, segments, height)
+
+
+def cone_mesh(width, height, depth, segments=DEFAULT_SEGMENTS):
+    # Base em y = 0 e ápice em (0, altura, 0), como a pirâmide
+    return _revolved_mesh(width / 2, 0.0, 0.0, height, segments, math.hypot(width / 2, height))
+
+
+def frustum_mesh(width, height, depth, segments=DEFAULT_SEGMENTS):
+    # Tronco de cone: largura é o diâmetro da base e profundidade o diâmetro do topo
+    return _revolved_mesh(width / 2, depth / 2, 0.0, height, segments, math.hypot((width - depth) / 2, height))
+
+
+def sphere_mesh(width, height, depth, segments=DEFAULT_SEGMENTS):
+    # Esfera UV de diâmetro igual à largura: polo norte, anéis de latitude, polo sul e centro
+    r, n = width / 2, segments
+    stacks = max(2, n // 2)
+    polar = np.linspace(0, math.pi, stacks + 1)[1:-1]
+    rings = [_ring(r * math.sin(angle), r * math.cos(angle), n) for angle in polar]
+    vertices = np.vstack([[[0, r, 0]]] + rings + [[[0, -r, 0], [0, 0, 0]]])
+    north, south, center = 0, len(vertices) - 2, len(vertices) - 1
+    last = 1 + (stacks - 2) * n
+    faces = {
+        "Superfície": np.vstack([_fan(north, 1, n)] + [_strip(1 + i * n, 1 + (i + 1) * n, n)
+                                                       for i in range(stacks - 2)] + [_fan(south, last, n)])
+    }
+    # Meridianos de polo a polo e paralelos espaçados por igual
+    meridians = np.arange(0, n, max(1, n // MERIDIAN_LINES))
+    path = np.vstack([np.full(len(meridians), north)] + [1 + i * n + meridians for i in range(stacks - 1)]
+                     + [np.full(len(meridians), south)])
+    edges = [np.column_stack([path[:-1].ravel(), path[1:].ravel()])]
+    edges += [_ring_edges(1 + i * n, n) for i in range(max(1, stacks // PARALLEL_LINES) - 1, stacks - 1,
+                                                       max(1, stacks // PARALLEL_LINES))]
+    edge_groups = {"Raio": {"edges": [(center, 1 + (stacks // 2 - 1) * n)], "length": r}}
+    return _convex_mesh(vertices, faces, edges, edge_groups, {})
+
+
+MESH_BUILDERS = {
+    "parallelepiped": parallelepiped_mesh,
+    "pyramid": pyramid_mesh,
+    "cylinder": cylinder_mesh,
+    "cone": cone_mesh,
+    "sphere": sphere_mesh,
+    "frustum": frustum_mesh
+}
+
+
+def segments_for_radius(radius_pixels, tolerance=LOD_TOLERANCE):
+    # Menor nível em que a flecha r·(1 − cos(π/n)) do polígono fica abaixo da tolerância
+    for segments in LOD_SEGMENTS:
+        if radius_pixels * (1 - math.cos(math.pi / segments)) <= tolerance:
+            return segments
+    return LOD_SEGMENTS[-1]
+
+
+def bounding_radius(shape, params):
+    # Maior raio de curvatura do sólido, usado para escolher o nível de detalhe
+    if shape == "frustum":
+        return max(params["width"], params["depth"]) / 2
+    return params["width"] / 2
+
+
+@lru_cache(maxsize=MESH_CACHE_SIZE)
+def _cached_mesh(shape, width, height, depth, segments):
+    if segments:
+        return MESH_BUILDERS[shape](width, height, depth, segments)
+    return MESH_BUILDERS[shape](width, height, depth)
+
+
+def build_mesh(shape: str, params: dict, segments=None):
+    # Uma malha por conjunto de parâmetros (e nível de detalhe, nos sólidos curvos): chamadas
+    # repetidas devolvem a mesma instância e o LRU descarta as menos usadas
+    if shape not in MESH_BUILDERS:
+        return None
+    if shape in CURVED_SHAPES:
+        segments = int(segments or DEFAULT_SEGMENTS)
+    else:
+        segments = 0
+    return _cached_mesh(shape, float(params["width"]), float(params["height"]), float(params["depth"]), segments)
+
+
+def edge_lengths(shape, width, height, depth) -> dict:
+    # Comprimento de cada grupo de arestas rotulado; quais arestas formam o grupo só depende da topologia
+    if shape == "parallelepiped":
+        return {"Largura (frente/trás)": width, "Altura (frente/trás)": height, "Profundidade": depth}
+    if shape == "pyramid":
+        diag_front = math.sqrt(height**2 + (depth/2)**2)
+        return {
+            "Base (largura)": width,
+            "Base (profundidade)": depth,
+            "Aresta lateral (frente)": diag_front,
+            "Aresta lateral (trás)": diag_front,
+            "Aresta lateral (lados)": math.sqrt(height**2 + (width/2)**2)
+        }
+    if shape == "sphere":
+        return {"Raio": width / 2}
+    bottom = width / 2
+    top = {"cylinder": bottom, "cone": 0.0, "frustum": depth / 2}[shape]
+    return {"Raio (base)": bottom, "Raio (topo)": top, "Altura": height, "Geratriz": math.hypot(bottom - top, height)}
+
+
+def _coordinate_dimensions(shape, vertex_count):
+    # Índice em DIMENSIONS da dimensão a que cada coordenada dos vértices é proporcional: todos os
+    # construtores geram vértices lineares nas dimensões, sem termo constante
+    if shape in ("parallelepiped", "pyramid"):
+        axes = (0, 1, 2)
+    elif shape == "sphere":
+        axes = (0, 0, 0)
+    else:
+        axes = (0, 1, 0)
+    dimensions = np.tile(np.array(axes, dtype=np.intp), (vertex_count, 1))
+    if shape == "frustum":
+        # Anel do topo (segundo anel) segue o diâmetro do topo
+        segments = (vertex_count - 2) // 2
+        dimensions[segments:2 * segments, 0::2] = 2
+    return dimensions
+
+
+def _same_topology(shape, before, after):
+    # Tronco com diâmetros iguais rotula a altura em vez da geratriz, e topo nulo vira cone
+    if shape != "frustum":
+        return True
+    return ((before["width"] == before["depth"]) == (after["width"] == after["depth"])
+            and before["depth"] > 0 and after["depth"] > 0)
+
+
+def resize_mesh(shape, mesh, before: dict, after: dict, segments=None):
+    # Malha com as dimensões `after` a partir de `mesh`, gerada com `before`: só as coordenadas que
+    # dependem das dimensões alteradas são reescaladas. O resultado não entra no cache (um arraste
+    # de controle deslizante geraria centenas de malhas); sem a mesma topologia, usa o build_mesh.
+    changed = [DIMENSIONS.index(name) for name in SHAPE_DIMENSIONS.get(shape, ())
+               if float(before[name]) != float(after[name])]
+    if not changed:
+        return mesh
+    if not _same_topology(shape, before, after) or any(float(before[DIMENSIONS[i]]) <= 0 for i in changed):
+        return build_mesh(shape, after, segments)
+    scales = np.ones(len(DIMENSIONS), dtype=np.float32)
+    for index in changed:
+        scales[index] = float(after[DIMENSIONS[index]]) / float(before[DIMENSIONS[index]])
+    dimensions = _coordinate_dimensions(shape, len(mesh.vertices))
+    affected = np.isin(dimensions, changed)
+    vertices = mesh.vertices.copy()
+    vertices[affected] *= scales[dimensions[affected]]
+    lengths = edge_lengths(shape, *(float(after[name]) for name in DIMENSIONS))
+    edge_groups = {name: dict(group, length=lengths[name]) for name, group in mesh.edge_groups.items()}
+    return mesh.with_vertices(vertices, edge_groups)
+
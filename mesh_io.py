@@ -0,0 +1,508 @@
+import io
+import json
+import os
+import re
+import time
+import zipfile
+import numpy as np
+from mesh import Mesh
+from scene import SCENE_SHAPES, unit_mesh
+
+# Registro de um triângulo no STL binário: normal, três vértices e o atributo de 16 bits
+STL_HEADER_SIZE = 84
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+# Triângulos copiados do memmap por vez; limita a memória extra durante a leitura
+STL_CHUNK_TRIANGLES = 1 << 20
+# Bytes lidos por bloco no OBJ (o bloco é cortado na última quebra de linha)
+OBJ_CHUNK_BYTES = 16 << 20
+# Ângulo diedro (graus) a partir do qual uma aresta compartilhada é desenhada
+FEATURE_ANGLE = 30.0
+MESH_FORMATS = (".stl", ".obj")
+
+_STL_VERTEX = re.compile(rb"^[ \t]*vertex[ \t]+([^\r\n]*)", re.M)
+
+
+def weld_vertices(soup):
+    # Junta vértices com coordenadas idênticas (bit a bit). Ordena por um hash de 64 bits e
+    # inicia um grupo novo sempre que as coordenadas mudam, então colisões nunca juntam pontos
+    # diferentes (no pior caso sobra um vértice duplicado).
+    soup = np.ascontiguousarray(soup, dtype=np.float32).reshape(-1, 3)
+    bits = soup.view(np.uint32)
+    key = (bits[:, 0].astype(np.uint64) << np.uint64(32)) | bits[:, 1]
+    key ^= bits[:, 2].astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    order = np.argsort(key)
+    del key
+    ordered = np.take(bits, order, axis=0)
+    starts = np.empty(len(ordered), dtype=bool)
+    starts[:1] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=starts[1:])
+    del ordered
+    inverse = np.empty(len(soup), dtype=np.int32)
+    inverse[order] = np.cumsum(starts, dtype=np.int32) - 1
+    return np.take(soup, order[starts], axis=0), inverse
+
+
+def triangle_normals(corners):
+    # Normais unitárias (float32) de triângulos dados como array (n, 3, 3)
+    e1 = corners[:, 1] - corners[:, 0]
+    e2 = corners[:, 2] - corners[:, 0]
+    normals = np.cross(e1, e2)
+    lengths = np.sqrt(np.einsum("ij,ij->i", normals, normals))[:, None]
+    normals /= np.where(lengths == 0, 1, lengths)
+    return normals
+
+
+def feature_edges(vertices, triangles, angle=FEATURE_ANGLE, normals=None):
+    # Arestas de borda, não-manifold ou com ângulo diedro acima do limite; as diagonais
+    # internas das faces planas ficam de fora, como no desenho das formas prontas
+    triangles = np.asarray(triangles, dtype=np.int32).reshape(-1, 3)
+    if not len(triangles):
+        return np.zeros((0, 2), dtype=np.int32)
+    if normals is None:
+        vertices = np.asarray(vertices, dtype=np.float32)
+        normals = triangle_normals(np.take(vertices, triangles, axis=0))
+    # Três arestas por triângulo, com o menor índice primeiro
+    first = triangles.ravel()
+    second = triangles[:, [1, 2, 0]].ravel()
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    del first, second
+    keys = low.astype(np.int64) * (int(triangles.max()) + 1) + high
+    order = np.argsort(keys)
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    del keys
+    counts = np.diff(np.r_[starts, len(order)])
+    keep = counts != 2
+    manifold = starts[counts == 2]
+    # Cada aresta vem de order // 3, o triângulo que a contém
+    a = np.take(normals, order[manifold] // 3, axis=0)
+    b = np.take(normals, order[manifold + 1] // 3, axis=0)
+    keep[counts == 2] = np.einsum("ij,ij->i", a, b) < np.cos(np.radians(angle))
+    edges = order[starts[keep]]
+    return np.ascontiguousarray(np.column_stack([low[edges], high[edges]]), dtype=np.int32)
+
+
+def _mesh_from_triangles(vertices, triangles, normals=None):
+    return Mesh(vertices, triangles, feature_edges(vertices, triangles, normals=normals))
+
+
+def _stl_is_binary(path):
+    size = os.path.getsize(path)
+    if size < STL_HEADER_SIZE:
+        return False
+    with open(path, "rb") as stream:
+        header = stream.read(STL_HEADER_SIZE)
+    count = int(np.frombuffer(header, dtype="<u4", count=1, offset=80)[0])
+    # Alguns exportadores escrevem "solid" no cabeçalho binário: o tamanho decide
+    return size == STL_HEADER_SIZE + count * STL_RECORD.itemsize
+
+
+def read_stl(path, weld=True):
+    if not _stl_is_binary(path):
+        return _read_ascii_stl(path, weld)
+    count = (os.path.getsize(path) - STL_HEADER_SIZE) // STL_RECORD.itemsize
+    if not count:
+        raise ValueError("STL sem triângulos")
+    records = np.memmap(path, dtype=STL_RECORD, mode="r", offset=STL_HEADER_SIZE, shape=(count,))
+    soup = np.empty((count, 3, 3), dtype=np.float32)
+    for start in range(0, count, STL_CHUNK_TRIANGLES):
+        stop = min(start + STL_CHUNK_TRIANGLES, count)
+        soup[start:stop] = records["vertices"][start:stop]
+    del records
+    return _soup_mesh(soup, weld)
+
+
+def _read_ascii_stl(path, weld):
+    parts = []
+    for block in _text_blocks(path):
+        rows = _STL_VERTEX.findall(block)
+        if rows:
+            parts.append(np.array(b" ".join(rows).split(), dtype=np.float32))
+    if not parts:
+        raise ValueError("STL sem triângulos")
+    soup = np.concatenate(parts)
+    if soup.size % 9:
+        raise ValueError("STL ASCII inválido")
+    return _soup_mesh(soup.reshape(-1, 3, 3), weld)
+
+
+def _soup_mesh(soup, weld):
+    # As normais saem direto da sopa de triângulos, antes de juntar os vértices
+    normals = triangle_normals(soup)
+    if weld:
+        vertices, inverse = weld_vertices(soup)
+        triangles = inverse.reshape(-1, 3)
+    else:
+        vertices = soup.reshape(-1, 3)
+        triangles = np.arange(len(vertices), dtype=np.int32).reshape(-1, 3)
+    return _mesh_from_triangles(vertices, triangles, normals)
+
+
+def _text_blocks(path, chunk_bytes=OBJ_CHUNK_BYTES):
+    # Lê o arquivo em blocos de bytes terminados em quebra de linha
+    with open(path, "rb") as stream:
+        remainder = b""
+        while True:
+            block = stream.read(chunk_bytes)
+            if not block:
+                break
+            block = remainder + block
+            cut = block.rfind(b"\n") + 1
+            remainder = block[cut:]
+            if cut:
+                yield block[:cut]
+        if remainder:
+            yield remainder + b"\n"
+
+
+class _ObjBlock:
+    # Classifica as linhas de um bloco OBJ com operações vetorizadas sobre os bytes: cada
+    # tipo de linha é extraído como um único texto contínuo, sem laço Python por linha
+    def __init__(self, block):
+        self.data = np.frombuffer(block, dtype=np.uint8)
+        self.ends = np.flatnonzero(self.data == ord("\n")) + 1
+        self.starts = np.r_[0, self.ends[:-1]]
+        self.lengths = self.ends - self.starts
+        first = self.data[self.starts]
+        second = self.data[np.minimum(self.starts + 1, len(self.data) - 1)]
+        separated = (second == ord(" ")) | (second == ord("\t"))
+        self.vertex_lines = (first == ord("v")) & separated
+        self.face_lines = (first == ord("f")) & separated
+
+    def select(self, lines):
+        return self.data[np.repeat(lines, self.lengths)]
+
+    def vertices_before_faces(self):
+        return np.cumsum(self.vertex_lines)[self.face_lines]
+
+
+def _parse_obj_vertices(block):
+    text = block.select(block.vertex_lines).tobytes()
+    try:
+        # Parser em C do numpy; a coluna "v" e colunas extras (w ou cor r g b) são ignoradas
+        return np.loadtxt(io.BytesIO(text), dtype=np.float64, usecols=(1, 2, 3), ndmin=2)
+    except ValueError:
+        return np.array([row.split()[1:4] for row in text.splitlines()], dtype=np.float64)
+
+
+def _count_tokens(blank):
+    return int(np.count_nonzero(~blank[1:] & blank[:-1])) + int(not blank[0])
+
+
+def _parse_obj_faces(block):
+    # Devolve os triângulos e a linha de origem (entre as faces do bloco) de cada um
+    data = block.select(block.face_lines)
+    text = data.tobytes()
+    count = int(block.face_lines.sum())
+    # Espaço, tabulação e quebras de linha (e demais controles) separam tokens
+    blank = data <= ord(" ")
+    first = text[:text.find(b"\n")].replace(b"/", b" ").split()
+    stride = (len(first) - 1) // 3
+    # Só triângulos, todos no mesmo formato ("a b c", "a/t b/t c/t", "a//n ..."): os totais de
+    # tokens com e sem "/" como separador batem com o da primeira linha
+    if (stride and _count_tokens(blank) == 4 * count
+            and _count_tokens(blank | (data == ord("/"))) == (1 + 3 * stride) * count):
+        columns = range(1, 1 + 3 * stride, stride)
+        try:
+            values = np.loadtxt(io.BytesIO(text.replace(b"/", b" ")), dtype=np.int64, usecols=columns, ndmin=2)
+            return values, np.arange(count)
+        except ValueError:
+            pass
+    triangles, sources = [], []
+    for index, row in enumerate(text.splitlines()):
+        polygon = [token.split(b"/")[0] for token in row.split()[1:]]
+        for i in range(1, len(polygon) - 1):
+            triangles.append((polygon[0], polygon[i], polygon[i + 1]))
+            sources.append(index)
+    return np.array(triangles, dtype=np.int64).reshape(-1, 3), np.array(sources, dtype=np.int64)
+
+
+def read_obj(path, chunk_bytes=OBJ_CHUNK_BYTES):
+    vertex_parts, face_parts = [], []
+    vertex_count = 0
+    for text in _text_blocks(path, chunk_bytes):
+        block = _ObjBlock(text)
+        if block.face_lines.any():
+            faces, sources = _parse_obj_faces(block)
+            # Índices negativos são relativos aos vértices lidos antes da linha da face
+            if (faces < 0).any():
+                seen = vertex_count + block.vertices_before_faces()[sources]
+                faces = np.where(faces < 0, faces + seen[:, None], faces - 1)
+            else:
+                faces -= 1
+            face_parts.append(faces.astype(np.int32))
+        if block.vertex_lines.any():
+            vertices = _parse_obj_vertices(block)
+            vertex_parts.append(vertices.astype(np.float32))
+            vertex_count += len(vertices)
+    if not vertex_parts or not face_parts:
+        raise ValueError("OBJ sem vértices ou faces")
+    vertices = np.concatenate(vertex_parts)
+    triangles = np.concatenate(face_parts)
+    if triangles.min() < 0 or triangles.max() >= len(vertices):
+        raise ValueError("OBJ com índice de vértice inválido")
+    return _mesh_from_triangles(vertices, triangles)
+
+
+def load_mesh(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".stl":
+        return read_stl(path)
+    if extension == ".obj":
+        return read_obj(path)
+    raise ValueError(f"Formato de malha desconhecido: {extension}")
+
+
+# --- Exportação ---
+
+EXPORT_FORMATS = (".stl", ".obj", ".glb")
+# Casas decimais das coordenadas no OBJ (mesma precisão do "%.6f" usual)
+OBJ_DECIMALS = 6
+# Instâncias de uma cena convertidas em triângulos por bloco na exportação
+SCENE_CHUNK_INSTANCES = 4096
+GLB_MAGIC = 0x46546C67
+GLB_JSON_CHUNK = 0x4E4F534A
+GLB_BIN_CHUNK = 0x004E4942
+
+
+def _mesh_arrays(mesh):
+    if isinstance(mesh, Mesh):
+        return mesh.vertices, mesh.triangles
+    vertices, triangles = mesh
+    return (np.asarray(vertices, dtype=np.float32).reshape(-1, 3),
+            np.asarray(triangles, dtype=np.int32).reshape(-1, 3))
+
+
+def encode_stl_records(vertices, triangles):
+    # Registros STL binários (sem cabeçalho) como bytes prontos para escrita
+    records = np.zeros(len(triangles), dtype=STL_RECORD)
+    corners = np.take(vertices, triangles, axis=0)
+    records["vertices"] = corners
+    records["normal"] = triangle_normals(corners)
+    return records.view(np.uint8)
+
+
+def stl_header(count, title=b"3D-Visualizer"):
+    # "solid" no começo confunde leitores que detectam STL ASCII pelo cabeçalho
+    header = np.zeros(STL_HEADER_SIZE, dtype=np.uint8)
+    header[:len(title[:80])] = np.frombuffer(title[:80], dtype=np.uint8)
+    header[80:] = np.frombuffer(np.uint32(count).tobytes(), dtype=np.uint8)
+    return header
+
+
+def encode_stl(mesh):
+    vertices, triangles = _mesh_arrays(mesh)
+    return np.concatenate([stl_header(len(triangles)), encode_stl_records(vertices, triangles)])
+
+
+def _digits(values, width):
+    # Inteiros não negativos em ASCII, alinhados à direita com espaços: array (..., width)
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    digits = (values[..., None] // powers) % 10 + ord("0")
+    # Zeros à esquerda viram espaço (o último dígito sempre aparece)
+    digits[(values[..., None] < powers) & (powers > 1)] = ord(" ")
+    return digits.astype(np.uint8)
+
+
+def _width(values):
+    return len(str(int(values.max()))) if values.size else 1
+
+
+def _format_fixed(values, decimals=OBJ_DECIMALS):
+    # Números em ponto fixo com largura constante, sinal colado ao primeiro dígito
+    scale = 10 ** decimals
+    scaled = np.rint(np.abs(values.astype(np.float64)) * scale).astype(np.int64)
+    whole, fraction = scaled // scale, scaled % scale
+    width = _width(whole)
+    text = np.empty(values.shape + (width + 2 + decimals,), dtype=np.uint8)
+    text[..., 0] = ord(" ")
+    text[..., 1:width + 1] = _digits(whole, width)
+    text[..., width + 1] = ord(".")
+    text[..., width + 2:] = _digits(fraction, decimals)
+    text[..., width + 2:][text[..., width + 2:] == ord(" ")] = ord("0")
+    negative = (values < 0) & (scaled > 0)
+    sign_column = width - np.maximum(np.floor(np.log10(np.maximum(whole, 1))).astype(np.int64) + 1, 1)
+    np.put_along_axis(text, sign_column[..., None], np.where(negative, ord("-"), text[..., 0])[..., None]
+                      .astype(np.uint8), axis=-1)
+    return text
+
+
+def _obj_lines(prefix, columns):
+    # Junta colunas de texto (arrays (n, k, largura)) em linhas "prefixo c1 c2 c3\n"
+    count = columns.shape[0]
+    head = np.frombuffer(prefix, dtype=np.uint8)
+    parts = [np.broadcast_to(head, (count, len(head)))]
+    for index in range(columns.shape[1]):
+        parts.append(np.full((count, 1), ord(" "), dtype=np.uint8))
+        parts.append(columns[:, index])
+    parts.append(np.full((count, 1), ord("\n"), dtype=np.uint8))
+    return np.concatenate(parts, axis=1).ravel()
+
+
+def encode_obj(mesh, vertex_offset=0, header=True):
+    # Texto OBJ montado em arrays de bytes; vertex_offset permite escrever vários blocos seguidos
+    vertices, triangles = _mesh_arrays(mesh)
+    indices = triangles.astype(np.int64) + vertex_offset + 1
+    parts = [np.frombuffer(b"# 3D-Visualizer\n", dtype=np.uint8)] if header else []
+    if len(vertices):
+        parts.append(_obj_lines(b"v", _format_fixed(vertices)))
+    if len(triangles):
+        parts.append(_obj_lines(b"f", _digits(indices, _width(indices))))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+
+
+def _pad(data, multiple=4, fill=0):
+    extra = -len(data) % multiple
+    return data if not extra else np.concatenate([data, np.full(extra, fill, dtype=np.uint8)])
+
+
+def encode_glb(meshes, nodes=None):
+    # glTF binário: um buffer com posições e índices de cada malha e, opcionalmente, nós com
+    # matrizes (instâncias de uma cena reaproveitam a mesma malha)
+    if isinstance(meshes, Mesh) or isinstance(meshes, tuple):
+        meshes = [meshes]
+    blobs, views, accessors, gltf_meshes = [], [], [], []
+    offset = 0
+    for mesh in meshes:
+        vertices, triangles = _mesh_arrays(mesh)
+        positions = np.ascontiguousarray(vertices, dtype="<f4")
+        indices = np.ascontiguousarray(triangles, dtype="<u4")
+        for data, target in ((positions, 34962), (indices, 34963)):
+            raw = _pad(data.reshape(-1).view(np.uint8))
+            views.append({"buffer": 0, "byteOffset": offset, "byteLength": int(data.nbytes), "target": target})
+            blobs.append(raw)
+            offset += len(raw)
+        accessors.append({"bufferView": len(views) - 2, "componentType": 5126, "count": len(positions),
+                          "type": "VEC3", "min": positions.min(axis=0).tolist() if len(positions) else [0, 0, 0],
+                          "max": positions.max(axis=0).tolist() if len(positions) else [0, 0, 0]})
+        accessors.append({"bufferView": len(views) - 1, "componentType": 5125, "count": int(indices.size),
+                          "type": "SCALAR"})
+        gltf_meshes.append({"primitives": [{"attributes": {"POSITION": len(accessors) - 2},
+                                            "indices": len(accessors) - 1, "mode": 4}]})
+    if nodes is None:
+        nodes = [{"mesh": index} for index in range(len(gltf_meshes))]
+    document = {
+        "asset": {"version": "2.0", "generator": "3D-Visualizer"},
+        "scene": 0,
+        "scenes": [{"nodes": list(range(len(nodes)))}],
+        "nodes": nodes,
+        "meshes": gltf_meshes,
+        "accessors": accessors,
+        "bufferViews": views,
+        "buffers": [{"byteLength": offset}]
+    }
+    json_chunk = _pad(np.frombuffer(json.dumps(document, separators=(",", ":")).encode("utf-8"), dtype=np.uint8),
+                      fill=ord(" "))
+    binary = np.concatenate(blobs) if blobs else np.zeros(0, dtype=np.uint8)
+    total = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    header = np.array([GLB_MAGIC, 2, total, len(json_chunk), GLB_JSON_CHUNK], dtype="<u4").view(np.uint8)
+    binary_header = np.array([len(binary), GLB_BIN_CHUNK], dtype="<u4").view(np.uint8)
+    return np.concatenate([header, json_chunk, binary_header, binary])
+
+
+ENCODERS = {".stl": encode_stl, ".obj": encode_obj, ".glb": encode_glb}
+
+
+def encode_mesh(mesh, extension):
+    extension = extension.lower()
+    if extension not in ENCODERS:
+        raise ValueError(f"Formato de exportação desconhecido: {extension}")
+    return ENCODERS[extension](mesh)
+
+
+def write_mesh_data(path, data):
+    # Um único write por arquivo com o buffer já montado
+    with open(path, "wb") as stream:
+        stream.write(data)
+    return len(data)
+
+
+def write_mesh(path, mesh):
+    return write_mesh_data(path, encode_mesh(mesh, os.path.splitext(path)[1]))
+
+
+def _scene_shapes(scene):
+    return [shape for shape in SCENE_SHAPES if len(scene.indices(shape))]
+
+
+def scene_chunks(scene, chunk_size=SCENE_CHUNK_INSTANCES):
+    # Triângulos das instâncias da cena já transformados, gerados em blocos por forma
+    for shape in _scene_shapes(scene):
+        mesh = unit_mesh(shape)
+        indices = scene.indices(shape)
+        homogeneous = np.hstack([mesh.vertices, np.ones((len(mesh.vertices), 1), dtype=np.float32)])
+        for start in range(0, len(indices), chunk_size):
+            matrices = scene.model_matrices(indices[start:start + chunk_size])
+            vertices = np.einsum("nij,vj->nvi", matrices, homogeneous)[..., :3]
+            offsets = np.arange(len(matrices), dtype=np.int32)[:, None, None] * len(mesh.vertices)
+            yield vertices.reshape(-1, 3), (mesh.triangles[None] + offsets).reshape(-1, 3)
+
+
+def export_scene(path, scene, chunk_size=SCENE_CHUNK_INSTANCES):
+    # Cenas grandes vão para o arquivo em blocos de instâncias, sem montar a malha inteira
+    extension = os.path.splitext(path)[1].lower()
+    shapes = _scene_shapes(scene)
+    if extension == ".glb":
+        # glTF guarda cada forma uma vez e as instâncias como nós com matriz (ordem de coluna)
+        nodes = []
+        for mesh_index, shape in enumerate(shapes):
+            matrices = scene.model_matrices(scene.indices(shape))
+            columns = matrices.transpose(0, 2, 1).reshape(len(matrices), 16).tolist()
+            nodes += [{"mesh": mesh_index, "matrix": matrix} for matrix in columns]
+        return write_mesh_data(path, encode_glb([unit_mesh(shape) for shape in shapes], nodes))
+    if extension not in (".stl", ".obj"):
+        raise ValueError(f"Formato de exportação desconhecido: {extension}")
+    written = 0
+    with open(path, "wb") as stream:
+        if extension == ".stl":
+            total = sum(len(scene.indices(shape)) * len(unit_mesh(shape).triangles) for shape in shapes)
+            written += stream.write(stl_header(total))
+        else:
+            written += stream.write(b"# 3D-Visualizer\n")
+        vertex_offset = 0
+        for vertices, triangles in scene_chunks(scene, chunk_size):
+            if extension == ".stl":
+                written += stream.write(encode_stl_records(vertices, triangles))
+            else:
+                written += stream.write(encode_obj((vertices, triangles), vertex_offset, header=False))
+            vertex_offset += len(vertices)
+    return written
+
+
+class MeshArchive:
+    # Arquivo zip gravado em fluxo: cada malha é codificada e escrita na sua entrada assim que
+    # chega, então lotes com milhares de formas não ficam inteiros na memória
+    def __init__(self, path, extension=".stl", compress=False):
+        if extension.lower() not in ENCODERS:
+            raise ValueError(f"Formato de exportação desconhecido: {extension}")
+        self.extension = extension.lower()
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, name, mesh):
+        data = encode_mesh(mesh, self.extension)
+        info = zipfile.ZipInfo(name + self.extension, time.localtime()[:6])
+        info.compress_type = self.zip.compression
+        with self.zip.open(info, "w", force_zip64=data.nbytes >= 1 << 31) as entry:
+            entry.write(data)
+        self.count += 1
+
+    def add_shapes(self, shapes, dims, names=None):
+        # Formas prontas de um bloco do lote (mesmo layout de batch_cli.read_chunks): a malha
+        # unitária escalada pelas dimensões, sem passar pelo cache de build_mesh
+        dims = np.asarray(dims, dtype=np.float32).reshape(-1, 3)
+        meshes = {shape: unit_mesh(shape) for shape in set(shapes)}
+        first = self.count
+        for index, (shape, scale) in enumerate(zip(shapes, dims)):
+            mesh = meshes[shape]
+            name = names[index] if names is not None else f"{first + index:06d}_{shape}"
+            self.add(name, (mesh.vertices * scale, mesh.triangles))
+
+    def close(self):
+        self.zip.close()
@@ -1,7 +1,11 @@
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 from OpenGL.GL import *
 from OpenGL.GLU import *
-from OpenGL.GLUT import glutInit, glutBitmapCharacter, GLUT_BITMAP_HELVETICA_12, GLUT_BITMAP_HELVETICA_10
+from gl_resources import current_resources
+from shader_renderer import ShaderRenderer
+import camera
+from geometry_calculator import GeometryCalculator
+from mesh import build_mesh
 
 class MiniPreviewWidget(QOpenGLWidget):
     def __init__(self, shape, params, parent=None):
@@ -11,74 +15,106 @@ class MiniPreviewWidget(QOpenGLWidget):
         self.x_rot = 30
         self.y_rot = 30
         self.zoom = -5.0
-        glutInit()
+        self.retained_mode = True
+        # Mesmo critério do Geometry3D: shaders quando o contexto permite, senão pipeline fixo
+        self.shader_renderer = None
+        self.pipeline_ready = False
 
     def setParameters(self, params):
         self.params = params
         self.update()
 
     def initializeGL(self):
+        self.context().aboutToBeDestroyed.connect(self.release_gl_resources)
+        self.ensure_pipeline()
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_CULL_FACE)
+        if self.shader_renderer is not None:
+            return
         glEnable(GL_LIGHTING)
         glEnable(GL_LIGHT0)
         glLightfv(GL_LIGHT0, GL_POSITION, [5, 5, 5, 1])
         glLightfv(GL_LIGHT0, GL_DIFFUSE, [1, 1, 1, 1])
 
+    def ensure_pipeline(self):
+        if not self.pipeline_ready:
+            self.pipeline_ready = True
+            renderer = ShaderRenderer()
+            self.shader_renderer = renderer if renderer.initialize() else None
+
+    def release_gl_resources(self):
+        self.makeCurrent()
+        if self.shader_renderer is not None:
+            self.shader_renderer.release()
+        self.shader_renderer = None
+        self.pipeline_ready = False
+        self.doneCurrent()
+
     def resizeGL(self, w: int, h: int):
+        self.ensure_pipeline()
         glViewport(0, 0, w, h)
+        if self.shader_renderer is not None:
+            return
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
         gluPerspective(45, w/h if h != 0 else 1, 1, 50)
         glMatrixMode(GL_MODELVIEW)
 
     def paintGL(self):
+        self.ensure_pipeline()
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        if self.shader_renderer is not None:
+            self.draw_shaders()
+            glFlush()
+            return
         glLoadIdentity()
         glTranslatef(0, 0, self.zoom)
         glRotatef(self.x_rot, 1, 0, 0)
         glRotatef(self.y_rot, 0, 1, 0)
-        if self.shape == "pyramid":
+        shape = GeometryCalculator.normalize_shape(self.shape)
+        if self.retained_mode:
+            self.draw_retained()
+        elif shape == "pyramid":
             self.draw_pyramid()
-        elif self.shape == "parallelepiped":
+        elif shape == "parallelepiped":
             self.draw_parallelepiped()
         glFlush()
 
+    def build_mesh(self):
+        # O combo da calculadora usa nomes em português; a malha é compartilhada com o Geometry3D
+        params = {key: self.params.get(key, 1) for key in ("width", "height", "depth")}
+        return build_mesh(GeometryCalculator.normalize_shape(self.shape), params)
+
+    def draw_shaders(self):
+        mesh = self.build_mesh()
+        if mesh is None:
+            return
+        renderer = self.shader_renderer
+        renderer.begin_frame()
+        width, height = renderer.viewport[2:]
+        mvp = (camera.perspective(camera.FOV_Y, width / max(height, 1), camera.NEAR_PLANE, camera.FAR_PLANE)
+               @ camera.orbit_view(self.x_rot, self.y_rot, self.zoom))
+        renderer.draw_lines(current_resources().mesh_buffer(("edges", mesh), mesh.vertices, mesh.edges), mvp)
+
+    def draw_retained(self):
+        mesh = self.build_mesh()
+        if mesh is None:
+            return
+        # Mesmo buffer do Geometry3D quando a forma e as dimensões coincidem
+        current_resources().mesh_buffer(("edges", mesh), mesh.vertices, mesh.edges).draw()
+
     def draw_pyramid(self):
-        w = self.params.get("width", 1)
-        h = self.params.get("height", 1)
-        d = self.params.get("depth", 1)
-        vertices = [
-            [-w/2, 0, -d/2],
-            [w/2, 0, -d/2],
-            [w/2, 0, d/2],
-            [-w/2, 0, d/2],
-            [0, h, 0]
-        ]
+        mesh = self.build_mesh()
+        vertices, edges = mesh.vertices, mesh.edges
         glBegin(GL_LINES)
-        for i in range(4):
-            glVertex3fv(vertices[i])
-            glVertex3fv(vertices[(i+1)%4])
-        for i in range(4):
-            glVertex3fv(vertices[i])
-            glVertex3fv(vertices[4])
+        for edge in edges:
+            glVertex3fv(vertices[edge[0]])
+            glVertex3fv(vertices[edge[1]])
         glEnd()
 
     def draw_parallelepiped(self):
-        w = self.params.get("width", 1)
-        h = self.params.get("height", 1)
-        d = self.params.get("depth", 1)
-        vertices = [
-            [-w/2, -h/2, -d/2], [w/2, -h/2, -d/2],
-            [w/2, h/2, -d/2],   [-w/2, h/2, -d/2],
-            [-w/2, -h/2, d/2],  [w/2, -h/2, d/2],
-            [w/2, h/2, d/2],    [-w/2, h/2, d/2]
-        ]
-        edges = [
-            (0, 1), (1, 2), (2, 3), (3, 0),
-            (4, 5), (5, 6), (6, 7), (7, 4),
-            (0, 4), (1, 5), (2, 6), (3, 7)
-        ]
+        mesh = self.build_mesh()
+        vertices, edges = mesh.vertices, mesh.edges
         glBegin(GL_LINES)
         for edge in edges:
             glVertex3fv(vertices[edge[0]])
@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from geometry_calculator import GeometryCalculator
+
+DEFAULT_WORKER_CHUNK_SIZE = 16384
+
+
+def _attach(name):
+    # Os processos filhos só anexam o segmento; quem cria é responsável por liberá-lo.
+    # Antes do Python 3.13 o registro no resource tracker (compartilhado com o pai) é idempotente.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _compute_slice(shape, input_name, output_name, count, column_count, start, stop):
+    input_shm = _attach(input_name)
+    output_shm = _attach(output_name)
+    dims = out = None
+    try:
+        dims = np.ndarray((3, count), dtype=np.float64, buffer=input_shm.buf)
+        out = np.ndarray((column_count, count), dtype=np.float64, buffer=output_shm.buf)
+        properties = GeometryCalculator.calculate_properties_batch(
+            shape, dims[0, start:stop], dims[1, start:stop], dims[2, start:stop])
+        for row, column in enumerate(GeometryCalculator.flatten_batch_properties(properties).values()):
+            out[row, start:stop] = column
+    finally:
+        # As views precisam ser liberadas antes de fechar os segmentos
+        dims = out = properties = None
+        input_shm.close()
+        output_shm.close()
+    return start, stop
+
+
+class ParallelBatchCalculator:
+    def __init__(self, workers=None, chunk_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or DEFAULT_WORKER_CHUNK_SIZE
+        if self.workers < 1 or self.chunk_size < 1:
+            raise ValueError("workers e chunk_size devem ser positivos")
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def compute_columns(self, shape, width, height, depth):
+        width, height, depth = GeometryCalculator._batch_dimensions(width, height, depth)
+        width, height, depth = width.ravel(), height.ravel(), depth.ravel()
+        count = width.size
+        # Lotes pequenos não compensam o custo de distribuir entre processos
+        if self.workers == 1 or count <= self.chunk_size:
+            properties = GeometryCalculator.calculate_properties_batch(shape, width, height, depth)
+            return GeometryCalculator.flatten_batch_properties(properties)
+        names = list(GeometryCalculator.flatten_batch_properties(
+            GeometryCalculator.calculate_properties_batch(shape, width[:1], height[:1], depth[:1])))
+        input_shm = shared_memory.SharedMemory(create=True, size=3 * count * 8)
+        output_shm = shared_memory.SharedMemory(create=True, size=len(names) * count * 8)
+        dims = out = None
+        try:
+            dims = np.ndarray((3, count), dtype=np.float64, buffer=input_shm.buf)
+            dims[0], dims[1], dims[2] = width, height, depth
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [
+                self._executor.submit(_compute_slice, shape, input_shm.name, output_shm.name,
+                                      count, len(names), start, min(start + self.chunk_size, count))
+                for start in range(0, count, self.chunk_size)
+            ]
+            # Cada tarefa escreve na sua própria faixa de índices, então a ordem final não depende
+            # da ordem de conclusão; aguardamos todas para propagar erros deterministicamente
+            for future in futures:
+                future.result()
+            out = np.ndarray((len(names), count), dtype=np.float64, buffer=output_shm.buf)
+            result = out.copy()
+        finally:
+            dims = out = None
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+        return dict(zip(names, result))
+
+
+def calculate_properties_parallel(shape, width, height=None, depth=None, workers=None, chunk_size=None):
+    with ParallelBatchCalculator(workers, chunk_size) as calculator:
+        return calculator.compute_columns(shape, width, height, depth)
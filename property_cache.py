@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+from geometry_calculator import GeometryCalculator
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class CachedGeometryCalculator:
+    # Mesma interface do GeometryCalculator, com cache LRU limitado na frente dos cálculos.
+    # Os resultados devolvidos são compartilhados entre chamadas e não devem ser modificados.
+    def __init__(self, calculator=GeometryCalculator, maxsize=DEFAULT_CACHE_SIZE, tolerance=0.0):
+        if maxsize < 1:
+            raise ValueError("maxsize deve ser positivo")
+        if tolerance < 0:
+            raise ValueError("tolerance não pode ser negativa")
+        self.calculator = calculator
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def format_value(self, value):
+        return self.calculator.format_value(value)
+
+    def calculate_parallelepiped_properties(self, params):
+        return self.calculate("parallelepiped", params)
+
+    def calculate_pyramid_properties(self, params):
+        return self.calculate("pyramid", params)
+
+    def calculate_properties(self, shape, params):
+        return self.calculate(shape, params)
+
+    def calculate_mesh_properties(self, mesh, density=1.0):
+        # Malhas importadas não têm chave por dimensões: calcula direto
+        return self.calculator.calculate_mesh_properties(mesh, density)
+
+    def make_key(self, shape, params):
+        values = (params["width"], params["height"], params["depth"])
+        if self.tolerance:
+            # Dimensões dentro da mesma faixa de tolerância compartilham a entrada
+            values = tuple(round(v / self.tolerance) for v in values)
+        else:
+            values = tuple(float(v) + 0.0 for v in values)
+        return GeometryCalculator.normalize_shape(shape), values
+
+    def calculate(self, shape, params):
+        key = self.make_key(shape, params)
+        with self._lock:
+            properties = self._entries.get(key)
+            if properties is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return properties
+            self.misses += 1
+        properties = self.calculator.calculate_properties(key[0], params)
+        with self._lock:
+            self._entries[key] = properties
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return properties
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
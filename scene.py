@@ -0,0 +1,147 @@
+import csv
+import json
+import numpy as np
+from geometry_calculator import GeometryCalculator
+from mesh import build_mesh
+
+# Índice de cada forma no array de tipos da cena
+SCENE_SHAPES = ("parallelepiped", "pyramid")
+
+
+# Malhas unitárias compartilhadas por todas as instâncias (mesma topologia do Geometry3D)
+UNIT_PARAMS = {"width": 1.0, "height": 1.0, "depth": 1.0}
+
+
+def unit_mesh(shape):
+    return build_mesh(shape, UNIT_PARAMS)
+
+
+class Scene:
+    # Coleção de formas guardada em arrays por instância (tipo, dimensões, posição, rotação e cor)
+    def __init__(self):
+        self.kinds = np.zeros(0, dtype=np.uint8)
+        self.dimensions = np.zeros((0, 3), dtype=np.float32)
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.rotations = np.zeros((0, 3), dtype=np.float32)  # graus em torno de x, y e z
+        self.colors = np.zeros((0, 3), dtype=np.float32)
+        # Incrementado a cada alteração; os renderizadores reenviam os dados quando muda
+        self.version = 0
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, shape, params, position=(0, 0, 0), rotation=(0, 0, 0), color=(1, 1, 1)):
+        self.add_many(shape, [(params["width"], params["height"], params["depth"])],
+                      [position], [rotation], [color])
+        return len(self) - 1
+
+    def add_many(self, shape, dimensions, positions, rotations=None, colors=None):
+        shape = GeometryCalculator.normalize_shape(shape)
+        if shape not in SCENE_SHAPES:
+            raise ValueError(f"Forma desconhecida: {shape}")
+        dimensions = np.asarray(dimensions, dtype=np.float32).reshape(-1, 3)
+        count = len(dimensions)
+        positions = np.broadcast_to(np.asarray(positions, dtype=np.float32), (count, 3))
+        rotations = np.broadcast_to(np.asarray(0 if rotations is None else rotations, dtype=np.float32), (count, 3))
+        colors = np.broadcast_to(np.asarray(1 if colors is None else colors, dtype=np.float32), (count, 3))
+        self.kinds = np.concatenate([self.kinds, np.full(count, SCENE_SHAPES.index(shape), dtype=np.uint8)])
+        self.dimensions = np.concatenate([self.dimensions, dimensions])
+        self.positions = np.concatenate([self.positions, positions])
+        self.rotations = np.concatenate([self.rotations, rotations])
+        self.colors = np.concatenate([self.colors, colors])
+        self.version += 1
+
+    def clear(self):
+        self.__init__()
+
+    def indices(self, shape):
+        return np.flatnonzero(self.kinds == SCENE_SHAPES.index(shape))
+
+    def model_matrices(self, indices=None):
+        # Matrizes modelo T * Rz * Ry * Rx * S de cada instância, vetorizadas
+        if indices is None:
+            indices = slice(None)
+        dims = self.dimensions[indices].astype(np.float64)
+        angles = np.radians(self.rotations[indices].astype(np.float64))
+        cx, cy, cz = np.cos(angles).T
+        sx, sy, sz = np.sin(angles).T
+        count = len(dims)
+        rotation = np.empty((count, 3, 3))
+        rotation[:, 0, 0] = cy * cz
+        rotation[:, 0, 1] = sx * sy * cz - cx * sz
+        rotation[:, 0, 2] = cx * sy * cz + sx * sz
+        rotation[:, 1, 0] = cy * sz
+        rotation[:, 1, 1] = sx * sy * sz + cx * cz
+        rotation[:, 1, 2] = cx * sy * sz - sx * cz
+        rotation[:, 2, 0] = -sy
+        rotation[:, 2, 1] = sx * cy
+        rotation[:, 2, 2] = cx * cy
+        matrices = np.zeros((count, 4, 4), dtype=np.float32)
+        matrices[:, :3, :3] = rotation * dims[:, None, :]
+        matrices[:, :3, 3] = self.positions[indices]
+        matrices[:, 3, 3] = 1
+        return matrices
+
+    def world_triangles(self):
+        # Triângulos de todas as instâncias já transformados, com a instância de origem e o
+        # índice do triângulo na malha unitária de cada um (para achar a face)
+        vertices, triangles, owners, local = [], [], [], []
+        offset = 0
+        for shape in SCENE_SHAPES:
+            indices = self.indices(shape)
+            if not len(indices):
+                continue
+            mesh = unit_mesh(shape)
+            matrices = self.model_matrices(indices)
+            world = np.einsum("nij,vj->nvi", matrices[:, :3, :3], mesh.vertices) + matrices[:, None, :3, 3]
+            starts = offset + np.arange(len(indices), dtype=np.int64)[:, None, None] * len(mesh.vertices)
+            vertices.append(world.reshape(-1, 3))
+            triangles.append((mesh.triangles[None] + starts).reshape(-1, 3))
+            owners.append(np.repeat(indices, len(mesh.triangles)))
+            local.append(np.tile(np.arange(len(mesh.triangles)), len(indices)))
+            offset += len(indices) * len(mesh.vertices)
+        if not vertices:
+            empty = np.zeros(0, dtype=np.int64)
+            return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.int64), empty, empty
+        return np.vstack(vertices), np.vstack(triangles), np.concatenate(owners), np.concatenate(local)
+
+    def bounds(self):
+        if not len(self):
+            return np.zeros(3), np.zeros(3)
+        # Esfera envolvente de cada instância para um limite conservador
+        radius = np.linalg.norm(self.dimensions, axis=1)[:, None]
+        return (self.positions - radius).min(axis=0), (self.positions + radius).max(axis=0)
+
+
+def load_scene(path):
+    # CSV ou JSON por linha com shape,width,height,depth,x,y,z e opcionalmente rx,ry,rz,r,g,b
+    kinds, columns = [], []
+    with open(path, encoding="utf-8", newline="") as stream:
+        if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+            rows = ((number, json.loads(line)) for number, line in enumerate(stream, start=1) if line.strip())
+        else:
+            reader = csv.DictReader(stream)
+            rows = ((reader.line_num, row) for row in reader)
+        for number, row in rows:
+            if not isinstance(row, dict):
+                raise ValueError(f"linha {number}: esperado um objeto com shape, width, height, depth, x, y, z")
+            shape = GeometryCalculator.normalize_shape(str(row["shape"]))
+            if shape not in SCENE_SHAPES:
+                raise ValueError(f"linha {number}: forma desconhecida: {shape}")
+            try:
+                values = [float(default if row.get(name) in (None, "") else row[name]) for name, default in (
+                    ("width", 1), ("height", 1), ("depth", 1), ("x", 0), ("y", 0), ("z", 0),
+                    ("rx", 0), ("ry", 0), ("rz", 0), ("r", 1), ("g", 1), ("b", 1))]
+            except (TypeError, ValueError):
+                raise ValueError(f"linha {number}: dimensões inválidas")
+            kinds.append(SCENE_SHAPES.index(shape))
+            columns.append(values)
+    # Instâncias na ordem do arquivo (o índice de cada uma é a linha de origem, sem contar o cabeçalho)
+    scene = Scene()
+    if columns:
+        values = np.array(columns, dtype=np.float32)
+        scene.kinds = np.array(kinds, dtype=np.uint8)
+        scene.dimensions, scene.positions = values[:, 0:3], values[:, 3:6]
+        scene.rotations, scene.colors = values[:, 6:9], values[:, 9:12]
+        scene.version += 1
+    return scene
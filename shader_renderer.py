@@ -0,0 +1,375 @@
+import ctypes
+import os
+import re
+from collections import OrderedDict
+import numpy as np
+from OpenGL.GL import *
+from gl_resources import current_resources
+
+# Força o pipeline fixo (glBegin, glLineStipple, iluminação fixa) mesmo com GLSL 3.30 disponível
+FIXED_PIPELINE_ENV = "GEOMETRY3D_FIXED_PIPELINE"
+MIN_GLSL_VERSION = (3, 30)
+# VAOs guardados por widget para os buffers compartilhados (VAOs não são compartilhados entre contextos)
+VAO_CACHE_SIZE = 64
+# Mesma luz do pipeline fixo: posição em coordenadas do olho e luz ambiente global padrão do GL
+LIGHT_POSITION = (5.0, 5.0, 5.0)
+AMBIENT = 0.2
+# Vértices de cada glifo (quadrilátero) em dois triângulos
+QUAD_TRIANGLES = np.array([0, 1, 2, 0, 2, 3])
+# Atributos dos buffers de streaming: (posição, componentes, deslocamento em bytes)
+STREAM_LAYOUTS = {
+    "line": (24, [(0, 3, 0), (2, 3, 12)]),
+    "text": (28, [(0, 2, 0), (1, 2, 8), (2, 3, 16)])
+}
+
+LINE_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec3 a_position;
+layout(location = 2) in vec3 a_color;
+uniform mat4 u_mvp;
+out vec3 v_color;
+void main() {
+    v_color = a_color;
+    gl_Position = u_mvp * vec4(a_position, 1.0);
+}
+"""
+
+# Cada segmento vira um retângulo na tela com u_width pixels mais uma borda de um pixel
+# para a suavização; glLineWidth acima de 1 não existe no perfil core
+LINE_GEOMETRY_SHADER = """
+#version 330 core
+layout(lines) in;
+layout(triangle_strip, max_vertices = 4) out;
+uniform vec2 u_viewport;
+uniform float u_width;
+in vec3 v_color[];
+out vec3 g_color;
+noperspective out float g_distance;
+noperspective out float g_offset;
+void main() {
+    vec4 p0 = gl_in[0].gl_Position;
+    vec4 p1 = gl_in[1].gl_Position;
+    // Recorta no plano próximo antes da divisão perspectiva
+    float d0 = p0.z + p0.w;
+    float d1 = p1.z + p1.w;
+    if (d0 < 0.0 && d1 < 0.0) {
+        return;
+    }
+    if (d0 < 0.0) {
+        p0 = mix(p0, p1, d0 / (d0 - d1));
+    }
+    if (d1 < 0.0) {
+        p1 = mix(p1, p0, d1 / (d1 - d0));
+    }
+    vec2 half_viewport = 0.5 * u_viewport;
+    vec2 s0 = p0.xy / p0.w * half_viewport;
+    vec2 s1 = p1.xy / p1.w * half_viewport;
+    float length_px = length(s1 - s0);
+    vec2 direction = length_px > 0.0 ? (s1 - s0) / length_px : vec2(1.0, 0.0);
+    float half_width = 0.5 * u_width + 1.0;
+    vec2 offset = vec2(-direction.y, direction.x) * half_width / half_viewport;
+    g_color = v_color[0];
+    g_distance = 0.0;
+    g_offset = half_width;
+    gl_Position = vec4(p0.xy + offset * p0.w, p0.zw);
+    EmitVertex();
+    g_offset = -half_width;
+    gl_Position = vec4(p0.xy - offset * p0.w, p0.zw);
+    EmitVertex();
+    g_color = v_color[1];
+    g_distance = length_px;
+    g_offset = half_width;
+    gl_Position = vec4(p1.xy + offset * p1.w, p1.zw);
+    EmitVertex();
+    g_offset = -half_width;
+    gl_Position = vec4(p1.xy - offset * p1.w, p1.zw);
+    EmitVertex();
+    EndPrimitive();
+}
+"""
+
+LINE_FRAGMENT_SHADER = """
+#version 330 core
+uniform vec3 u_color;
+uniform float u_width;
+uniform int u_stipple;
+uniform float u_stipple_factor;
+in vec3 g_color;
+noperspective in float g_distance;
+noperspective in float g_offset;
+out vec4 frag_color;
+void main() {
+    // Mesmo padrão de 16 bits de glLineStipple, contado em pixels desde o início do segmento
+    if (u_stipple != 0) {
+        int bit = int(mod(floor(g_distance / u_stipple_factor), 16.0));
+        if (((u_stipple >> bit) & 1) == 0) {
+            discard;
+        }
+    }
+    // Fração do pixel coberta pela linha: borda suavizada de um pixel
+    float coverage = clamp(0.5 * u_width + 0.5 - abs(g_offset), 0.0, 1.0);
+    // Fora da linha não escreve profundidade, para não esconder linhas vizinhas
+    if (coverage <= 0.0) {
+        discard;
+    }
+    frag_color = vec4(g_color * u_color, coverage);
+}
+"""
+
+SURFACE_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec3 a_normal;
+uniform mat4 u_mvp;
+uniform mat4 u_modelview;
+uniform mat3 u_normal_matrix;
+out vec3 v_position;
+out vec3 v_normal;
+void main() {
+    v_position = (u_modelview * vec4(a_position, 1.0)).xyz;
+    v_normal = u_normal_matrix * a_normal;
+    gl_Position = u_mvp * vec4(a_position, 1.0);
+}
+"""
+
+SURFACE_FRAGMENT_SHADER = """
+#version 330 core
+uniform vec3 u_color;
+uniform vec3 u_light;
+uniform float u_ambient;
+in vec3 v_position;
+in vec3 v_normal;
+out vec4 frag_color;
+void main() {
+    // Difusa por pixel com as duas faces iluminadas, como GL_LIGHT_MODEL_TWO_SIDE
+    vec3 normal = normalize(v_normal);
+    if (!gl_FrontFacing) {
+        normal = -normal;
+    }
+    float diffuse = max(dot(normal, normalize(u_light - v_position)), 0.0);
+    frag_color = vec4(u_color * min(u_ambient + diffuse, 1.0), 1.0);
+}
+"""
+
+TEXT_VERTEX_SHADER = """
+#version 330 core
+layout(location = 0) in vec2 a_position;
+layout(location = 1) in vec2 a_uv;
+layout(location = 2) in vec3 a_color;
+uniform vec4 u_viewport;
+out vec2 v_uv;
+out vec3 v_color;
+void main() {
+    v_uv = a_uv;
+    v_color = a_color;
+    gl_Position = vec4((a_position - u_viewport.xy) / u_viewport.zw * 2.0 - 1.0, 0.0, 1.0);
+}
+"""
+
+TEXT_FRAGMENT_SHADER = """
+#version 330 core
+uniform sampler2D u_atlas;
+in vec2 v_uv;
+in vec3 v_color;
+out vec4 frag_color;
+void main() {
+    frag_color = vec4(v_color, 1.0) * texture(u_atlas, v_uv);
+}
+"""
+
+PROGRAM_SOURCES = {
+    "line": (LINE_VERTEX_SHADER, LINE_FRAGMENT_SHADER, LINE_GEOMETRY_SHADER),
+    "surface": (SURFACE_VERTEX_SHADER, SURFACE_FRAGMENT_SHADER, None),
+    "text": (TEXT_VERTEX_SHADER, TEXT_FRAGMENT_SHADER, None)
+}
+
+
+def glsl_version():
+    # (maior, menor) de GL_SHADING_LANGUAGE_VERSION, por exemplo "4.50 Mesa" -> (4, 50)
+    text = glGetString(GL_SHADING_LANGUAGE_VERSION)
+    try:
+        major, minor = text.decode().split()[0].split(".")[:2]
+        return int(major), int(minor[:2])
+    except (AttributeError, ValueError):
+        return (0, 0)
+
+
+def _matrix(values):
+    # As matrizes do camera.py são por linhas: o GL transpõe ao receber (transpose=GL_TRUE)
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+class ShaderRenderer:
+    # Pipeline programável (GLSL 330 core): câmera em uniformes, linhas largas suavizadas e
+    # tracejadas no geometry shader, iluminação no fragment shader e texto do atlas em triângulos.
+    # Os programas ficam no cache do grupo de contextos; VAOs e buffers de streaming são do widget.
+    def __init__(self):
+        self.programs = None  # nome -> (programa, {uniforme: posição})
+        self.vaos = OrderedDict()  # buffer compartilhado -> (vao, vbo)
+        self.streams = {}  # layout -> (vao, vbo)
+        self.viewport = (0, 0, 1, 1)
+
+    def initialize(self):
+        # False quando o contexto não tem GLSL 3.30 ou a compilação falha: o widget fica no pipeline fixo
+        if os.environ.get(FIXED_PIPELINE_ENV) or glsl_version() < MIN_GLSL_VERSION:
+            return False
+        resources = current_resources()
+        programs = {}
+        try:
+            for name, sources in PROGRAM_SOURCES.items():
+                program = resources.program(*sources)
+                # Uniformes não usados pelo driver ficam com -1, que o glUniform ignora
+                names = re.findall(r"uniform \w+ (\w+);", "".join(source or "" for source in sources))
+                programs[name] = (program, {uniform: glGetUniformLocation(program, uniform) for uniform in names})
+        except (GLError, RuntimeError):
+            return False
+        self.programs = programs
+        return True
+
+    def begin_frame(self):
+        self.viewport = tuple(int(v) for v in glGetIntegerv(GL_VIEWPORT))
+
+    def _use(self, name):
+        program, uniforms = self.programs[name]
+        glUseProgram(program)
+        return uniforms
+
+    def _buffer_vao(self, buffer):
+        # VAO deste contexto apontando para o buffer compartilhado; refeito se o buffer foi reenviado
+        entry = self.vaos.get(buffer)
+        if entry is not None and entry[1] == buffer.vbo:
+            self.vaos.move_to_end(buffer)
+            return entry[0]
+        if entry is not None:
+            glDeleteVertexArrays(1, [entry[0]])
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        glBindBuffer(GL_ARRAY_BUFFER, buffer.vbo)
+        stride = 24 if buffer.has_normals else 12
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, stride, None)
+        if buffer.has_normals:
+            glEnableVertexAttribArray(1)
+            glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(12))
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, buffer.ebo)
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.vaos[buffer] = (vao, buffer.vbo)
+        while len(self.vaos) > VAO_CACHE_SIZE:
+            _, (evicted, _) = self.vaos.popitem(last=False)
+            glDeleteVertexArrays(1, [evicted])
+        return vao
+
+    def _stream(self, layout, data):
+        # Envia vértices que mudam a cada quadro e deixa o VAO correspondente ligado
+        stride, attributes = STREAM_LAYOUTS[layout]
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        stream = self.streams.get(layout)
+        if stream is None:
+            vao = glGenVertexArrays(1)
+            vbo = glGenBuffers(1)
+            glBindVertexArray(vao)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            for location, size, offset in attributes:
+                glEnableVertexAttribArray(location)
+                glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+            self.streams[layout] = (vao, vbo)
+        else:
+            glBindVertexArray(stream[0])
+            glBindBuffer(GL_ARRAY_BUFFER, stream[1])
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _begin_lines(self, mvp, color, width, stipple, factor):
+        uniforms = self._use("line")
+        glUniformMatrix4fv(uniforms["u_mvp"], 1, GL_TRUE, _matrix(mvp))
+        glUniform2f(uniforms["u_viewport"], self.viewport[2], self.viewport[3])
+        glUniform1f(uniforms["u_width"], width)
+        glUniform3f(uniforms["u_color"], *color)
+        glUniform1i(uniforms["u_stipple"], stipple)
+        glUniform1f(uniforms["u_stipple_factor"], factor)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    def _end(self):
+        glBindVertexArray(0)
+        glUseProgram(0)
+        glDisable(GL_BLEND)
+
+    def draw_lines(self, buffer, mvp, color=(1.0, 1.0, 1.0), width=1.0, stipple=0, factor=1):
+        # Arestas de um buffer compartilhado (índices de GL_LINES)
+        if not buffer.index_count:
+            return
+        self._begin_lines(mvp, color, width, stipple, factor)
+        glBindVertexArray(self._buffer_vao(buffer))
+        # Sem array de cores: o atributo fica constante em branco e a cor vem do uniforme
+        glVertexAttrib3f(2, 1.0, 1.0, 1.0)
+        glDrawElements(GL_LINES, buffer.index_count, GL_UNSIGNED_INT, None)
+        self._end()
+
+    def draw_segments(self, points, mvp, colors=None, color=(1.0, 1.0, 1.0), width=1.0, stipple=0, factor=1):
+        # Pares de pontos (2D ou 3D) enviados na hora, com cor opcional por vértice
+        points = np.asarray(points, dtype=np.float32)
+        if not len(points):
+            return
+        data = np.zeros((len(points), 6), dtype=np.float32)
+        data[:, :points.shape[1]] = points
+        data[:, 3:] = 1.0 if colors is None else colors
+        self._begin_lines(mvp, color, width, stipple, factor)
+        self._stream("line", data)
+        glDrawArrays(GL_LINES, 0, len(data))
+        self._end()
+
+    def draw_surface(self, buffer, mvp, modelview, color):
+        # Triângulos com normais intercaladas, empurrados para trás para não cobrir as arestas
+        if not buffer.index_count:
+            return
+        uniforms = self._use("surface")
+        glUniformMatrix4fv(uniforms["u_mvp"], 1, GL_TRUE, _matrix(mvp))
+        glUniformMatrix4fv(uniforms["u_modelview"], 1, GL_TRUE, _matrix(modelview))
+        normal_matrix = np.linalg.inv(np.asarray(modelview, dtype=np.float64)[:3, :3]).T
+        glUniformMatrix3fv(uniforms["u_normal_matrix"], 1, GL_TRUE, _matrix(normal_matrix))
+        glUniform3f(uniforms["u_color"], *color)
+        glUniform3f(uniforms["u_light"], *LIGHT_POSITION)
+        glUniform1f(uniforms["u_ambient"], AMBIENT)
+        glEnable(GL_POLYGON_OFFSET_FILL)
+        glPolygonOffset(1.0, 1.0)
+        glBindVertexArray(self._buffer_vao(buffer))
+        glDrawElements(GL_TRIANGLES, buffer.index_count, GL_UNSIGNED_INT, None)
+        glDisable(GL_POLYGON_OFFSET_FILL)
+        self._end()
+
+    def draw_labels(self, batch, view, projection):
+        # Rótulos de um LabelBatch projetados com as mesmas matrizes dos uniformes
+        if not len(batch.owners):
+            return
+        # screen_vertices espera matrizes em ordem de coluna, como as do glGetDoublev
+        vertices, keep = batch.screen_vertices(np.asarray(view).T, np.asarray(projection).T, self.viewport)
+        if not len(vertices):
+            return
+        quads = (np.arange(len(vertices) // 4)[:, None] * 4 + QUAD_TRIANGLES).ravel()
+        data = np.hstack([vertices, batch.uvs[keep], batch.colors[keep]])[quads]
+        uniforms = self._use("text")
+        glUniform4f(uniforms["u_viewport"], *self.viewport)
+        glUniform1i(uniforms["u_atlas"], 0)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, batch.upload())
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        self._stream("text", data)
+        glDrawArrays(GL_TRIANGLES, 0, len(data))
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glEnable(GL_DEPTH_TEST)
+        self._end()
+
+    def release(self):
+        # Precisa do contexto do widget; os programas são compartilhados e ficam no cache
+        for vao, _ in self.vaos.values():
+            glDeleteVertexArrays(1, [vao])
+        for vao, vbo in self.streams.values():
+            glDeleteVertexArrays(1, [vao])
+            glDeleteBuffers(1, [vbo])
+        self.vaos.clear()
+        self.streams = {}
+        self.programs = None
@@ -0,0 +1,68 @@
+from mesh import build_mesh
+
+# Geometria das formas e textos dos rótulos, sem dependência de Qt ou OpenGL:
+# compartilhados pelo Geometry3D e pelo renderizador por software
+
+
+def compute_shape_data(shape: str, params: dict, mesh=None) -> dict:
+    # Visão em listas/dicionários da malha (formato usado pelos rótulos e pelo foco em faces)
+    if mesh is None:
+        mesh = build_mesh(shape, params)
+    if mesh is None:
+        return {}
+    if not mesh.face_names:
+        # Malha importada: sem faces nomeadas nem rótulos; evita listas com milhões de itens
+        return {"vertices": mesh.vertices, "edges": mesh.edges, "faces": {}, "edge_info": {}}
+    faces = {
+        name: {
+            "vertices": list(polygon),
+            "normal": normal.tolist(),
+            "center": center.tolist()
+        }
+        for name, polygon, normal, center in zip(mesh.face_names, mesh.face_polygons,
+                                                 mesh.face_normals, mesh.face_centroids)
+    }
+    return {
+        "vertices": mesh.vertices.tolist(),
+        "edges": [tuple(edge) for edge in mesh.edges.tolist()],
+        "faces": faces,
+        "edge_info": mesh.edge_groups
+    }
+
+
+def update_shape_data(shape_data: dict, mesh) -> dict:
+    # Mesma topologia com vértices novos (Mesh.with_vertices): as listas de arestas e os
+    # polígonos das faces são reaproveitados, só posições, normais e centros são refeitos
+    if not mesh.face_names:
+        return dict(shape_data, vertices=mesh.vertices, edge_info=mesh.edge_groups)
+    faces = {
+        name: dict(shape_data["faces"][name], normal=normal.tolist(), center=center.tolist())
+        for name, normal, center in zip(mesh.face_names, mesh.face_normals, mesh.face_centroids)
+    }
+    return dict(shape_data, vertices=mesh.vertices.tolist(), faces=faces, edge_info=mesh.edge_groups)
+
+
+def format_label_value(value):
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def build_labels(shape_data, properties, format_value=format_label_value):
+    # Lista de (âncora xyz, texto, tamanho da fonte, cor rgb) com os rótulos de faces e arestas
+    vertices = shape_data.get("vertices", [])
+    faces = shape_data.get("faces", {})
+    edge_info = shape_data.get("edge_info", {})
+    face_areas = properties.get("face_areas", {})
+    labels = []
+    for face_name, face_data in faces.items():
+        area = format_value(face_areas.get(face_name, 0))
+        labels.append((face_data["center"], f"{face_name}: {area} u²", 12, (1.0, 1.0, 0.0)))
+    for edge_name, edge_data in edge_info.items():
+        edges = edge_data["edges"]
+        if edges:
+            v1 = vertices[edges[0][0]]
+            v2 = vertices[edges[0][1]]
+            midpoint = [(v1[i] + v2[i]) / 2 for i in range(3)]
+            labels.append((midpoint, format_value(edge_data["length"]), 10, (0.0, 1.0, 1.0)))
+    return labels
@@ -0,0 +1,238 @@
+import argparse
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import camera
+from geometry_calculator import GeometryCalculator
+from shape_data import compute_shape_data, build_labels
+from mesh import CURVED_SHAPES, build_mesh, bounding_radius, segments_for_radius
+
+# Renderizador por software (NumPy) para miniaturas sem GPU nem tela. Reproduz o que o
+# Geometry3D desenha: arestas brancas de 2 px, linha de altura tracejada e rótulos.
+
+DEFAULT_SIZE = 256
+EDGE_COLOR = (255, 255, 255)
+HEIGHT_LINE_COLOR = (255, 0, 0)
+FACE_COLOR = (40, 40, 48)
+# Mesmo padrão de glLineStipple(1, 0x00FF)
+HEIGHT_LINE_STIPPLE = 0x00FF
+# Afasta levemente as faces preenchidas para as arestas ficarem visíveis (como glPolygonOffset)
+FILL_DEPTH_BIAS = 1e-4
+
+_app = None
+_atlas = None
+_atlas_alpha = None
+
+
+def label_atlas():
+    # O atlas de glifos usa QPainter; em nós sem tela, a plataforma "offscreen" do Qt basta.
+    # Qt só é importado quando há rótulos a desenhar.
+    global _app, _atlas, _atlas_alpha
+    if _atlas is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtGui import QGuiApplication
+        from glyph_atlas import GlyphAtlas
+        if QGuiApplication.instance() is None:
+            _app = QGuiApplication([])
+        _atlas = GlyphAtlas("Helvetica", (12, 10))
+        _atlas_alpha = _atlas.pixels()[:, :, 3].astype(np.float32) / 255
+    return _atlas, _atlas_alpha
+
+
+class SoftwareRenderer:
+    def __init__(self, width=DEFAULT_SIZE, height=DEFAULT_SIZE, background=(0, 0, 0)):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.color = np.empty((height, width, 3), dtype=np.uint8)
+        self.depth = np.empty((height, width), dtype=np.float32)
+        self.clear()
+
+    def clear(self):
+        self.color[:] = self.background
+        self.depth[:] = np.inf
+
+    def _plot(self, x, y, z, color):
+        # Escreve amostras (coordenadas de janela, y para cima) com teste de profundidade
+        px = np.floor(x).astype(np.int64)
+        py = np.floor(y).astype(np.int64)
+        keep = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height) & (z >= 0) & (z <= 1)
+        px, py, z = px[keep], py[keep], z[keep]
+        colors = np.broadcast_to(np.asarray(color, dtype=np.uint8), (len(keep), 3))[keep]
+        index = (self.height - 1 - py) * self.width + px
+        # Entre amostras do mesmo pixel, fica a mais próxima
+        order = np.lexsort((z, index))
+        index, z, colors = index[order], z[order], colors[order]
+        first = np.ones(len(index), dtype=bool)
+        first[1:] = index[1:] != index[:-1]
+        index, z, colors = index[first], z[first], colors[first]
+        depth = self.depth.reshape(-1)
+        closer = z <= depth[index]
+        depth[index[closer]] = z[closer]
+        self.color.reshape(-1, 3)[index[closer]] = colors[closer]
+
+    def draw_lines(self, starts, ends, color, width=2, stipple=None):
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+        if not len(starts):
+            return
+        delta = ends - starts
+        major = np.maximum(np.abs(delta[:, 0]), np.abs(delta[:, 1]))
+        steps = np.ceil(major).astype(np.int64) + 1
+        segment = np.repeat(np.arange(len(starts)), steps)
+        offsets = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+        t = offsets / np.maximum(steps - 1, 1)[segment]
+        points = starts[segment] + delta[segment] * t[:, None]
+        if stipple is not None:
+            on = (stipple >> (offsets % 16)) & 1 == 1
+            points, segment = points[on], segment[on]
+        # Linhas largas: repete as amostras deslocadas no eixo menor, como o rasterizador GL
+        x_major = np.abs(delta[segment, 0]) >= np.abs(delta[segment, 1])
+        for shift in range(width):
+            offset = shift - (width - 1) / 2
+            self._plot(points[:, 0] + np.where(x_major, 0, offset),
+                       points[:, 1] + np.where(x_major, offset, 0),
+                       points[:, 2], color)
+
+    def draw_triangles(self, a, b, c, color, depth_bias=0.0):
+        a, b, c = (np.asarray(v, dtype=np.float64).reshape(-1, 3) for v in (a, b, c))
+        for p0, p1, p2 in zip(a, b, c):
+            x_min = max(int(np.floor(min(p0[0], p1[0], p2[0]))), 0)
+            x_max = min(int(np.ceil(max(p0[0], p1[0], p2[0]))), self.width - 1)
+            y_min = max(int(np.floor(min(p0[1], p1[1], p2[1]))), 0)
+            y_max = min(int(np.ceil(max(p0[1], p1[1], p2[1]))), self.height - 1)
+            area = (p1[0] - p0[0]) * (p2[1] - p0[1]) - (p2[0] - p0[0]) * (p1[1] - p0[1])
+            if x_min > x_max or y_min > y_max or abs(area) < 1e-12:
+                continue
+            xs, ys = np.meshgrid(np.arange(x_min, x_max + 1) + 0.5, np.arange(y_min, y_max + 1) + 0.5)
+            w0 = ((p1[0] - xs) * (p2[1] - ys) - (p2[0] - xs) * (p1[1] - ys)) / area
+            w1 = ((p2[0] - xs) * (p0[1] - ys) - (p0[0] - xs) * (p2[1] - ys)) / area
+            w2 = 1 - w0 - w1
+            inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+            z = w0 * p0[2] + w1 * p1[2] + w2 * p2[2] + depth_bias
+            self._plot(xs[inside], ys[inside], z[inside], color)
+
+    def draw_text(self, x, y, text, size, color):
+        # Mesmo posicionamento do LabelBatch: origem na linha de base, em pixels inteiros
+        atlas, alpha_image = label_atlas()
+        offsets, uvs = atlas.layout(text, size)
+        atlas_height, atlas_width = alpha_image.shape
+        x, y = int(np.floor(x)), int(np.floor(y))
+        color = np.asarray(color, dtype=np.float32)
+        for quad, quad_uv in zip(offsets.reshape(-1, 4, 2), uvs.reshape(-1, 4, 2)):
+            (x0, y0), (x1, y1) = quad[0].astype(int), quad[2].astype(int)
+            src_x = int(round(quad_uv[0, 0] * atlas_width))
+            src_y = int(round(quad_uv[2, 1] * atlas_height))
+            top = self.height - (y + y1)
+            left = x + x0
+            glyph = alpha_image[src_y:src_y + (y1 - y0), src_x:src_x + (x1 - x0)]
+            # Recorta o glifo nas bordas da imagem
+            r0, c0 = max(0, -top), max(0, -left)
+            r1 = min(glyph.shape[0], self.height - top)
+            c1 = min(glyph.shape[1], self.width - left)
+            if r0 >= r1 or c0 >= c1:
+                continue
+            alpha = glyph[r0:r1, c0:c1, None]
+            target = self.color[top + r0:top + r1, left + c0:left + c1]
+            target[:] = (target * (1 - alpha) + color * alpha).astype(np.uint8)
+
+
+def view_matrix(shape_data, face=None, view=None):
+    if face is not None and face in shape_data.get("faces", {}):
+        return camera.face_view(shape_data["faces"][face])
+    view = dict(camera.DEFAULT_VIEW, **(view or {}))
+    return camera.orbit_view(view["x_rot"], view["y_rot"], view["zoom"], view["x_offset"], view["y_offset"])
+
+
+def render_shape(shape, params, width=DEFAULT_SIZE, height=DEFAULT_SIZE, face=None, view=None,
+                 labels=True, fill=False, calculator=GeometryCalculator):
+    segments = None
+    if shape in CURVED_SHAPES:
+        # Mesmo critério do Geometry3D: detalhe conforme o tamanho da forma na imagem
+        distance = camera.FACE_CAMERA_DISTANCE if face else -dict(camera.DEFAULT_VIEW, **(view or {}))["zoom"]
+        segments = segments_for_radius(camera.projected_radius(bounding_radius(shape, params), distance, height))
+    mesh = build_mesh(shape, params, segments)
+    if mesh is None:
+        raise ValueError(f"Forma desconhecida: {shape}")
+    shape_data = compute_shape_data(shape, params, mesh)
+    projection = camera.perspective(camera.FOV_Y, width / height, camera.NEAR_PLANE, camera.FAR_PLANE)
+    mvp = projection @ view_matrix(shape_data, face, view)
+    renderer = SoftwareRenderer(width, height)
+    window, inside = camera.project(mesh.vertices, mvp, width, height)
+    if fill:
+        corners = window[mesh.triangles]
+        renderer.draw_triangles(corners[:, 0], corners[:, 1], corners[:, 2], FACE_COLOR, FILL_DEPTH_BIAS)
+    edges = mesh.edges
+    # Descarta arestas com vértices atrás da câmera; o resto é recortado por pixel
+    ahead = (window[edges[:, 0], 2] < 1) & (window[edges[:, 1], 2] < 1)
+    renderer.draw_lines(window[edges[ahead, 0]], window[edges[ahead, 1]], EDGE_COLOR)
+    if shape in ("pyramid", "cone", "frustum"):
+        ends, _ = camera.project([[0, 0, 0], [0, params["height"], 0]], mvp, width, height)
+        renderer.draw_lines(ends[:1], ends[1:], HEIGHT_LINE_COLOR, stipple=HEIGHT_LINE_STIPPLE)
+    if labels:
+        properties = calculator.calculate_properties(shape, params)
+        label_list = build_labels(shape_data, properties)
+        anchors, visible = camera.project([anchor for anchor, _, _, _ in label_list], mvp, width, height)
+        for (anchor, text, size, color), point, show in zip(label_list, anchors, visible):
+            if show:
+                renderer.draw_text(point[0], point[1], text, size, [c * 255 for c in color])
+    return renderer.color
+
+
+def write_png(path, rgb):
+    # PNG RGB de 8 bits usando apenas a biblioteca padrão
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, -1)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as stream:
+        stream.write(b"\x89PNG\r\n\x1a\n")
+        stream.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        stream.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        stream.write(chunk(b"IEND", b""))
+
+
+def _export_job(job):
+    path, shape, params, options = job
+    write_png(path, render_shape(shape, params, **options))
+    return path
+
+
+def export_thumbnails(jobs, output_dir, width=DEFAULT_SIZE, height=DEFAULT_SIZE, labels=True,
+                      workers=None, chunk_size=16):
+    # jobs: iterável de (nome, forma, parâmetros); gera um PNG por forma, distribuído entre processos
+    os.makedirs(output_dir, exist_ok=True)
+    options = {"width": width, "height": height, "labels": labels}
+    tasks = ((os.path.join(output_dir, f"{name}.png"), GeometryCalculator.normalize_shape(shape), params, options)
+             for name, shape, params in jobs)
+    if workers == 1:
+        return [_export_job(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_export_job, tasks, chunksize=chunk_size))
+
+
+def main(argv=None):
+    from batch_cli import detect_format, read_rows
+    parser = argparse.ArgumentParser(description="Gera miniaturas PNG das formas sem GPU nem tela.")
+    parser.add_argument("input", help="arquivo CSV ou JSON por linha com shape,width,height,depth")
+    parser.add_argument("output_dir", help="diretório de saída das imagens")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="largura e altura em pixels")
+    parser.add_argument("--workers", type=int, help="processos paralelos (padrão: todos os núcleos)")
+    parser.add_argument("--no-labels", action="store_true", help="não desenha os rótulos")
+    args = parser.parse_args(argv)
+    with open(args.input, encoding="utf-8", newline="") as stream:
+        jobs = ((f"thumb_{index:06d}", shape, {"width": float(w), "height": float(h), "depth": float(d)})
+                for index, (_, shape, w, h, d) in enumerate(read_rows(stream, detect_format(args.input))))
+        paths = export_thumbnails(jobs, args.output_dir, args.size, args.size, not args.no_labels, args.workers)
+    print(f"{len(paths)} miniaturas geradas.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
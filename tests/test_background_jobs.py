@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Roda num processo à parte: o QCoreApplication não pode ser recriado dentro do pytest
+SCRIPT = """
+import threading, time
+from PyQt6.QtCore import QCoreApplication
+from background_jobs import JobScheduler
+app = QCoreApplication([])
+jobs = JobScheduler()
+results, threads, errors = [], [], []
+
+def slow(value):
+    time.sleep(0.05)
+    return value
+
+def deliver(value):
+    results.append(value)
+    threads.append(threading.current_thread() is threading.main_thread())
+
+# Pedidos seguidos no mesmo canal: só o último é entregue
+for value in range(5):
+    jobs.submit("params", slow, value, callback=deliver)
+jobs.submit("other", slow, "x", callback=deliver)
+jobs.submit("failing", lambda: 1 / 0, error_callback=lambda exc: errors.append(type(exc).__name__))
+jobs.submit("cancelled", slow, "never", callback=deliver)
+jobs.cancel("cancelled")
+jobs.wait()
+app.processEvents()
+print(sorted(map(str, results)), all(threads), errors, jobs.is_pending("params"), len(jobs.retired))
+"""
+
+
+def test_only_latest_job_per_channel_is_delivered_on_gui_thread():
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=PACKAGE_DIR, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == "['4', 'x'] True ['ZeroDivisionError'] False 0"
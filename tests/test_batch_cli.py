@@ -0,0 +1,67 @@
+import io
+import json
+import math
+import zipfile
+import pytest
+from batch_cli import main, process_stream
+from mesh_io import MeshArchive
+from geometry_calculator import GeometryCalculator
+
+
+def test_csv_stream_preserves_order_across_chunks():
+    source = io.StringIO("shape,width,height,depth\n"
+                         "parallelepiped,2,3,4\n"
+                         "Pirâmide,2,3,4\n"
+                         "paralelepípedo,1,1,1\n")
+    target = io.StringIO()
+    assert process_stream(source, target, "csv", "csv", chunk_size=2) == 3
+    lines = target.getvalue().splitlines()
+    assert lines[0].startswith("shape,width,height,depth,volume")
+    assert [line.split(",")[0] for line in lines[1:]] == ["parallelepiped", "pyramid", "parallelepiped"]
+    assert float(lines[1].split(",")[4]) == 24.0
+
+
+def test_jsonl_output_matches_calculator():
+    source = io.StringIO('{"shape": "pyramid", "width": 2, "height": 3, "depth": 4}\n')
+    target = io.StringIO()
+    process_stream(source, target, "jsonl", "jsonl")
+    record = json.loads(target.getvalue())
+    expected = GeometryCalculator.calculate_pyramid_properties({"width": 2, "height": 3, "depth": 4})
+    assert math.isclose(record["total_area"], expected["total_area"])
+    assert math.isclose(record["geratriz_left_right"], expected["geratriz_left_right"])
+    assert "area_Topo" not in record
+
+
+def test_missing_field_names_column_and_line():
+    source = io.StringIO('{"shape": "pyramid", "width": 2, "height": 3, "depth": 4}\n{"width": 2}\n')
+    with pytest.raises(ValueError, match="linha 2: campo 'shape' ausente"):
+        process_stream(source, io.StringIO(), "jsonl", "jsonl")
+    source = io.StringIO("shape,height,depth\npyramid,3,4\n")
+    with pytest.raises(ValueError, match="linha 2: campo 'width' ausente"):
+        process_stream(source, io.StringIO(), "csv", "csv")
+
+
+def test_meshes_exported_to_archive(tmp_path):
+    source = io.StringIO("shape,width,height,depth\npyramid,2,3,4\nparallelepiped,1,1,1\n")
+    with MeshArchive(str(tmp_path / "malhas.zip")) as archive:
+        process_stream(source, io.StringIO(), "csv", "csv", chunk_size=1, archive=archive)
+    with zipfile.ZipFile(tmp_path / "malhas.zip") as archive:
+        assert archive.namelist() == ["000000_pyramid.stl", "000001_parallelepiped.stl"]
+
+
+def test_rejects_non_positive_worker_chunk_size(tmp_path):
+    source = tmp_path / "in.csv"
+    source.write_text("shape,width,height,depth\n")
+    with pytest.raises(SystemExit) as error:
+        main([str(source), str(tmp_path / "out.csv"), "--workers", "2", "--worker-chunk-size", "-5"])
+    assert error.value.code == 2
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_unreadable_files_report_error(tmp_path, capsys):
+    assert main([str(tmp_path / "nao_existe.csv"), "-"]) == 1
+    assert capsys.readouterr().err.startswith("Erro: ")
+    source = tmp_path / "in.csv"
+    source.write_text("shape,width,height,depth\n")
+    assert main([str(source), str(tmp_path / "sem_pasta" / "out.csv")]) == 1
+    assert capsys.readouterr().err.startswith("Erro: ")
@@ -0,0 +1,31 @@
+from benchmarks.run import check_results, metric_limits
+
+THRESHOLDS = {
+    "default": {"max_regression": 0.25, "min_delta_ms": 1.0},
+    "metrics": {"import": {"min_delta_ms": 5.0}, "import.main": {"max_ms": 300}}
+}
+
+
+def run(results, passed=True, machine="kiosk"):
+    return {"machine": machine, "passed": passed, "results": results}
+
+
+def test_limits_from_most_specific_group():
+    assert metric_limits("import.main", THRESHOLDS) == {"max_regression": 0.25, "min_delta_ms": 5.0, "max_ms": 300}
+    assert metric_limits("cold_start", THRESHOLDS) == {"max_regression": 0.25, "min_delta_ms": 1.0}
+
+
+def test_regression_against_median_of_passed_runs_on_same_machine():
+    history = [run({"cold_start": 100.0}), run({"cold_start": 110.0}), run({"cold_start": 500.0}, passed=False),
+               run({"cold_start": 10.0}, machine="outra")]
+    assert check_results({"cold_start": 130.0}, history, THRESHOLDS, "kiosk") == []
+    assert len(check_results({"cold_start": 140.0}, history, THRESHOLDS, "kiosk")) == 1
+    # Sem histórico na máquina só valem os limites absolutos
+    assert check_results({"cold_start": 140.0}, history, THRESHOLDS, "nova") == []
+    assert len(check_results({"import.main": 301.0}, [], THRESHOLDS, "kiosk")) == 1
+
+
+def test_small_absolute_changes_are_ignored():
+    history = [run({"import.numpy": 10.0})]
+    assert check_results({"import.numpy": 14.0}, history, THRESHOLDS, "kiosk") == []
+    assert len(check_results({"import.numpy": 16.0}, history, THRESHOLDS, "kiosk")) == 1
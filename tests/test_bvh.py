@@ -0,0 +1,63 @@
+import warnings
+import numpy as np
+import camera
+from bvh import BVH
+from mesh import build_mesh
+from scene import Scene, unit_mesh
+
+PARAMS = {"width": 2, "height": 3, "depth": 1}
+
+
+def test_matches_brute_force():
+    mesh = build_mesh("sphere", PARAMS, 48)
+    bvh = BVH(mesh.vertices, mesh.triangles, leaf_size=4, branching=2)
+    everything = np.arange(len(mesh.triangles))
+    rng = np.random.default_rng(7)
+    hits = 0
+    for _ in range(50):
+        direction = rng.normal(size=3)
+        direction /= np.linalg.norm(direction)
+        origin = -3 * direction + rng.normal(size=3) * 0.5
+        hit = bvh.intersect(origin, direction)
+        t = bvh.intersect_triangles(everything, origin, direction)
+        if hit is None:
+            assert not np.isfinite(t).any()
+        else:
+            hits += 1
+            assert np.isclose(hit[1], t.min())
+    assert hits > 10
+    assert bvh.intersect([5, 5, 5], [1, 0, 0]) is None
+
+
+def test_ray_through_pixel_hits_face_under_it():
+    mesh = build_mesh("parallelepiped", {"width": 2, "height": 3, "depth": 4})
+    mvp = camera.perspective(camera.FOV_Y, 1, camera.NEAR_PLANE, camera.FAR_PLANE) @ camera.orbit_view(0, 0, -10)
+    window, _ = camera.project([[0.5, 0.5, 2]], mvp, 200, 200)
+    origin, direction = camera.unproject_ray(window[0, 0], window[0, 1], mvp, 200, 200)
+    triangle, t = BVH(mesh.vertices, mesh.triangles).intersect(origin, direction)
+    assert mesh.face_names[mesh.triangle_faces[triangle]] == "Frente"
+    np.testing.assert_allclose(origin + t * direction, [0.5, 0.5, 2], atol=1e-6)
+
+
+def test_grazing_ray_on_box_plane_without_warnings():
+    # Origem sobre o plano x = 1 da caixa e direção sem componente x: 0·inf no teste de placas
+    mesh = build_mesh("parallelepiped", {"width": 2, "height": 3, "depth": 4})
+    bvh = BVH(mesh.vertices, mesh.triangles)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        triangle, t = bvh.intersect([1, 5, .5], [0, -1, 0])
+        assert bvh.intersect([1, 5, .5], [-0.0, 1, 0]) is None
+    assert mesh.face_names[mesh.triangle_faces[triangle]] == "Topo"
+    assert np.isclose(t, 3.5)
+
+
+def test_scene_world_triangles():
+    scene = Scene()
+    scene.add("pyramid", PARAMS, position=(10, 0, 0))
+    scene.add_many("parallelepiped", [(1, 1, 1)] * 2, [(0, 0, 0), (0, 5, 0)])
+    vertices, triangles, owners, local = scene.world_triangles()
+    assert len(triangles) == 2 * 12 + 6
+    triangle, _ = BVH(vertices, triangles).intersect([0, 10, 0], [0, -1, 0])
+    assert owners[triangle] == 2
+    box = unit_mesh("parallelepiped")
+    assert box.face_names[box.triangle_faces[local[triangle]]] == "Topo"
@@ -0,0 +1,26 @@
+import numpy as np
+import camera
+
+
+def test_quaternion_round_trip():
+    for angles in [(30, 30), (170, -80), (0, 180), (-90, 45)]:
+        rotation = (camera.rotate(angles[0], 1, 0, 0) @ camera.rotate(angles[1], 0, 1, 0))[:3, :3]
+        q = camera.quaternion_from_matrix(rotation)
+        np.testing.assert_allclose(camera.quaternion_matrix(q), rotation, atol=1e-12)
+
+
+def test_interpolate_view_between_orbit_and_face():
+    start = camera.orbit_view(30, 30, -10)
+    end = camera.face_view({"center": [0, 0, 2], "normal": [0, 0, 1]})
+    np.testing.assert_allclose(camera.interpolate_view(start, end, 0), start, atol=1e-12)
+    np.testing.assert_allclose(camera.interpolate_view(start, end, 1), end, atol=1e-12)
+    middle = camera.interpolate_view(start, end, 0.5)
+    # Continua rígida: rotação ortonormal e câmera no meio do caminho
+    np.testing.assert_allclose(middle[:3, :3] @ middle[:3, :3].T, np.eye(3), atol=1e-12)
+    expected = (camera.camera_position(start) + camera.camera_position(end)) / 2
+    np.testing.assert_allclose(camera.camera_position(middle), expected, atol=1e-12)
+
+
+def test_slerp_takes_shortest_path():
+    q = camera.quaternion_from_matrix(camera.rotate(10, 0, 1, 0))
+    np.testing.assert_allclose(np.abs(camera.slerp(q, -q, 0.5)), np.abs(q), atol=1e-12)
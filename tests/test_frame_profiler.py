@@ -0,0 +1,36 @@
+import csv
+from frame_profiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stages_summary_and_log(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "frames.csv"
+    profiler = FrameProfiler(history=3, log_path=str(path), gpu=False, clock=clock,
+                             log_stages=("draw_shape", "draw_labels"))
+    for frame_ms in (1, 2, 3, 40):
+        profiler.begin_frame()
+        with profiler.stage("draw_shape"):
+            clock.now += frame_ms / 2000
+        with profiler.stage("draw_shape"):
+            clock.now += frame_ms / 2000
+        profiler.end_frame()
+    summary = profiler.summary()
+    # Só os três últimos quadros ficam no histórico
+    assert summary["paintGL"]["count"] == 3
+    assert abs(summary["draw_shape"]["max"] - 40) < 1e-9
+    assert abs(summary["paintGL"]["mean"] - 15) < 1e-9
+    assert profiler.histogram().sum() == 3 and profiler.histogram()[-2] == 1
+    assert profiler.overlay_lines()[0].startswith("CPU 15.00 ms")
+    profiler.close()
+    with open(path, newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert [row["frame"] for row in rows] == ["1", "2", "3", "4"]
+    assert float(rows[1]["draw_shape"]) == 2 and rows[1]["draw_labels"] == "" and rows[1]["gpu"] == ""
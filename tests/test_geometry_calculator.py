@@ -0,0 +1,55 @@
+import math
+import numpy as np
+import pytest
+from geometry_calculator import GeometryCalculator, SHAPE_DTYPE
+
+
+def test_parallelepiped_batch_matches_scalar():
+    shapes = np.array([(2, 3, 4), (1.5, 0.5, 7), (10, 10, 10)], dtype=SHAPE_DTYPE)
+    batch = GeometryCalculator.calculate_parallelepiped_properties_batch(shapes)
+    for i, row in enumerate(shapes):
+        params = {"width": row["width"], "height": row["height"], "depth": row["depth"]}
+        single = GeometryCalculator.calculate_parallelepiped_properties(params)
+        assert math.isclose(batch["volume"][i], single["volume"])
+        assert math.isclose(batch["total_area"][i], single["total_area"])
+        for face, area in single["face_areas"].items():
+            assert math.isclose(batch["face_areas"][face][i], area)
+
+
+def test_pyramid_batch_matches_scalar():
+    width = np.array([2.0, 4.0, 0.3])
+    height = np.array([3.0, 1.0, 9.0])
+    depth = np.array([4.0, 4.0, 0.7])
+    batch = GeometryCalculator.calculate_pyramid_properties_batch(width, height, depth)
+    for i in range(len(width)):
+        params = {"width": width[i], "height": height[i], "depth": depth[i]}
+        single = GeometryCalculator.calculate_pyramid_properties(params)
+        for key in ("volume", "total_area", "geratriz_front_back", "geratriz_left_right"):
+            assert math.isclose(batch[key][i], single[key])
+        for face, area in single["faces"].items():
+            assert math.isclose(batch["faces"][face][i], area)
+
+
+def test_batch_rejects_missing_dimension():
+    width = np.array([2.0, 4.0])
+    with pytest.raises(ValueError):
+        GeometryCalculator.calculate_parallelepiped_properties_batch(width, width)
+    with pytest.raises(ValueError):
+        GeometryCalculator.calculate_pyramid_properties_batch(width, depth=width)
+
+
+def test_curved_solids_closed_form():
+    params = {"width": 2.0, "height": 3.0, "depth": 1.0}
+    cylinder = GeometryCalculator.calculate_properties("Cilindro", params)
+    assert math.isclose(cylinder["volume"], 3 * math.pi)
+    assert math.isclose(cylinder["total_area"], 2 * math.pi + 6 * math.pi)
+    cone = GeometryCalculator.calculate_properties("cone", params)
+    assert math.isclose(cone["geratriz"], math.sqrt(10))
+    assert math.isclose(cone["total_area"], math.pi + math.pi * math.sqrt(10))
+    # Tronco com topo de diâmetro zero é o próprio cone
+    frustum = GeometryCalculator.calculate_properties("Tronco de Cone", dict(params, depth=0.0))
+    assert math.isclose(frustum["volume"], cone["volume"])
+    assert math.isclose(frustum["total_area"], cone["total_area"])
+    sphere = GeometryCalculator.calculate_properties("Esfera", params)
+    assert math.isclose(sphere["volume"], 4 / 3 * math.pi)
+    assert math.isclose(sphere["total_area"], 4 * math.pi)
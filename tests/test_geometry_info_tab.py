@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Roda num processo à parte: o QApplication não pode ser recriado dentro do pytest
+SCRIPT = """
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+from geometry_calculator import GeometryCalculator
+from geometry_info_tab import GeometryInfoTab
+from mesh import Mesh
+# Um único triângulo: importável e exportável, mas sem volume
+mesh = Mesh([[0, 0, 0], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]])
+tab = GeometryInfoTab("mesh", {}, GeometryCalculator(), mesh)
+for label in (tab.volume_label, tab.total_area_label, tab.height_label, tab.generatriz_label):
+    print(label.text())
+print(tab.face_table.rowCount())
+"""
+
+
+def test_open_mesh_shows_area_without_volume():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-c", SCRIPT], cwd=PACKAGE_DIR, env=env, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.splitlines() == [
+        "<b>Volume:</b> indisponível (malha aberta)",
+        "<b>Área Total:</b> 0.5 unidades²",
+        "<b>Triângulos:</b> 1",
+        "<b>Centroide:</b> indisponível",
+        "0",
+    ]
+
+
+FAILING_SCRIPT = """
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+from background_jobs import JobScheduler
+from geometry_calculator import GeometryCalculator
+from geometry_info_tab import GeometryInfoTab
+
+class FailingCalculator(GeometryCalculator):
+    @staticmethod
+    def calculate_properties(shape, params):
+        if shape == "cone":
+            raise ValueError("falhou")
+        return GeometryCalculator.calculate_properties(shape, params)
+
+jobs = JobScheduler()
+tab = GeometryInfoTab("parallelepiped", {"width": 2, "height": 3, "depth": 4}, FailingCalculator(), jobs=jobs)
+jobs.wait()
+app.processEvents()
+print(tab.face_table.rowCount())
+tab.set_shape("cone", {"width": 2, "height": 3, "depth": 2})
+# Antes do resultado chegar, a caixa já saiu da tela
+print(tab.face_table.rowCount(), repr(tab.volume_label.text()))
+jobs.wait()
+app.processEvents()
+print(tab.face_table.rowCount(), tab.volume_label.text(), tab.face_mapping)
+"""
+
+
+def test_failed_calculation_clears_previous_shape():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-c", FAILING_SCRIPT], cwd=PACKAGE_DIR, env=env, capture_output=True,
+                            text=True, check=True)
+    assert result.stdout.splitlines() == ["3", "0 ''", "0 <b>Erro:</b> falhou {}"]
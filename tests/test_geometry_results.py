@@ -0,0 +1,31 @@
+import math
+import numpy as np
+from geometry_calculator import GeometryCalculator
+from geometry_results import Face, PropertiesDictView, PyramidProperties
+
+
+def test_legacy_dict_is_view_of_compact_record():
+    params = {"width": 2, "height": 3, "depth": 4}
+    for shape in ("parallelepiped", "pyramid"):
+        legacy = GeometryCalculator.calculate_properties(shape, params)
+        # Sem dicionários montados na chamada: só o adaptador em volta do registro compacto
+        assert isinstance(legacy, PropertiesDictView)
+        batch = GeometryCalculator.calculate_properties_batch(shape, [2.0], [3.0], [4.0])
+        assert list(legacy) == list(batch)
+        for key, value in batch.items():
+            if isinstance(value, dict):
+                assert list(legacy[key]) == list(value)
+                assert all(math.isclose(legacy[key][k], v[0]) for k, v in value.items())
+            else:
+                assert math.isclose(legacy[key], value[0])
+
+
+def test_table_rows_and_face_columns():
+    width = np.array([2.0, 1.0])
+    table = GeometryCalculator.calculate_properties_table("pyramid", width, 3.0, 4.0)
+    assert len(table) == 2 and table.nbytes == 2 * 8 * 8
+    row = table[0]
+    assert isinstance(row, PyramidProperties)
+    assert row == GeometryCalculator.calculate_pyramid_compact({"width": 2.0, "height": 3.0, "depth": 4.0})
+    assert row.face_area(Face.TRAS) == row.face_area(Face.FRENTE)
+    np.testing.assert_allclose(table.face_area(Face.BASE), [8.0, 4.0])
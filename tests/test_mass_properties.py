@@ -0,0 +1,68 @@
+import math
+import numpy as np
+from geometry_calculator import GeometryCalculator
+from mass_properties import mass_properties
+from mesh import build_mesh
+
+PARAMS = {"width": 2.0, "height": 3.0, "depth": 4.0}
+
+
+def test_box_matches_closed_form():
+    result = GeometryCalculator.calculate_mesh_properties(build_mesh("parallelepiped", PARAMS))
+    expected = GeometryCalculator.calculate_parallelepiped_properties(PARAMS)
+    assert math.isclose(result["volume"], expected["volume"])
+    assert math.isclose(result["total_area"], expected["total_area"])
+    for name, area in expected["face_areas"].items():
+        assert math.isclose(result["face_areas"][name], area)
+    w, h, d = PARAMS.values()
+    mass = w * h * d
+    np.testing.assert_allclose(result["centroid"], 0, atol=1e-9)
+    np.testing.assert_allclose(result["inertia"], np.diag([mass * (h**2 + d**2) / 12, mass * (w**2 + d**2) / 12,
+                                                           mass * (w**2 + h**2) / 12]), atol=1e-9)
+
+
+def test_pyramid_matches_closed_form():
+    result = GeometryCalculator.calculate_mesh_properties(build_mesh("pyramid", PARAMS), density=2.0)
+    expected = GeometryCalculator.calculate_pyramid_properties(PARAMS)
+    assert math.isclose(result["volume"], expected["volume"])
+    assert math.isclose(result["total_area"], expected["total_area"], rel_tol=1e-6)
+    w, h, d = PARAMS.values()
+    mass = 2.0 * expected["volume"]
+    assert math.isclose(result["mass"], mass)
+    np.testing.assert_allclose(result["centroid"], [0, h / 4, 0], atol=1e-9)
+    np.testing.assert_allclose(result["inertia"], np.diag([mass * (d**2 / 20 + 3 * h**2 / 80),
+                                                           mass * (w**2 + d**2) / 20,
+                                                           mass * (w**2 / 20 + 3 * h**2 / 80)]), atol=1e-9)
+
+
+def test_orientation_and_translation_invariance():
+    mesh = build_mesh("pyramid", PARAMS)
+    reference = mass_properties(mesh.vertices, mesh.triangles)
+    moved = mass_properties(mesh.vertices.astype(np.float64) + 1000, mesh.triangles[:, ::-1])
+    assert math.isclose(moved["volume"], reference["volume"], rel_tol=1e-9)
+    np.testing.assert_allclose(moved["centroid"] - 1000, reference["centroid"], atol=1e-9)
+    np.testing.assert_allclose(moved["inertia"], reference["inertia"], atol=1e-8)
+
+
+def test_chunked_sum_matches_single_pass():
+    # Esfera UV fina o bastante para exercitar vários blocos
+    stacks, slices = 60, 80
+    theta = np.linspace(0, np.pi, stacks + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, slices, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    ring = np.column_stack([np.sin(t).ravel() * np.cos(p).ravel(), np.cos(t).ravel(),
+                            np.sin(t).ravel() * np.sin(p).ravel()])
+    vertices = np.vstack([[0, 1, 0], ring, [0, -1, 0]])
+    triangles = []
+    for j in range(slices):
+        k = (j + 1) % slices
+        triangles.append((0, 1 + k, 1 + j))
+        last = 1 + (stacks - 2) * slices
+        triangles.append((len(vertices) - 1, last + j, last + k))
+        for i in range(stacks - 2):
+            a, b = 1 + i * slices + j, 1 + i * slices + k
+            triangles += [(a, b, b + slices), (a, b + slices, a + slices)]
+    full = mass_properties(vertices, triangles)
+    chunked = mass_properties(vertices, triangles, chunk_size=1000)
+    assert math.isclose(full["volume"], chunked["volume"], rel_tol=1e-12)
+    assert math.isclose(full["volume"], 4 / 3 * math.pi, rel_tol=5e-3)
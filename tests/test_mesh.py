@@ -0,0 +1,95 @@
+import math
+import numpy as np
+import pytest
+from geometry_calculator import GeometryCalculator
+from mesh import LOD_SEGMENTS, MESH_BUILDERS, build_mesh, resize_mesh, segments_for_radius
+from shape_data import compute_shape_data, update_shape_data
+
+
+def test_face_areas_match_calculator():
+    params = {"width": 2, "height": 3, "depth": 4}
+    faces = build_mesh("parallelepiped", params).face_areas()
+    expected = GeometryCalculator.calculate_parallelepiped_properties(params)["faces"]
+    # A calculadora agrupa faces opostas ("Frente/Trás"); a área é de uma delas
+    for group, area in expected.items():
+        for name in group.split("/"):
+            assert math.isclose(faces[name], area, rel_tol=1e-6)
+    faces = build_mesh("pyramid", params).face_areas()
+    expected = GeometryCalculator.calculate_pyramid_properties(params)["faces"]
+    for group, area in expected.items():
+        for name in group.split("/"):
+            assert math.isclose(faces[name], area, rel_tol=1e-6)
+
+
+def test_mesh_is_cached_and_read_only():
+    mesh = build_mesh("pyramid", {"width": 1, "height": 1, "depth": 1})
+    assert mesh is build_mesh("pyramid", {"width": 1.0, "height": 1.0, "depth": 1.0})
+    assert mesh.vertices.dtype == np.float32 and mesh.edges.dtype == np.int32
+    assert not mesh.vertices.flags.writeable
+    assert build_mesh("torus", {"width": 1, "height": 1, "depth": 1}) is None
+    # Os grupos de arestas também: quem recebe shape_data não altera a malha compartilhada
+    groups = compute_shape_data("pyramid", {"width": 1, "height": 1, "depth": 1}, mesh)["edge_info"]
+    with pytest.raises(TypeError):
+        groups["Base (largura)"]["length"] = 0
+    with pytest.raises(TypeError):
+        groups["Novo"] = {}
+
+
+def test_triangles_face_outward():
+    mesh = build_mesh("pyramid", {"width": 2, "height": 3, "depth": 4})
+    outward = np.einsum("ij,ij->i", mesh.triangle_normals, mesh.triangle_centroids - mesh.vertices.mean(axis=0))
+    assert np.all(outward > 0)
+    np.testing.assert_allclose(np.linalg.norm(mesh.face_normals, axis=1), 1)
+
+
+def test_shape_data_uses_mesh_frames():
+    shape_data = compute_shape_data("pyramid", {"width": 2, "height": 3, "depth": 4})
+    front = shape_data["faces"]["Frente"]
+    np.testing.assert_allclose(front["center"], [0, 1, 4 / 3], atol=1e-6)
+    assert math.isclose(np.linalg.norm(front["normal"]), 1)
+
+
+def test_curved_meshes_converge_to_closed_form():
+    params = {"width": 2, "height": 3, "depth": 1}
+    for shape in ("cylinder", "cone", "sphere", "frustum"):
+        expected = GeometryCalculator.calculate_properties(shape, params)
+        errors = []
+        for segments in LOD_SEGMENTS:
+            mesh = build_mesh(shape, params, segments)
+            result = GeometryCalculator.calculate_mesh_properties(mesh)
+            errors.append(abs(result["volume"] - expected["volume"]))
+            assert set(mesh.face_areas()) == set(expected["face_areas"])
+        assert errors == sorted(errors, reverse=True) and errors[-1] < 1e-3 * expected["volume"]
+
+
+def test_level_of_detail_is_cached_per_level():
+    params = {"width": 2, "height": 3, "depth": 1}
+    coarse = build_mesh("sphere", params, 12)
+    fine = build_mesh("sphere", params, 96)
+    assert coarse is not fine and build_mesh("sphere", params, 12) is coarse
+    # Sem nível explícito, as formas curvas usam o padrão e as poligonais ignoram o argumento
+    assert build_mesh("pyramid", params, 96) is build_mesh("pyramid", params)
+    levels = [segments_for_radius(radius) for radius in (1, 50, 200, 800, 1e5)]
+    assert levels == sorted(levels) and levels[0] == LOD_SEGMENTS[0] and levels[-1] == LOD_SEGMENTS[-1]
+
+
+def test_resize_matches_rebuilt_mesh():
+    before = {"width": 2, "height": 3, "depth": 4}
+    after = {"width": 2.5, "height": 3.7, "depth": 1.5}
+    for shape in MESH_BUILDERS:
+        mesh = build_mesh(shape, before, 24)
+        resized = resize_mesh(shape, mesh, before, after, 24)
+        expected = build_mesh(shape, after, 24)
+        # Topologia compartilhada, só os vértices (e o que depende deles) mudam
+        assert resized.edges is mesh.edges and resized.triangles is mesh.triangles
+        np.testing.assert_allclose(resized.vertices, expected.vertices, atol=1e-6)
+        np.testing.assert_allclose(resized.face_centroids, expected.face_centroids, atol=1e-5)
+        assert resized.edge_groups == expected.edge_groups
+        data = update_shape_data(compute_shape_data(shape, before, mesh), resized)
+        assert data["faces"].keys() == compute_shape_data(shape, after, expected)["faces"].keys()
+    # Dimensão que a forma não usa não gera malha nova
+    mesh = build_mesh("cylinder", before)
+    assert resize_mesh("cylinder", mesh, before, dict(before, depth=9)) is mesh
+    # Tronco que vira cilindro muda os grupos de arestas: malha refeita do zero
+    frustum = resize_mesh("frustum", build_mesh("frustum", before), before, dict(before, depth=2))
+    assert frustum is build_mesh("frustum", dict(before, depth=2))
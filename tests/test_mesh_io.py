@@ -0,0 +1,129 @@
+import json
+import math
+import struct
+import zipfile
+import numpy as np
+import pytest
+from geometry_calculator import GeometryCalculator
+from mesh import build_mesh
+from mesh_io import (STL_RECORD, MeshArchive, encode_glb, encode_obj, export_scene, load_mesh, read_obj, read_stl,
+                     weld_vertices, write_mesh)
+from scene import Scene
+
+PARAMS = {"width": 2, "height": 3, "depth": 4}
+
+
+def write_binary_stl(path, mesh):
+    records = np.zeros(len(mesh.triangles), dtype=STL_RECORD)
+    records["vertices"] = mesh.vertices[mesh.triangles]
+    with open(path, "wb") as stream:
+        # Cabeçalho começando com "solid", como alguns exportadores fazem
+        stream.write(b"solid binary".ljust(80, b" "))
+        stream.write(np.uint32(len(records)).tobytes())
+        stream.write(records.tobytes())
+
+
+def test_binary_stl_is_welded_and_measured(tmp_path):
+    box = build_mesh("parallelepiped", PARAMS)
+    path = tmp_path / "box.stl"
+    write_binary_stl(path, box)
+    mesh = load_mesh(str(path))
+    assert len(mesh.vertices) == 8 and len(mesh.triangles) == 12
+    # Só as 12 arestas da caixa; as diagonais das faces não são desenhadas
+    assert len(mesh.edges) == 12
+    assert math.isclose(GeometryCalculator.calculate_mesh_properties(mesh)["volume"], 24)
+
+
+def test_ascii_stl(tmp_path):
+    pyramid = build_mesh("pyramid", PARAMS)
+    lines = ["solid p"]
+    for triangle in pyramid.vertices[pyramid.triangles]:
+        lines += ["  facet normal 0 0 0", "    outer loop"]
+        lines += [f"      vertex {x} {y} {z}" for x, y, z in triangle]
+        lines += ["    endloop", "  endfacet"]
+    path = tmp_path / "p.stl"
+    path.write_text("\n".join(lines + ["endsolid p"]))
+    mesh = load_mesh(str(path))
+    assert len(mesh.vertices) == 5 and len(mesh.edges) == 8
+    assert math.isclose(GeometryCalculator.calculate_mesh_properties(mesh)["volume"], 8, rel_tol=1e-6)
+
+
+def test_obj_quads_slashes_and_negative_indices(tmp_path):
+    box = build_mesh("parallelepiped", PARAMS)
+    lines = ["# caixa", "o box"] + [f"v {x} {y} {z}" for x, y, z in box.vertices] + ["vn 0 0 1"]
+    for polygon in box.face_polygons[:3]:
+        lines.append("f " + " ".join(f"{i + 1}//1" for i in polygon))
+    for polygon in box.face_polygons[3:]:
+        lines.append("f " + " ".join(str(i - 8) for i in polygon))
+    path = tmp_path / "box.obj"
+    path.write_text("\n".join(lines))
+    mesh = read_obj(str(path), chunk_bytes=64)
+    assert len(mesh.triangles) == 12
+    assert math.isclose(GeometryCalculator.calculate_mesh_properties(mesh)["volume"], 24, rel_tol=1e-6)
+
+
+def test_obj_triangle_fast_path_across_blocks(tmp_path):
+    pyramid = build_mesh("pyramid", PARAMS)
+    lines = [f"v {x} {y} {z} 1 0 0" for x, y, z in pyramid.vertices]
+    lines += ["f " + " ".join(f"{i + 1}/{i + 1}/1" for i in triangle) for triangle in pyramid.triangles]
+    path = tmp_path / "p.obj"
+    path.write_text("\n".join(lines) + "\n")
+    mesh = read_obj(str(path), chunk_bytes=50)
+    np.testing.assert_array_equal(mesh.triangles, pyramid.triangles)
+    np.testing.assert_allclose(mesh.vertices, pyramid.vertices)
+
+
+def test_weld_keeps_distinct_points():
+    soup = np.array([[0, 0, 0], [1, 0, 0], [0, 0, 0], [-0.0, 0, 0], [1, 0, 0]], dtype=np.float32)
+    vertices, inverse = weld_vertices(soup)
+    np.testing.assert_array_equal(vertices[inverse], soup)
+    assert inverse[0] == inverse[2] and inverse[1] == inverse[4]
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        load_mesh(str(tmp_path / "peca.ply"))
+
+
+def test_stl_and_obj_round_trip(tmp_path):
+    pyramid = build_mesh("pyramid", PARAMS)
+    for extension in (".stl", ".obj"):
+        path = str(tmp_path / f"p{extension}")
+        write_mesh(path, pyramid)
+        mesh = load_mesh(path)
+        assert len(mesh.triangles) == len(pyramid.triangles)
+        assert math.isclose(GeometryCalculator.calculate_mesh_properties(mesh)["volume"], 8, rel_tol=1e-6)
+
+
+def test_obj_fixed_point_text():
+    text = encode_obj((np.array([[1.5, -2.25, 0], [-100, 7, 0.1]], dtype=np.float32), [[0, 1, 1]])).tobytes()
+    lines = text.decode().splitlines()
+    assert [float(v) for v in lines[1].split()[1:]] == [1.5, -2.25, 0]
+    assert [float(v) for v in lines[2].split()[1:]] == [-100, 7, 0.1]
+    assert lines[3].split() == ["f", "1", "2", "2"]
+
+
+def test_glb_layout():
+    data = encode_glb(build_mesh("parallelepiped", PARAMS)).tobytes()
+    magic, version, total, json_length, json_type = struct.unpack("<5I", data[:20])
+    assert (magic, version, total, json_type) == (0x46546C67, 2, len(data), 0x4E4F534A)
+    document = json.loads(data[20:20 + json_length])
+    binary_length, binary_type = struct.unpack("<2I", data[20 + json_length:28 + json_length])
+    assert binary_type == 0x004E4942 and binary_length == document["buffers"][0]["byteLength"]
+    assert document["accessors"][1]["count"] == 36
+
+
+def test_scene_export_and_archive(tmp_path):
+    scene = Scene()
+    scene.add_many("pyramid", [(2, 3, 4)] * 5, np.arange(15).reshape(5, 3))
+    scene.add("parallelepiped", PARAMS)
+    path = str(tmp_path / "scene.stl")
+    export_scene(path, scene, chunk_size=2)
+    mesh = read_stl(path, weld=False)
+    assert len(mesh.triangles) == 5 * 6 + 12
+    assert math.isclose(GeometryCalculator.calculate_mesh_properties(mesh)["volume"], 5 * 8 + 24, rel_tol=1e-5)
+    archive_path = tmp_path / "lote.zip"
+    with MeshArchive(str(archive_path), ".obj") as archive:
+        archive.add_shapes(["pyramid", "parallelepiped"], np.array([[2, 3, 4], [1, 1, 1]]))
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.namelist() == ["000000_pyramid.obj", "000001_parallelepiped.obj"]
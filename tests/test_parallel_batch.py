@@ -0,0 +1,14 @@
+import numpy as np
+from geometry_calculator import GeometryCalculator
+from parallel_batch import calculate_properties_parallel
+
+
+def test_parallel_matches_serial_in_order():
+    rng = np.random.default_rng(0)
+    width, height, depth = rng.uniform(0.1, 10, size=(3, 1000))
+    parallel = calculate_properties_parallel("pyramid", width, height, depth, workers=2, chunk_size=97)
+    serial = GeometryCalculator.flatten_batch_properties(
+        GeometryCalculator.calculate_pyramid_properties_batch(width, height, depth))
+    assert list(parallel) == list(serial)
+    for name in serial:
+        np.testing.assert_array_equal(parallel[name], serial[name])
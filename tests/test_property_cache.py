@@ -0,0 +1,24 @@
+from property_cache import CachedGeometryCalculator
+
+
+def test_lru_eviction_and_counters():
+    cache = CachedGeometryCalculator(maxsize=2)
+    a = {"width": 1, "height": 2, "depth": 3}
+    b = {"width": 2, "height": 2, "depth": 3}
+    c = {"width": 3, "height": 2, "depth": 3}
+    first = cache.calculate_parallelepiped_properties(a)
+    assert cache.calculate_parallelepiped_properties(dict(a)) is first
+    cache.calculate_pyramid_properties(b)
+    cache.calculate("parallelepiped", a)  # a passa a ser o mais recente
+    cache.calculate("Pirâmide", c)         # remove b
+    assert cache.stats() == {"hits": 2, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2, "hit_rate": 0.4}
+    cache.calculate_pyramid_properties(b)
+    assert cache.misses == 4
+
+
+def test_tolerance_quantizes_keys():
+    cache = CachedGeometryCalculator(tolerance=0.01)
+    first = cache.calculate_parallelepiped_properties({"width": 2.0, "height": 3.0, "depth": 4.0})
+    again = cache.calculate_parallelepiped_properties({"width": 2.001, "height": 3.0, "depth": 4.0})
+    assert again is first
+    assert cache.calculate_pyramid_properties({"width": 2.0, "height": 3.0, "depth": 4.0}) is not first
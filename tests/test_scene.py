@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from scene import Scene, load_scene
+
+
+def test_model_matrices_scale_rotate_translate():
+    scene = Scene()
+    scene.add("pyramid", {"width": 2, "height": 3, "depth": 4}, position=(1, 2, 3), rotation=(0, 90, 0))
+    matrix = scene.model_matrices()[0]
+    apex = matrix @ np.array([0, 1, 0, 1])
+    corner = matrix @ np.array([0.5, 0, 0.5, 1])
+    np.testing.assert_allclose(apex[:3], [1, 5, 3], atol=1e-6)
+    # 90° em y leva (1, 0, 2) para (2, 0, -1)
+    np.testing.assert_allclose(corner[:3], [3, 2, 2], atol=1e-6)
+
+
+def test_load_scene_csv(tmp_path):
+    path = tmp_path / "layout.csv"
+    path.write_text("shape,width,height,depth,x,y,z,r\n"
+                    "Paralelepípedo,1,2,3,0,0,0,0\n"
+                    "pyramid,1,1,1,5,0,0,\n", encoding="utf-8")
+    scene = load_scene(str(path))
+    assert len(scene) == 2
+    np.testing.assert_array_equal(scene.colors[scene.indices("parallelepiped")][0], [0, 1, 1])
+    np.testing.assert_array_equal(scene.positions[scene.indices("pyramid")][0], [5, 0, 0])
+
+
+def test_load_scene_rejects_non_object_rows(tmp_path):
+    path = tmp_path / "scene.jsonl"
+    path.write_text('{"shape": "pyramid", "x": 1}\n\n[1, 2]\n')
+    with pytest.raises(ValueError, match="linha 3"):
+        load_scene(str(path))
+
+
+def test_load_scene_keeps_file_order_and_reports_bad_rows(tmp_path):
+    path = tmp_path / "scene.jsonl"
+    path.write_text('{"shape": "pyramid", "x": 1}\n{"shape": "parallelepiped", "x": 2}\n{"shape": "pyramid", "x": 3}\n')
+    scene = load_scene(str(path))
+    np.testing.assert_array_equal(scene.positions[:, 0], [1, 2, 3])
+    np.testing.assert_array_equal(scene.kinds, [1, 0, 1])
+    for line in ('{"shape": "pyramid", "width": [1]}', '{"shape": "pyramid", "width": "abc"}'):
+        path.write_text('{"shape": "pyramid"}\n' + line + "\n")
+        with pytest.raises(ValueError, match="linha 2: dimensões inválidas"):
+            load_scene(str(path))
+    path.write_text('{"shape": "cone"}\n' + '{"shape": "pyramid", "width": "abc"}\n')
+    with pytest.raises(ValueError, match="linha 1: forma desconhecida"):
+        load_scene(str(path))
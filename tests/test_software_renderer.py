@@ -0,0 +1,17 @@
+from software_renderer import SoftwareRenderer, render_shape, write_png
+
+
+def test_depth_test_keeps_nearest_line():
+    renderer = SoftwareRenderer(16, 16)
+    renderer.draw_lines([[0, 8, 0.5]], [[15, 8, 0.5]], (255, 0, 0), width=1)
+    renderer.draw_lines([[0, 8, 0.9]], [[15, 8, 0.9]], (0, 255, 0), width=1)
+    assert (renderer.color[7, :, 0] == 255).all() and (renderer.color[7, :, 1] == 0).all()
+
+
+def test_render_shape_without_labels_and_png(tmp_path):
+    image = render_shape("parallelepiped", {"width": 2, "height": 3, "depth": 4}, 64, 48, labels=False)
+    assert image.shape == (48, 64, 3)
+    assert (image == 255).all(axis=2).sum() > 100
+    path = tmp_path / "thumb.png"
+    write_png(str(path), image)
+    assert path.read_bytes().startswith(b"\x89PNG\r\n\x1a\n")
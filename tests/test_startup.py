@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_form_does_not_import_opengl():
+    # O formulário abre sem o PyOpenGL, a janela 3D e a calculadora (importados no primeiro uso)
+    code = ("import sys, main; "
+            "print(sorted(m for m in ('OpenGL', 'view3d', 'geometry3d', 'dimension_calculator_tab', 'mesh_io') "
+            "if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_navigation_reuses_view_window():
+    # Ida e volta entre formas troca os parâmetros da mesma janela 3D, sem criar widgets novos
+    code = """
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+import main
+window = main.MainApp()
+window.show()
+counts = []
+for shape in ("Cilindro", "Cone", "Esfera") * 3:
+    window.config_tab.shape_selector.setCurrentText(shape)
+    window.open_3d_view()
+    view = window.navigator.view
+    assert view.gl_widget.shape == main.GeometryCalculator.normalize_shape(shape)
+    assert view.info_tab.shape == view.gl_widget.shape
+    view.go_back()
+    app.processEvents()
+    counts.append((id(view), len(QApplication.allWidgets())))
+print(len(set(counts)))
+"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_DIR, env=env, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip() == "1"
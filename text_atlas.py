@@ -0,0 +1,122 @@
+import numpy as np
+from OpenGL.GL import *
+
+
+class LabelBatch:
+    # Conjunto de rótulos ancorados em pontos 3D, montado uma vez e desenhado com uma única chamada
+    def __init__(self, atlas, texture=None):
+        # Com uma textura já enviada (compartilhada pelo gerenciador de recursos) o lote não a libera
+        self.atlas = atlas
+        self.anchors = np.zeros((0, 3), dtype=np.float64)
+        self.offsets = np.zeros((0, 2), dtype=np.float32)
+        self.uvs = np.zeros((0, 2), dtype=np.float32)
+        self.colors = np.zeros((0, 3), dtype=np.float32)
+        self.owners = np.zeros(0, dtype=np.int32)
+        self.key = None
+        self.texture = texture
+        self.owns_texture = texture is None
+
+    def set_labels(self, labels, key=None):
+        # labels: lista de (âncora xyz, texto, tamanho, cor rgb)
+        anchors, offsets, uvs, colors, owners = [], [], [], [], []
+        for index, (anchor, text, size, color) in enumerate(labels):
+            label_offsets, label_uvs = self.atlas.layout(text, size)
+            anchors.append(anchor)
+            offsets.append(label_offsets)
+            uvs.append(label_uvs)
+            colors.append(np.broadcast_to(np.asarray(color, dtype=np.float32), (len(label_offsets), 3)))
+            owners.append(np.full(len(label_offsets), index, dtype=np.int32))
+        if labels:
+            self.anchors = np.asarray(anchors, dtype=np.float64).reshape(-1, 3)
+            self.offsets = np.concatenate(offsets)
+            self.uvs = np.ascontiguousarray(np.concatenate(uvs))
+            self.colors = np.ascontiguousarray(np.concatenate(colors))
+            self.owners = np.concatenate(owners)
+        else:
+            self.anchors = np.zeros((0, 3), dtype=np.float64)
+            self.owners = np.zeros(0, dtype=np.int32)
+        self.key = key
+
+    def screen_vertices(self, modelview, projection, viewport):
+        # Projeta as âncoras como glRasterPos (matrizes em ordem de coluna, como glGetDoublev)
+        x, y, width, height = viewport
+        points = np.hstack([self.anchors, np.ones((len(self.anchors), 1))])
+        clip = points @ modelview @ projection
+        w = clip[:, 3:4]
+        visible = (w[:, 0] > 0) & np.all(np.abs(clip[:, :3]) <= w, axis=1)
+        ndc = clip[:, :2] / np.where(w == 0, 1, w)
+        window = np.column_stack([x + (ndc[:, 0] + 1) * width / 2, y + (ndc[:, 1] + 1) * height / 2])
+        # Arredonda para pixels inteiros para manter o texto nítido
+        window = np.floor(window)
+        keep = visible[self.owners]
+        vertices = (window[self.owners] + self.offsets)[keep]
+        return np.ascontiguousarray(vertices, dtype=np.float32), keep
+
+    def draw(self, viewport=None):
+        if not len(self.owners):
+            return
+        if viewport is None:
+            viewport = glGetIntegerv(GL_VIEWPORT)
+        modelview = np.asarray(glGetDoublev(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4)
+        projection = np.asarray(glGetDoublev(GL_PROJECTION_MATRIX), dtype=np.float64).reshape(4, 4)
+        vertices, keep = self.screen_vertices(modelview, projection, viewport)
+        if not len(vertices):
+            return
+        uvs = np.ascontiguousarray(self.uvs[keep])
+        colors = np.ascontiguousarray(self.colors[keep])
+        texture = self.upload()
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_POLYGON_BIT)
+        glDisable(GL_LIGHTING)
+        glDisable(GL_DEPTH_TEST)
+        glDisable(GL_CULL_FACE)
+        glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(viewport[0], viewport[0] + viewport[2], viewport[1], viewport[1] + viewport[3], -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        glTexCoordPointer(2, GL_FLOAT, 0, uvs)
+        glColorPointer(3, GL_FLOAT, 0, colors)
+        glDrawArrays(GL_QUADS, 0, len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glPopAttrib()
+
+    def upload(self):
+        # Envia a imagem do atlas para a GPU; precisa de um contexto GL atual
+        if self.texture is not None:
+            return self.texture
+        pixels = self.atlas.pixels()
+        height, width = pixels.shape[:2]
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return self.texture
+
+    def release(self):
+        if self.texture is not None and self.owns_texture:
+            glDeleteTextures([self.texture])
+            self.texture = None
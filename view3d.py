@@ -1,28 +1,53 @@
-from PyQt6.QtWidgets import QMainWindow, QTabWidget, QVBoxLayout, QPushButton, QWidget
+import os
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QMainWindow, QTabWidget, QVBoxLayout, QPushButton, QWidget, QFileDialog, QMessageBox
+from background_jobs import JobScheduler
+from dimension_sliders import DimensionSliders
 from geometry3d import Geometry3D
 from geometry_info_tab import GeometryInfoTab
+from mesh_io import export_scene, write_mesh
+
+EXPORT_FILTERS = {
+    "STL binário (*.stl)": ".stl",
+    "OBJ (*.obj)": ".obj",
+    "glTF binário (*.glb)": ".glb"
+}
 
 class View3D(QMainWindow):
-    def __init__(self, shape: str, params: dict, calculator):
+    # Pedido de volta ao formulário; quem navega decide se esconde ou fecha esta janela
+    back_requested = pyqtSignal()
+
+    def __init__(self, shape: str, params: dict, calculator, scene=None, mesh=None, jobs=None):
         super().__init__()
+        self.calculator = calculator
+        # Cálculos de propriedades, malhas redimensionadas e BVH de seleção fora da thread da interface
+        self.jobs = jobs if jobs is not None else JobScheduler(parent=self)
         self.setWindowTitle("Visualização 3D")
         self.setGeometry(100, 100, 800, 600)
         self.tabs = QTabWidget()
         self.view_tab = QWidget()
-        self.gl_widget = Geometry3D(shape, params)
+        self.gl_widget = Geometry3D(shape, params, calculator, mesh, self.jobs)
+        self.dimension_sliders = DimensionSliders()
+        self.dimension_sliders.parameters_changed.connect(self.set_parameters)
         view_layout = QVBoxLayout()
         view_layout.addWidget(self.gl_widget)
+        view_layout.addWidget(self.dimension_sliders)
         self.view_tab.setLayout(view_layout)
-        self.info_tab = GeometryInfoTab(shape, params, calculator)
-        self.info_tab.face_selected.connect(self.focus_on_face)
         self.tabs.addTab(self.view_tab, "Visualização")
-        self.tabs.addTab(self.info_tab, "Informações Geométricas")
+        self.info_tab = None
+        if scene is not None:
+            self.set_scene(scene)
+        else:
+            self.show_info_tab(shape, params, mesh)
         self.back_button = QPushButton("Voltar")
         self.back_button.clicked.connect(self.go_back)
         self.reset_view_button = QPushButton("Restaurar Visualização")
         self.reset_view_button.clicked.connect(self.reset_view)
+        self.export_button = QPushButton("Exportar...")
+        self.export_button.clicked.connect(self.export_geometry)
         button_layout = QVBoxLayout()
         button_layout.addWidget(self.reset_view_button)
+        button_layout.addWidget(self.export_button)
         button_layout.addWidget(self.back_button)
         layout = QVBoxLayout()
         layout.addWidget(self.tabs)
@@ -31,6 +56,37 @@ class View3D(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+    def set_shape(self, shape, params, mesh=None):
+        # Reaproveita a janela (e o contexto GL) para outra forma, sem reconstruir os widgets
+        self.gl_widget.set_shape(shape, params, mesh)
+        self.show_info_tab(shape, params, mesh)
+        self.tabs.setCurrentIndex(0)
+
+    def set_parameters(self, params):
+        # Dimensões novas da forma atual (controles deslizantes): atualiza vista e tabela na hora
+        self.gl_widget.set_parameters(params)
+        if self.info_tab is not None:
+            self.info_tab.set_parameters(params)
+
+    def set_scene(self, scene):
+        # Cena com várias formas: não há uma forma única para detalhar
+        self.gl_widget.set_scene(scene)
+        self.dimension_sliders.set_shape(None, {})
+        if self.info_tab is not None:
+            self.tabs.setTabVisible(self.tabs.indexOf(self.info_tab), False)
+        self.tabs.setCurrentIndex(0)
+
+    def show_info_tab(self, shape, params, mesh):
+        self.dimension_sliders.set_shape(shape, params)
+        if self.info_tab is None:
+            self.info_tab = GeometryInfoTab(shape, params, self.calculator, mesh, self.jobs)
+            self.info_tab.face_selected.connect(self.focus_on_face)
+            self.gl_widget.face_picked.connect(self.info_tab.select_face)
+            self.tabs.addTab(self.info_tab, "Informações Geométricas")
+        else:
+            self.info_tab.set_shape(shape, params, mesh)
+            self.tabs.setTabVisible(self.tabs.indexOf(self.info_tab), True)
+
     def focus_on_face(self, face_name):
         self.gl_widget.focus_on_face(face_name)
         self.tabs.setCurrentIndex(0)
@@ -38,8 +94,19 @@ class View3D(QMainWindow):
     def reset_view(self):
         self.gl_widget.reset_view()
 
+    def export_geometry(self):
+        path, selected = QFileDialog.getSaveFileName(self, "Exportar", "", ";;".join(EXPORT_FILTERS))
+        if not path:
+            return
+        if os.path.splitext(path)[1].lower() not in EXPORT_FILTERS.values():
+            path += EXPORT_FILTERS.get(selected, ".stl")
+        try:
+            if self.gl_widget.scene is not None:
+                export_scene(path, self.gl_widget.scene)
+            else:
+                write_mesh(path, self.gl_widget.mesh)
+        except (OSError, ValueError) as exc:
+            QMessageBox.warning(self, "Erro", f"Não foi possível exportar: {exc}")
+
     def go_back(self):
-        from main import MainApp
-        self.main_app = MainApp()
-        self.main_app.show()
-        self.close()
+        self.back_requested.emit()